@@ -0,0 +1,33 @@
+# Run this once (and after every data refresh) with `python build.py`
+# to precompute everything the website needs at boot.
+
+import argparse
+import time
+
+from utils.bundle import BUNDLE_VERSION, save_bundle
+from utils.pipeline import build_site_data
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the graphs, layouts, communities, cytoscape elements and "
+        "overlap matrices used by the website and save them as a bundle that is "
+        "loaded at boot by utils/data.py."
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Folder to write the bundle to. Defaults to Config.Path.site_bundle.",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = build_site_data()
+    save_bundle(data, path=args.output)
+    print(
+        f"Saved bundle (version {BUNDLE_VERSION}) in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
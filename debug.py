@@ -0,0 +1,24 @@
+# Debug routes, served by the Flask server underlying the dash app. They expose details
+# of the server, so they are only registered when the NOOTROPICS_DEBUG_ROUTES
+# environment variable is set.
+
+import os
+
+import flask
+
+from app import server
+from utils.memory import workers_memory_report
+from utils.profiling import startup_report
+
+
+def debug_memory():
+    return flask.jsonify(workers_memory_report())
+
+
+def debug_startup():
+    return flask.jsonify(startup_report())
+
+
+if os.environ.get("NOOTROPICS_DEBUG_ROUTES"):
+    server.add_url_rule("/debug/memory", view_func=debug_memory)
+    server.add_url_rule("/debug/startup", view_func=debug_startup)
@@ -0,0 +1,51 @@
+# Gunicorn settings: `gunicorn -c gunicorn.conf.py index:server`
+#
+# The app (and with it, all the graphs and data) is loaded once in the master
+# process, then the heap is frozen and the workers are forked. Workers then share
+# the loaded data copy-on-write instead of each keeping its own copy, so more
+# workers fit on one box. Check /debug/memory (with NOOTROPICS_DEBUG_ROUTES set) to
+# see how much each worker actually uses on its own (unique) versus what it shares
+# with the others.
+
+import gc
+
+from utils.memory import process_memory
+
+preload_app = True
+
+# This file is read by the master before it loads the app. The garbage collector
+# stays disabled in the master: a collection would free objects here and there,
+# leaving holes in the pages shared with the workers that new objects then fill,
+# copying the pages.
+gc.disable()
+
+
+def when_ready(server):
+    # Called in the master once the app is loaded, before forking the workers.
+    # Pages are built lazily by default: build them all now, so that the workers
+    # inherit them instead of each building its own copy.
+    from index import preload_pages
+
+    preload_pages()
+
+    memory = process_memory()
+    server.log.info(f"App loaded, master rss: {memory['rss']} kB")
+
+
+def pre_fork(server, worker):
+    # Move everything that was loaded to the permanent generation right before
+    # forking, so that the garbage collector of the workers never touches (and
+    # therefore never copies) the pages holding it.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    gc.enable()
+    worker.log.info(f"Worker {worker.pid}: froze {gc.get_freeze_count()} objects")
+
+
+def post_worker_init(worker):
+    memory = process_memory()
+    worker.log.info(
+        f"Worker {worker.pid} ready: rss {memory['rss']} kB, pss {memory['pss']} kB, unique {memory['unique']} kB"
+    )
@@ -6,7 +6,27 @@ from dash.dependencies import Input, Output
 from app import app, server
 from layouts import homepage, preliminary, community, text_analysis
 import callbacks
+import debug
 from typing import Dict
+from utils import data as site_data
+
+# Layout of each page. Pages are built on the first request to their route
+# and then cached, so that opening one page doesn't wait for the others.
+page_layouts = {
+    "/": lambda: homepage.homepage_layout,
+    "/page-1": lambda: homepage.homepage_layout,
+    "/page-2": preliminary.get_preliminary_layout,
+    "/page-3": community.get_community_layout,
+    "/page-4": text_analysis.get_text_analysis_layout,
+}
+
+
+def preload_pages():
+    """Load all the data and build all the pages upfront, e.g. before forking server workers."""
+    site_data.load_all()
+    for get_layout in page_layouts.values():
+        get_layout()
+
 
 app.layout = html.Div(
     [
@@ -42,14 +62,8 @@ def toggle_active_links(pathname):
 
 @app.callback(Output("page-content", "children"), [Input("url", "pathname")])
 def render_page_content(pathname):
-    if pathname in ["/", "/page-1"]:
-        return homepage.homepage_layout
-    elif pathname == "/page-2":
-        return preliminary.preliminary_layout
-    elif pathname == "/page-3":
-        return community.community_layout
-    elif pathname == "/page-4":
-        return text_analysis.text_analysis_layout
+    if pathname in page_layouts:
+        return page_layouts[pathname]()
     # If the user tries to reach a different page, return a 404 message
     return dbc.Jumbotron(
         [
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Dict, List
 
 import dash_bootstrap_components as dbc
@@ -6,263 +7,119 @@ import dash_cytoscape as cyto
 import dash_html_components as html
 from app import app
 from dash.dependencies import Input, Output
-from project.library_functions import (
-    draw_overlaps_plotly,
-)
+from project.library_functions import overlap_figure
 
-from utils.community_graphs import build_cytoscape_elements, make_stylesheet
+from utils.community_graphs import make_stylesheet
+from utils.profiling import startup_phase
 
-from utils.data import (
-    graph_reddit_gcc,
-    graph_wiki,
-    layout_reddit,
-    layout_wiki,
-)
+from utils import data as site_data
 
 
 ####################################
 ############ Generate elements #####
 ####################################
-print("Building cytoscape graphs")
-elements_wiki, properties_wiki = build_cytoscape_elements(
-    graph_wiki,
-    positions=layout_wiki,
-    node_attributes=[
-        "mechanism_category",
-        "effect_category",
-        "louvain_community_wiki_L0",
-        "louvain_community_wiki_L1",
-    ],
-)
-elements_reddit, properties_reddit = build_cytoscape_elements(
-    graph_reddit_gcc,
-    positions=layout_reddit,
-    node_attributes=[
-        "mechanism_category",
-        "effect_category",
-        "louvain_community_reddit_R1.00_L0",
-        "louvain_community_reddit_R0.60_L0",
-        "louvain_community_wiki_L0",
-        "louvain_community_wiki_L1",
-    ],
-)
+# Everything is built on the first visit of the page, then cached
 
-stylesheet_wiki, legend_wiki = make_stylesheet(properties_wiki)
-stylesheet_reddit, legend_reddit = make_stylesheet(properties_reddit)
-
-cyto_graph_wiki = cyto.Cytoscape(
-    id="cyto_graph_wiki",
-    layout={"name": "preset"},
-    responsive=True,
-    zoom=0.1,
-    minZoom=0.05,
-    maxZoom=3,
-    style={"width": "100%", "height": "500px"},
-    stylesheet=stylesheet_wiki,
-    elements=elements_wiki,
-)
 
-cyto_graph_reddit = cyto.Cytoscape(
-    id="cyto_graph_reddit",
-    layout={"name": "preset"},
-    responsive=True,
-    zoom=0.3,
-    minZoom=0.3,
-    maxZoom=3,
-    style={"width": "100%", "height": "500pt"},
-    stylesheet=stylesheet_reddit,
-    elements=elements_reddit,
-)
+@lru_cache(maxsize=None)
+def get_heatmap(name: str):
+    """2D-heatmap of category overlaps, from the matrices computed by the data pipeline"""
+    overlaps = site_data.overlap_matrices[name]
+    with startup_phase(f"Drawing heatmap {name}"):
+        return overlap_figure(*overlaps)
 
-print("Computing 2D-heatmaps of category overlaps")
-hist2d_louvain_1_vs_effects = draw_overlaps_plotly(
-    "louvain_community_wiki_L0",
-    "effect_category",
-    graph_wiki,
-    saved="hist2d_louvain_1_vs_effects",
-)
-hist2d_louvain_1_vs_mechanisms = draw_overlaps_plotly(
-    "louvain_community_wiki_L0",
-    "mechanism_category",
-    graph_wiki,
-    saved="hist2d_louvain_1_vs_mechanisms",
-)
 
-hist2d_louvain_2_vs_effects = draw_overlaps_plotly(
-    "louvain_community_wiki_L1",
-    "effect_category",
-    graph_wiki,
-    saved="hist2d_louvain_2_vs_effects",
-)
-hist2d_louvain_2_vs_mechanisms = draw_overlaps_plotly(
-    "louvain_community_wiki_L1",
-    "mechanism_category",
-    graph_wiki,
-    saved="hist2d_louvain_2_vs_mechanisms",
-)
+def get_properties_wiki():
+    return site_data.cytoscape_wiki[1]
 
-hist2d_louvain_reddit_vs_effects = draw_overlaps_plotly(
-    "louvain_community_reddit_R1.00_L0",
-    "effect_category",
-    graph_reddit_gcc,
-    saved="hist2d_louvain_reddit_vs_effects",
-)
-hist2d_louvain_reddit_vs_mechanisms = draw_overlaps_plotly(
-    "louvain_community_reddit_R1.00_L0",
-    "mechanism_category",
-    graph_reddit_gcc,
-    saved="hist2d_louvain_reddit_vs_mechanisms",
-)
+
+def get_properties_reddit():
+    return site_data.cytoscape_reddit[1]
 
 
-hist2d_louvain_reddit_fine_vs_effects = draw_overlaps_plotly(
-    "louvain_community_reddit_R0.60_L0",
-    "effect_category",
-    graph_reddit_gcc,
-    saved="hist2d_louvain_reddit_fine_vs_mechanisms",
-)
-hist2d_louvain_reddit_fine_vs_mechanisms = draw_overlaps_plotly(
-    "louvain_community_reddit_R0.60_L0",
-    "mechanism_category",
-    graph_reddit_gcc,
-    saved="hist2d_louvain_reddit_fine_vs_effects",
-)
 ####################################
 ############ Layout elements #####
 ####################################
-community_layout = html.Div(
-    [
-        dcc.Store(id="wiki_legend_store"),
-        dcc.Store(id="reddit_legend_store"),
-        html.H3(
-            children=[
-                "Finding",
-                html.Em(" Communities "),
-                ": which substances are often mentioned together?".title(),
-            ]
-        ),
-        html.P(
-            "Now that we have looked at how the graphs are built, we can get to the meat of it: actually analyzing usage patterns."
-        ),
-        html.P(
-            "Our idea is that by looking at which nootropics are most often mentioned together,\
-            it may possible to derive information about what the most popular combinations of \
-                nootropics are, and how they relate to one another."
-        ),
-        html.H4("Wikipedia Communities"),
-        html.P(
-            "To get a feel for how this works, let's start by looking at the communities that are detected on Wikipedia.\
-            The dataset is simpler (much fewer links), and we found that the separation into communities was much clearer."
-        ),
-        dbc.Container(
-            children=[
-                dbc.Row(
-                    dbc.Card(
-                        dbc.CardBody(
-                            dbc.Container(
-                                [
-                                    dbc.Row(
-                                        [
-                                            dbc.Col(cyto_graph_wiki, width=8),
-                                            dbc.Col(
-                                                children=[
-                                                    dbc.FormGroup(
-                                                        [
-                                                            dbc.Label(
-                                                                "Color nodes by:",
-                                                            ),
-                                                            dbc.Select(
-                                                                id="select_root_category_wiki",
-                                                                options=[
-                                                                    {
-                                                                        "label": "None",
-                                                                        "value": "none",
-                                                                    },
-                                                                    {
-                                                                        "label": "Wikipedia Categories:",
-                                                                        "value": "wikicats",
-                                                                        "disabled": True,
-                                                                    },
-                                                                    {
-                                                                        "label": "Mechanism of Action",
-                                                                        "value": "mechanism",
-                                                                    },
-                                                                    {
-                                                                        "label": "Psychological Effect",
-                                                                        "value": "effect",
-                                                                    },
-                                                                    {
-                                                                        "label": "Autodetected Communities:",
-                                                                        "value": "auto",
-                                                                        "disabled": True,
-                                                                    },
-                                                                    {
-                                                                        "label": "Louvain Categories",
-                                                                        "value": "louvain_1",
-                                                                    },
-                                                                ],
-                                                                value="none",
-                                                            ),
-                                                        ]
-                                                    ),
-                                                    dbc.Row(
-                                                        id="wiki_plot_legend",
-                                                        children=[],
-                                                    ),
-                                                ],
-                                                width=4,
-                                            ),
-                                        ]
-                                    ),
-                                    html.Hr(className="my-3"),
-                                    html.H4("More Info", className="card-title"),
-                                    html.Div(
-                                        "The network above was layed out using the ForceAtlas algorithm, which uses a physical simulation\
-                                    to spread out nodes in a way that edges act as 'elastics' and nodes as repulsors. This has the effect of \
-                                    drawing densely-connected regions of the graph as clusters (many edges that attract the nodes to each other), \
-                                    and to push isolated nodes or unrelated communities far from one another.\
-                                    To learn more about how this clustering reflects both the actual structure of the articles and the communities that can\
-                                    be determined by using network analysis algorithm, select one of the coloring schemes above.",
-                                        className="card-text",
-                                    ),
-                                    html.Div(
-                                        "",
-                                        className="card-text",
-                                        id="cyto_graph_wiki_info",
-                                    ),
-                                ]
-                            )
-                        ),
-                    ),
-                ),
-            ]
-        ),
-        html.Hr(className="my-5"),
-        html.H4("Reddit Communities"),
-        html.P(
-            "Here comes one of the main questions we had when setting out to analyse our data: can we actually derive information about the underlying properties of nootropics\
-            starting from just Reddit discussions? The following visualization is similar to the one above, except here all links are extracted by finding nootropics that are mentioned together in Reddit posts.",
-            className="mb-5",
-        ),
-        dbc.Container(
-            children=[
-                dbc.Row(
-                    dbc.Card(
-                        dbc.CardBody(
-                            [
+@lru_cache(maxsize=None)
+def get_community_layout():
+    with startup_phase("Building community page"):
+        return _build_community_layout()
+
+
+def _build_community_layout():
+    elements_wiki, properties_wiki = site_data.cytoscape_wiki
+    elements_reddit, properties_reddit = site_data.cytoscape_reddit
+
+    stylesheet_wiki, legend_wiki = make_stylesheet(properties_wiki)
+    stylesheet_reddit, legend_reddit = make_stylesheet(properties_reddit)
+
+    cyto_graph_wiki = cyto.Cytoscape(
+        id="cyto_graph_wiki",
+        layout={"name": "preset"},
+        responsive=True,
+        zoom=0.1,
+        minZoom=0.05,
+        maxZoom=3,
+        style={"width": "100%", "height": "500px"},
+        stylesheet=stylesheet_wiki,
+        elements=elements_wiki,
+    )
+
+    cyto_graph_reddit = cyto.Cytoscape(
+        id="cyto_graph_reddit",
+        layout={"name": "preset"},
+        responsive=True,
+        zoom=0.3,
+        minZoom=0.3,
+        maxZoom=3,
+        style={"width": "100%", "height": "500pt"},
+        stylesheet=stylesheet_reddit,
+        elements=elements_reddit,
+    )
+
+    return html.Div(
+        [
+            dcc.Store(id="wiki_legend_store"),
+            dcc.Store(id="reddit_legend_store"),
+            html.H3(
+                children=[
+                    "Finding",
+                    html.Em(" Communities "),
+                    ": which substances are often mentioned together?".title(),
+                ]
+            ),
+            html.P(
+                "Now that we have looked at how the graphs are built, we can get to the meat of it: actually analyzing usage patterns."
+            ),
+            html.P(
+                "Our idea is that by looking at which nootropics are most often mentioned together,\
+                it may possible to derive information about what the most popular combinations of \
+                    nootropics are, and how they relate to one another."
+            ),
+            html.H4("Wikipedia Communities"),
+            html.P(
+                "To get a feel for how this works, let's start by looking at the communities that are detected on Wikipedia.\
+                The dataset is simpler (much fewer links), and we found that the separation into communities was much clearer."
+            ),
+            dbc.Container(
+                children=[
+                    dbc.Row(
+                        dbc.Card(
+                            dbc.CardBody(
                                 dbc.Container(
                                     [
                                         dbc.Row(
                                             [
+                                                dbc.Col(cyto_graph_wiki, width=8),
                                                 dbc.Col(
                                                     children=[
                                                         dbc.FormGroup(
                                                             [
                                                                 dbc.Label(
-                                                                    "Select the attribute by which to color the nodes"
+                                                                    "Color nodes by:",
                                                                 ),
                                                                 dbc.Select(
-                                                                    id="select_root_category_reddit",
+                                                                    id="select_root_category_wiki",
                                                                     options=[
                                                                         {
                                                                             "label": "None",
@@ -270,7 +127,7 @@ community_layout = html.Div(
                                                                         },
                                                                         {
                                                                             "label": "Wikipedia Categories:",
-                                                                            "value": "none",
+                                                                            "value": "wikicats",
                                                                             "disabled": True,
                                                                         },
                                                                         {
@@ -282,68 +139,158 @@ community_layout = html.Div(
                                                                             "value": "effect",
                                                                         },
                                                                         {
-                                                                            "label": "Autodetected Communities (on reddit):",
-                                                                            "value": "none",
+                                                                            "label": "Autodetected Communities:",
+                                                                            "value": "auto",
                                                                             "disabled": True,
                                                                         },
                                                                         {
-                                                                            "label": "Louvain Categories - Coarse Grained",
-                                                                            "value": "louvain_reddit",
-                                                                        },
-                                                                        {
-                                                                            "label": "Louvain Categories - Fine Grained",
-                                                                            "value": "louvain_reddit_r07",
+                                                                            "label": "Louvain Categories",
+                                                                            "value": "louvain_1",
                                                                         },
                                                                     ],
-                                                                    value="louvain_reddit",
+                                                                    value="none",
                                                                 ),
                                                             ]
                                                         ),
                                                         dbc.Row(
-                                                            id="reddit_plot_legend",
+                                                            id="wiki_plot_legend",
                                                             children=[],
                                                         ),
                                                     ],
-                                                    width=3,
+                                                    width=4,
                                                 ),
-                                                dbc.Col(cyto_graph_reddit, width=9),
                                             ]
                                         ),
+                                        html.Hr(className="my-3"),
                                         html.H4("More Info", className="card-title"),
                                         html.Div(
-                                            children=[
-                                                html.P(
-                                                    children=[
-                                                        "It's immediately clear that the layouting doesn't work as well as on wikipedia: most of the nodes form a big blob in the center.\
-                                    There are several reasons to this, and the main one is that this graph is very densely connected - in network science terms, it's \
-                                    closer to a ",
-                                                        html.Em("random network"),
-                                                        " than to a ",
-                                                        html.Em("scale-free network"),
-                                                        ' like the Wikipedia network above. While it is still possible to find "nicer" layouts than what you see above, the python \
-                                                implementation of the force-atlas 2 algorithm is quite limited, and that is the best that we were able to do. \
-                                                Once more, you are invited to choose different coloring schemes to see the effects of automatic community detection.',
-                                                    ]
-                                                )
-                                            ],
+                                            "The network above was layed out using the ForceAtlas algorithm, which uses a physical simulation\
+                                        to spread out nodes in a way that edges act as 'elastics' and nodes as repulsors. This has the effect of \
+                                        drawing densely-connected regions of the graph as clusters (many edges that attract the nodes to each other), \
+                                        and to push isolated nodes or unrelated communities far from one another.\
+                                        To learn more about how this clustering reflects both the actual structure of the articles and the communities that can\
+                                        be determined by using network analysis algorithm, select one of the coloring schemes above.",
                                             className="card-text",
                                         ),
-                                        html.Hr(),
                                         html.Div(
                                             "",
                                             className="card-text",
-                                            id="cyto_graph_reddit_info",
+                                            id="cyto_graph_wiki_info",
                                         ),
                                     ]
-                                ),
-                            ]
+                                )
+                            ),
                         ),
                     ),
-                )
-            ]
-        ),
-    ]
-)
+                ]
+            ),
+            html.Hr(className="my-5"),
+            html.H4("Reddit Communities"),
+            html.P(
+                "Here comes one of the main questions we had when setting out to analyse our data: can we actually derive information about the underlying properties of nootropics\
+                starting from just Reddit discussions? The following visualization is similar to the one above, except here all links are extracted by finding nootropics that are mentioned together in Reddit posts.",
+                className="mb-5",
+            ),
+            dbc.Container(
+                children=[
+                    dbc.Row(
+                        dbc.Card(
+                            dbc.CardBody(
+                                [
+                                    dbc.Container(
+                                        [
+                                            dbc.Row(
+                                                [
+                                                    dbc.Col(
+                                                        children=[
+                                                            dbc.FormGroup(
+                                                                [
+                                                                    dbc.Label(
+                                                                        "Select the attribute by which to color the nodes"
+                                                                    ),
+                                                                    dbc.Select(
+                                                                        id="select_root_category_reddit",
+                                                                        options=[
+                                                                            {
+                                                                                "label": "None",
+                                                                                "value": "none",
+                                                                            },
+                                                                            {
+                                                                                "label": "Wikipedia Categories:",
+                                                                                "value": "none",
+                                                                                "disabled": True,
+                                                                            },
+                                                                            {
+                                                                                "label": "Mechanism of Action",
+                                                                                "value": "mechanism",
+                                                                            },
+                                                                            {
+                                                                                "label": "Psychological Effect",
+                                                                                "value": "effect",
+                                                                            },
+                                                                            {
+                                                                                "label": "Autodetected Communities (on reddit):",
+                                                                                "value": "none",
+                                                                                "disabled": True,
+                                                                            },
+                                                                            {
+                                                                                "label": "Louvain Categories - Coarse Grained",
+                                                                                "value": "louvain_reddit",
+                                                                            },
+                                                                            {
+                                                                                "label": "Louvain Categories - Fine Grained",
+                                                                                "value": "louvain_reddit_r07",
+                                                                            },
+                                                                        ],
+                                                                        value="louvain_reddit",
+                                                                    ),
+                                                                ]
+                                                            ),
+                                                            dbc.Row(
+                                                                id="reddit_plot_legend",
+                                                                children=[],
+                                                            ),
+                                                        ],
+                                                        width=3,
+                                                    ),
+                                                    dbc.Col(cyto_graph_reddit, width=9),
+                                                ]
+                                            ),
+                                            html.H4("More Info", className="card-title"),
+                                            html.Div(
+                                                children=[
+                                                    html.P(
+                                                        children=[
+                                                            "It's immediately clear that the layouting doesn't work as well as on wikipedia: most of the nodes form a big blob in the center.\
+                                        There are several reasons to this, and the main one is that this graph is very densely connected - in network science terms, it's \
+                                        closer to a ",
+                                                            html.Em("random network"),
+                                                            " than to a ",
+                                                            html.Em("scale-free network"),
+                                                            ' like the Wikipedia network above. While it is still possible to find "nicer" layouts than what you see above, the python \
+                                                    implementation of the force-atlas 2 algorithm is quite limited, and that is the best that we were able to do. \
+                                                    Once more, you are invited to choose different coloring schemes to see the effects of automatic community detection.',
+                                                        ]
+                                                    )
+                                                ],
+                                                className="card-text",
+                                            ),
+                                            html.Hr(),
+                                            html.Div(
+                                                "",
+                                                className="card-text",
+                                                id="cyto_graph_reddit_info",
+                                            ),
+                                        ]
+                                    ),
+                                ]
+                            ),
+                        ),
+                    )
+                ]
+            ),
+        ]
+    )
 
 
 ####################################
@@ -360,26 +307,26 @@ community_layout = html.Div(
 def display_wiki_graph_info(value):
     print("changed category")
     if not value or value == "none":
-        stylesheet, legend = make_stylesheet(properties_wiki)
+        stylesheet, legend = make_stylesheet(get_properties_wiki())
 
     elif value == "effect":
         stylesheet, legend = make_stylesheet(
-            properties_wiki, color_node_by="mechanism_category"
+            get_properties_wiki(), color_node_by="mechanism_category"
         )
 
     elif value == "mechanism":
         stylesheet, legend = make_stylesheet(
-            properties_wiki, color_node_by="effect_category"
+            get_properties_wiki(), color_node_by="effect_category"
         )
     elif value == "louvain_1":
         stylesheet, legend = make_stylesheet(
-            properties_wiki, color_node_by="louvain_community_wiki_L0"
+            get_properties_wiki(), color_node_by="louvain_community_wiki_L0"
         )
         # doesn't make sense to show legend since communities are arbitrary
         legend = {}
     elif value == "louvain_2":
         stylesheet, legend = make_stylesheet(
-            properties_wiki, color_node_by="louvain_community_wiki_L1"
+            get_properties_wiki(), color_node_by="louvain_community_wiki_L1"
         )
         # doesn't make sense to show legend since communities are arbitrary
         legend = {}
@@ -428,10 +375,10 @@ def display_wiki_graph_info(value):
                 ]
             ),
             html.H6("Drugs by mechanism of action"),
-            dcc.Graph(figure=hist2d_louvain_1_vs_mechanisms),
+            dcc.Graph(figure=get_heatmap("hist2d_louvain_1_vs_mechanisms")),
             html.P(
                 children=[
-                    "Because the Louvain algorithm is not deterministic, the table above will be different everytime the website gets reloaded.\
+                    "The Louvain algorithm is not deterministic, so we run it with a fixed seed and save the communities it finds: the table above stays the same every time the website gets reloaded.\
                     When we generated it, there were two categories that had a sizeable overlap with the communities detected by the algorithm: ",
                     html.Em("GABA receptor ligands"),
                     " and ",
@@ -441,7 +388,7 @@ def display_wiki_graph_info(value):
                 ]
             ),
             html.H6("Drugs by Psychological Effect"),
-            dcc.Graph(figure=hist2d_louvain_1_vs_effects),
+            dcc.Graph(figure=get_heatmap("hist2d_louvain_1_vs_effects")),
             html.P(
                 children=[
                     "In this case, there is only one community and one category which were found to have a sizeable overlap: ",
@@ -511,26 +458,28 @@ def show_legends_wiki(data):
 def display_reddit_graph_info(value):
     print("changed category")
     if not value or value == "none":
-        stylesheet, legend = make_stylesheet(properties_reddit)
+        stylesheet, legend = make_stylesheet(get_properties_reddit())
 
     elif value == "effect":
         stylesheet, legend = make_stylesheet(
-            properties_reddit, color_node_by="mechanism_category"
+            get_properties_reddit(), color_node_by="mechanism_category"
         )
 
     elif value == "mechanism":
         stylesheet, legend = make_stylesheet(
-            properties_reddit, color_node_by="effect_category"
+            get_properties_reddit(), color_node_by="effect_category"
         )
     elif value == "louvain_reddit":
         stylesheet, legend = make_stylesheet(
-            properties_reddit, color_node_by="louvain_community_reddit_R1.00_L0"
+            get_properties_reddit(),
+            color_node_by="louvain_community_reddit_R1.00_L0",
         )
         # doesn't make sense to show legend since communities are arbitrary
         legend = {}
     elif value == "louvain_reddit_r07":
         stylesheet, legend = make_stylesheet(
-            properties_reddit, color_node_by="louvain_community_reddit_R0.60_L0"
+            get_properties_reddit(),
+            color_node_by="louvain_community_reddit_R0.60_L0",
         )
         # doesn't make sense to show legend since communities are arbitrary
         legend = {}
@@ -564,8 +513,8 @@ def display_reddit_graph_info(value):
                 "Once more, we used the louvain algorithm to autodetect communities in the graph. \
                 And, once more, we looked at how those communities overlap with the two main categorizations we chose."
             ),
-            dcc.Graph(figure=hist2d_louvain_reddit_vs_effects),
-            dcc.Graph(figure=hist2d_louvain_reddit_vs_mechanisms),
+            dcc.Graph(figure=get_heatmap("hist2d_louvain_reddit_vs_effects")),
+            dcc.Graph(figure=get_heatmap("hist2d_louvain_reddit_vs_mechanisms")),
         ]
 
     elif value == "louvain_reddit_r07":
@@ -576,8 +525,12 @@ def display_reddit_graph_info(value):
                 To see if it yielded better results, we tried increasing the "granularity" of the Louvain algorithm - i.e., make it generate more, but smaller communities.
                 """
             ),
-            dcc.Graph(figure=hist2d_louvain_reddit_fine_vs_effects),
-            dcc.Graph(figure=hist2d_louvain_reddit_fine_vs_mechanisms),
+            dcc.Graph(
+                figure=get_heatmap("hist2d_louvain_reddit_fine_vs_effects")
+            ),
+            dcc.Graph(
+                figure=get_heatmap("hist2d_louvain_reddit_fine_vs_mechanisms")
+            ),
             html.P(
                 [
                     """
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import dash_core_components as dcc
 from dash_core_components.Loading import Loading
 import dash_html_components as html
@@ -12,186 +14,195 @@ from project.library_functions import (
     get_reddit_plots_figure,
 )
 from app import app
-from utils.data import all_names_and_synonyms, names_and_synonyms_in_reddit
+from utils import data as site_data
+from utils.profiling import startup_phase
 from utils.preliminary import wiki_page, reddit_substance
 
-wiki_preliminary_plots = get_wiki_plots_figure()
-reddit_preliminary_plots = get_reddit_plots_figure()
 
+# Built on the first visit of the page, then cached
+@lru_cache(maxsize=None)
+def get_preliminary_layout():
+    with startup_phase("Building preliminary page"):
+        return _build_preliminary_layout()
 
-preliminary_layout = html.Div(
-    [
-        html.H2("Preliminary Analysis"),
-        html.P(
-            "Let's get a quick overview of our data, from both Wikipedia and Reddit."
-        ),
-        html.Hr(className="my-3"),
-        html.H3("Wikipedia Pages"),
-        html.P(
-            "All our further analysis is based on the data we extracted from Wikipedia, so it's worth taking a deeper look at it."
-        ),
-        html.P(
-            "The data we took from Wikipedia consists of around 1.500 articles, \
-            corresponding roughly to pages under two main categories: dietary \
-            supplements, and psychoactive drugs. Let's look at the \
-            distributions of some of the page's attributes."
-        ),
-        dbc.Card(
-            dbc.CardBody(
-                [
-                    html.H4("Some Histograms", className="card-title"),
-                    dcc.Graph(
-                        figure=wiki_preliminary_plots, id="wiki_preliminary_plots"
-                    ),
-                    html.H4("More Info:", className="card-title"),
-                    html.H5(
-                        "(Hint: click one of the bins above to learn more)",
-                        className="card-subtitle text-muted my-3",
-                    ),
-                    dcc.Loading(
-                        html.Div(
-                            "",
-                            className="card-text",
-                            id="wiki_preliminary_plots_learnmore",
-                        ),
-                    ),
-                ]
+
+def _build_preliminary_layout():
+    wiki_preliminary_plots = get_wiki_plots_figure()
+    reddit_preliminary_plots = get_reddit_plots_figure()
+
+    return html.Div(
+        [
+            html.H2("Preliminary Analysis"),
+            html.P(
+                "Let's get a quick overview of our data, from both Wikipedia and Reddit."
             ),
-            className="my-5",
-        ),
-        html.P(
-            "To get a better feel for what the Wikipedia data looks like, you can look up the data for any substance you like below."
-        ),
-        dbc.Card(
-            dbc.CardBody(
-                [
-                    dbc.Container(
-                        [
-                            dbc.Row(
-                                dbc.Col(
-                                    children="",
-                                    id="wikipage_title",
-                                ),
+            html.Hr(className="my-3"),
+            html.H3("Wikipedia Pages"),
+            html.P(
+                "All our further analysis is based on the data we extracted from Wikipedia, so it's worth taking a deeper look at it."
+            ),
+            html.P(
+                "The data we took from Wikipedia consists of around 1.500 articles, \
+                corresponding roughly to pages under two main categories: dietary \
+                supplements, and psychoactive drugs. Let's look at the \
+                distributions of some of the page's attributes."
+            ),
+            dbc.Card(
+                dbc.CardBody(
+                    [
+                        html.H4("Some Histograms", className="card-title"),
+                        dcc.Graph(
+                            figure=wiki_preliminary_plots, id="wiki_preliminary_plots"
+                        ),
+                        html.H4("More Info:", className="card-title"),
+                        html.H5(
+                            "(Hint: click one of the bins above to learn more)",
+                            className="card-subtitle text-muted my-3",
+                        ),
+                        dcc.Loading(
+                            html.Div(
+                                "",
+                                className="card-text",
+                                id="wiki_preliminary_plots_learnmore",
                             ),
-                            dbc.Row(
-                                [
+                        ),
+                    ]
+                ),
+                className="my-5",
+            ),
+            html.P(
+                "To get a better feel for what the Wikipedia data looks like, you can look up the data for any substance you like below."
+            ),
+            dbc.Card(
+                dbc.CardBody(
+                    [
+                        dbc.Container(
+                            [
+                                dbc.Row(
                                     dbc.Col(
-                                        dbc.Label("Choose which page to view:"), width=4
+                                        children="",
+                                        id="wikipage_title",
                                     ),
-                                    dbc.Col(
-                                        dcc.Dropdown(
-                                            id="wikipage_select_dropdown",
-                                            options=[
-                                                {"label": i.title(), "value": i}
-                                                for i in all_names_and_synonyms
-                                            ],
-                                            value="caffeine",
-                                            placeholder="Pheibut, caffeine, modafinil, ...",
+                                ),
+                                dbc.Row(
+                                    [
+                                        dbc.Col(
+                                            dbc.Label("Choose which page to view:"), width=4
                                         ),
-                                        width=3,
-                                    ),
-                                ],
-                                className="my-3",
-                            ),
-                            dcc.Loading(dbc.Row(id="wikipage_preview", children=[])),
-                        ]
-                    ),
-                ]
-            ),
-            className="my-5",
-        ),
-        html.Hr(className="my-5"),
-        html.H3("Reddit Posts"),
-        html.P(
-            children=[
-                html.A(
-                    href="https://www.reddit.com/r/Nootropics/", children="r/Nootropics"
-                ),
-                """
-                is a community on Reddit where people share experiences, ask questions, and discuss everything about cognitive enhancers and supplements.
-                The 
-                """,
-                html.A(
-                    href="https://github.com/pushshift/api", children="Pushshift API"
+                                        dbc.Col(
+                                            dcc.Dropdown(
+                                                id="wikipage_select_dropdown",
+                                                options=[
+                                                    {"label": i.title(), "value": i}
+                                                    for i in site_data.all_names_and_synonyms
+                                                ],
+                                                value="caffeine",
+                                                placeholder="Pheibut, caffeine, modafinil, ...",
+                                            ),
+                                            width=3,
+                                        ),
+                                    ],
+                                    className="my-3",
+                                ),
+                                dcc.Loading(dbc.Row(id="wikipage_preview", children=[])),
+                            ]
+                        ),
+                    ]
                 ),
-                """ let us download all submissions that were ever made on the subreddit - that is over 108.000 posts. 
-                Then, we used the names (and synonyms) found on wikipedia to detect mentions of nootropics in those posts. 
-                Let's look at some metrics.""",
-            ]
-        ),
-        dbc.Card(
-            dbc.CardBody(
-                [
-                    html.H4("Some Histograms", className="card-title"),
-                    dcc.Graph(
-                        figure=reddit_preliminary_plots, id="reddit_preliminary_plots"
-                    ),
-                    html.H4("More Info:", className="card-title"),
-                    html.H5(
-                        "(Hint: click one of the bins above to learn more)",
-                        className="card-subtitle text-muted my-3",
+                className="my-5",
+            ),
+            html.Hr(className="my-5"),
+            html.H3("Reddit Posts"),
+            html.P(
+                children=[
+                    html.A(
+                        href="https://www.reddit.com/r/Nootropics/", children="r/Nootropics"
                     ),
-                    dcc.Loading(
-                        html.Div(
-                            "",
-                            className="card-text",
-                            id="reddit_preliminary_plots_learnmore",
-                        )
+                    """
+                    is a community on Reddit where people share experiences, ask questions, and discuss everything about cognitive enhancers and supplements.
+                    The 
+                    """,
+                    html.A(
+                        href="https://github.com/pushshift/api", children="Pushshift API"
                     ),
+                    """ let us download all submissions that were ever made on the subreddit - that is over 108.000 posts. 
+                    Then, we used the names (and synonyms) found on wikipedia to detect mentions of nootropics in those posts. 
+                    Let's look at some metrics.""",
                 ]
             ),
-            className="mt-5",
-        ),
-        html.P(
-            "In order to analyze the posts we got from reddit, we had to find as many mentions of nootropics in those posts as possible.\
-                If you're interested in learning more about how we did, feel free to check our notebook - the link is on the homepage.\
-            Detecting mentions allowed us to get both the list of nootropics mentioned in each post, and the list of posts that mention each nootropic. \
-                Once more, you can look at the data for any substance you like below.",
-            className="mt-5",
-        ),
-        dbc.Card(
-            dbc.CardBody(
-                [
-                    dbc.Container(
-                        [
-                            dbc.Row(
-                                dbc.Col(
-                                    children="",
-                                    id="reddit_substance_title",
-                                ),
-                            ),
-                            dbc.Row(
-                                [
+            dbc.Card(
+                dbc.CardBody(
+                    [
+                        html.H4("Some Histograms", className="card-title"),
+                        dcc.Graph(
+                            figure=reddit_preliminary_plots, id="reddit_preliminary_plots"
+                        ),
+                        html.H4("More Info:", className="card-title"),
+                        html.H5(
+                            "(Hint: click one of the bins above to learn more)",
+                            className="card-subtitle text-muted my-3",
+                        ),
+                        dcc.Loading(
+                            html.Div(
+                                "",
+                                className="card-text",
+                                id="reddit_preliminary_plots_learnmore",
+                            )
+                        ),
+                    ]
+                ),
+                className="mt-5",
+            ),
+            html.P(
+                "In order to analyze the posts we got from reddit, we had to find as many mentions of nootropics in those posts as possible.\
+                    If you're interested in learning more about how we did, feel free to check our notebook - the link is on the homepage.\
+                Detecting mentions allowed us to get both the list of nootropics mentioned in each post, and the list of posts that mention each nootropic. \
+                    Once more, you can look at the data for any substance you like below.",
+                className="mt-5",
+            ),
+            dbc.Card(
+                dbc.CardBody(
+                    [
+                        dbc.Container(
+                            [
+                                dbc.Row(
                                     dbc.Col(
-                                        dbc.Label("Choose substance to view data for:"),
-                                        width=4,
+                                        children="",
+                                        id="reddit_substance_title",
                                     ),
-                                    dbc.Col(
-                                        dcc.Dropdown(
-                                            id="reddit_substance_select_dropdown",
-                                            options=[
-                                                {"label": i.title(), "value": i}
-                                                for i in names_and_synonyms_in_reddit
-                                            ],
-                                            value="caffeine",
-                                            placeholder="Phenibut, caffeine, modafinil, ...",
+                                ),
+                                dbc.Row(
+                                    [
+                                        dbc.Col(
+                                            dbc.Label("Choose substance to view data for:"),
+                                            width=4,
                                         ),
-                                        width=3,
-                                    ),
-                                ],
-                                className="my-3",
-                            ),
-                            dcc.Loading(
-                                dbc.Row(id="reddit_substance_preview", children=[])
-                            ),
-                        ]
-                    ),
-                ]
+                                        dbc.Col(
+                                            dcc.Dropdown(
+                                                id="reddit_substance_select_dropdown",
+                                                options=[
+                                                    {"label": i.title(), "value": i}
+                                                    for i in site_data.names_and_synonyms_in_reddit
+                                                ],
+                                                value="caffeine",
+                                                placeholder="Phenibut, caffeine, modafinil, ...",
+                                            ),
+                                            width=3,
+                                        ),
+                                    ],
+                                    className="my-3",
+                                ),
+                                dcc.Loading(
+                                    dbc.Row(id="reddit_substance_preview", children=[])
+                                ),
+                            ]
+                        ),
+                    ]
+                ),
+                className="my-5",
             ),
-            className="my-5",
-        ),
-    ]
-)
+        ]
+    )
 
 
 @app.callback(
@@ -1,12 +1,68 @@
 from . import plotly_draw
 from .calculate_sentiment_reddit import calculate_sentiment_reddit
-from .create_graph_reddit import create_graph_reddit
-from .create_graph_wiki import create_graph_wiki
+from .create_graph_reddit import (
+    create_graph_reddit,
+    empty_graph_reddit,
+    iter_posts_to_link,
+    link_drugs,
+    select_posts,
+    assign_node_attributes_sparse,
+    add_store_edges,
+    weigh_attributes,
+)
+from .sweep_graphs_reddit import sweep_graphs_reddit
+from .create_graph_wiki import create_graph_wiki, load_graphs_wiki
 
 # from .display_graph_size import display_graph_size
-from .load_data_reddit import load_data_reddit
+from .reddit_snapshot import (
+    RedditSnapshot,
+    save_reddit_snapshot,
+    open_reddit_snapshot,
+    is_reddit_snapshot_fresh,
+)
+from .post_table import Post, PostTable, PostContents
+from .post_filters import (
+    is_declarative_condition,
+    condition_mask,
+    as_condition_function,
+)
+from .cooccurrence import (
+    incidence_matrix,
+    cooccurrence_pairs,
+)
+from .edge_attribute_store import EdgeAttributeStore, weighted_segment_means
+from .reddit_graph_state import RedditGraphState
+from .frozen_graph import FrozenGraph
+from .reddit_graph_cache import (
+    get_reddit_graph_source_hash,
+    get_reddit_graph_cache_path,
+    load_cached_reddit_graph,
+    save_cached_reddit_graph,
+    save_graph_npz,
+    load_graph_npz,
+)
+from .load_data_reddit import (
+    load_data_reddit,
+    get_reddit_posts_file,
+    stream_reddit_posts,
+    iter_json_lines,
+    iter_json_object,
+)
+from .save_reddit_data import save_reddit_data_jsonl
+from .wiki_cache import (
+    get_file_hash,
+    get_wiki_source_hash,
+    CACHE_READ_ERRORS,
+    discard_cache_entry,
+    load_cached_wiki_artifact,
+    save_cached_wiki_artifact,
+    read_wiki_artifacts_hash,
+    write_wiki_artifacts_hash,
+)
 from .load_data_wiki import load_data_wiki
+from .wiki_corpus import WikiCorpus
 from .load_substance_names import load_substance_names
+from .data_store import DataStore, data_store
 
 # from .most_frequent_edges import most_frequent_edges
 from .save_wiki_data import (
@@ -15,6 +71,7 @@ from .save_wiki_data import (
     save_substance_names,
     save_urls,
     save_wiki_data_files,
+    update_wiki_data_files,
 )
 from .layouting import get_fa2_layout, get_circle_layout
 
@@ -24,7 +81,29 @@ from .communities import (
     assign_root_categories,
 )
 
-from .overlaps import inverse_communities_from_partition, overlap, draw_overlaps_plotly
+from .louvain_dendrograms import (
+    get_graph_fingerprint,
+    get_dendrogram_cache_path,
+    run_louvain_dendrograms,
+    get_louvain_dendrograms,
+)
+from .consensus_communities import (
+    louvain_co_association,
+    assign_consensus_communities,
+)
+from .infomap_communities import (
+    get_infomap_cache_path,
+    run_infomap,
+    assign_infomap_communities,
+)
+
+from .overlaps import (
+    inverse_communities_from_partition,
+    overlap,
+    overlap_matrix,
+    overlap_figure,
+    draw_overlaps_plotly,
+)
 
 from .flatten_list import flatten
 
@@ -4,20 +4,76 @@ from typing import Dict, List, Optional, Tuple, Union
 
 import community
 import networkx as nx
-from infomap import Infomap
 import numpy as np
 import plotly.graph_objects as go
 from collections import Counter
 
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+
 # %%
 
 
+def _dendrogram_partitions(dendrogram: List[Dict]) -> List[Dict]:
+    """Get the partitions at the levels of a dendrogram that assign_louvain_communities
+    uses (all but the last one), each computed from the previous one."""
+    partitions = []
+    partition = dendrogram[0].copy()
+    for level in range(len(dendrogram) - 1):
+        if level > 0:
+            partition = {
+                node: dendrogram[level][node_community]
+                for node, node_community in partition.items()
+            }
+        partitions.append(partition)
+    return partitions
+
+
+def _set_community_attributes(
+    graph: nx.Graph,
+    partitions: List[Dict],
+    attribute_prefix: str,
+    others_threshold: int,
+):
+    """Assign the communities of every level of a dendrogram to the nodes of a graph.
+
+    Communities smaller than others_threshold are mapped to -1. Nodes that aren't in the
+    partitions (i.e. that aren't in the graph the dendrogram was computed on) get
+    "L{level}-NONE", under the attribute of the level counted from the top of the
+    dendrogram.
+    """
+    for level, partition in enumerate(partitions):
+        actual_level = len(partitions) - 1 - level
+        counts = Counter(partition.values())
+        labels = {
+            node: f"L{actual_level}-{node_community:03}"
+            if counts[node_community] >= others_threshold
+            else f"L{actual_level}-{-1:03}"
+            for node, node_community in partition.items()
+        }
+        nx.set_node_attributes(
+            graph,
+            {node: labels[node] for node in graph if node in labels},
+            f"{attribute_prefix}_L{actual_level}",
+        )
+        nx.set_node_attributes(
+            graph,
+            {node: f"L{level}-NONE" for node in graph if node not in labels},
+            f"{attribute_prefix}_L{level}",
+        )
+
+
 def assign_louvain_communities(
     reddit_graph: nx.Graph,
     wiki_graph: nx.Graph = None,
     reddit_edge_weight: str = "count",
     others_threshold: int = 2,
     louvain_resolution_reddit: float = 1,
+    reddit_dendrogram: List[Dict] = None,
+    wiki_dendrogram: List[Dict] = None,
+    seed: int = None,
 ) -> Union[nx.Graph, Tuple[nx.Graph, nx.Graph]]:
     """ "Calculate communities using the louvain algorithm and assign them as property to the graphs node.
     if two graphs are given, also assign one graph's communities to the other's.
@@ -29,91 +85,45 @@ def assign_louvain_communities(
         reddit_edge_weight (str, optional): edge attribute to use for weighting. Defaults to "count".
         others_threshold (int, optional): minimum size of the communities. Communities smaller than this are mapped to "other". Defaults to 2.
         louvain_resolution_reddit (float, optional): granularity for the louvain algorithm on the Reddit graph. Defaults to 1
+        reddit_dendrogram (List[Dict], optional): dendrogram of the Reddit graph at louvain_resolution_reddit,
+            e.g. from run_louvain_dendrograms. Computed if None. Defaults to None.
+        wiki_dendrogram (List[Dict], optional): dendrogram of the Wikipedia graph. Computed if None. Defaults to None.
+        seed (int, optional): random state of the louvain algorithm, to get the same communities every time.
+            Defaults to None (unseeded).
     Returns:
         Union[nx.Graph, Tuple[nx.Graph, nx.Graph]]: [description]
     """
-    reddit_dendrogram = community.generate_dendrogram(
-        reddit_graph, weight=reddit_edge_weight, resolution=louvain_resolution_reddit
-    )
-    if wiki_graph:
+    if reddit_dendrogram is None:
+        reddit_dendrogram = community.generate_dendrogram(
+            reddit_graph,
+            weight=reddit_edge_weight,
+            resolution=louvain_resolution_reddit,
+            random_state=seed,
+        )
+    if wiki_graph and wiki_dendrogram is None:
         wiki_dendrogram = community.generate_dendrogram(
             wiki_graph,
+            random_state=seed,
         )
 
-    # Iterate over Reddit nodes to assign communities
-    for node in reddit_graph:
-        # Iterate over all levels of the dendrogram
-        for level in range(len(reddit_dendrogram) - 1):
-            actual_level = len(reddit_dendrogram) - 2 - level
-
-            partition = community.partition_at_level(reddit_dendrogram, level)
-
-            node_community = partition[node]
-            counts = Counter(partition.values())
-            if counts[node_community] < others_threshold:
-                node_community = -1
-            reddit_graph.nodes[node][
-                f"louvain_community_reddit_R{louvain_resolution_reddit:.2f}_L{actual_level}"
-            ] = f"L{actual_level}-{node_community:03}"
-        if wiki_graph:
-            # Also add the community from the other graph to allow comparing
-            # Again, iterate over all levels in the dendrogram
-            for level in range(len(wiki_dendrogram) - 1):
-                actual_level = len(wiki_dendrogram) - 2 - level
-
-                partition = community.partition_at_level(wiki_dendrogram, level)
-
-                try:
-                    node_community = partition[node]
-                    counts = Counter(partition.values())
-                    if counts[node_community] < others_threshold:
-                        node_community = -1
-
-                    reddit_graph.nodes[node][
-                        f"louvain_community_wiki_L{actual_level}"
-                    ] = f"L{actual_level}-{node_community:03}"
-
-                except:
-                    reddit_graph.nodes[node][
-                        f"louvain_community_wiki_L{level}"
-                    ] = f"L{level}-NONE"
+    # Each partition and the sizes of its communities are only computed once
+    reddit_prefix = f"louvain_community_reddit_R{louvain_resolution_reddit:.2f}"
+    reddit_partitions = _dendrogram_partitions(reddit_dendrogram)
+    _set_community_attributes(
+        reddit_graph, reddit_partitions, reddit_prefix, others_threshold
+    )
     if wiki_graph:
-        for node in wiki_graph:
-            for level in range(
-                len(wiki_dendrogram) - 1,
-            ):
-                actual_level = len(wiki_dendrogram) - 2 - level
-
-                partition = community.partition_at_level(wiki_dendrogram, level)
-                node_community = partition[node]
-
-                counts = Counter(partition.values())
-                if counts[node_community] < others_threshold:
-                    node_community = -1
-
-                wiki_graph.nodes[node][
-                    f"louvain_community_wiki_L{actual_level}"
-                ] = f"L{actual_level}-{node_community:03}"
-            # Also add the community from the other graph to allow comparing
-
-            for level in range(len(reddit_dendrogram) - 1):
-                actual_level = len(reddit_dendrogram) - 2 - level
-
-                partition = community.partition_at_level(reddit_dendrogram, level)
-
-                try:
-                    node_community = partition[node]
-
-                    counts = Counter(partition.values())
-                    if counts[node_community] < others_threshold:
-                        node_community = -1
-                    wiki_graph.nodes[node][
-                        f"louvain_community_reddit_R{louvain_resolution_reddit:.2f}_L{actual_level}"
-                    ] = f"L{actual_level}-{node_community:03}"
-                except:
-                    wiki_graph.nodes[node][
-                        f"louvain_community_reddit_R{louvain_resolution_reddit:.2f}_L{level}"
-                    ] = f"L{level}-NONE"
+        wiki_partitions = _dendrogram_partitions(wiki_dendrogram)
+        # Also add the community from the other graph to allow comparing
+        _set_community_attributes(
+            reddit_graph, wiki_partitions, "louvain_community_wiki", others_threshold
+        )
+        _set_community_attributes(
+            wiki_graph, wiki_partitions, "louvain_community_wiki", others_threshold
+        )
+        _set_community_attributes(
+            wiki_graph, reddit_partitions, reddit_prefix, others_threshold
+        )
 
     return (
         (reddit_graph, reddit_dendrogram, wiki_graph, wiki_dendrogram)
@@ -122,40 +132,36 @@ def assign_louvain_communities(
     )
 
 
-def get_infomap_communities(graph: nx.Graph, reddit_edge_weight=None):
-    im = Infomap("--flow-model undirected -N 10 --prefer-modular-solution")
-
-    ## im only works with numerical ids, so we need to save a mapping
-
-    ids_to_names = {}
-    names_to_ids = {}
-
-    for index, node in enumerate(graph.nodes):
-        ids_to_names[index] = node
-        names_to_ids[node] = index
-        im.add_node(index, name=node)
+def get_infomap_communities(
+    graph: nx.Graph, reddit_edge_weight=None, use_cache: bool = False
+):
+    """Assign the top-level infomap module of each node to "infomap_community", along
+    with the modules of every level (see assign_infomap_communities).
 
-    # iterate over edges and add them to the im tree, optionally adding the weight
-    for e1, e2, data in graph.edges(data=True):
-        e1_id = names_to_ids[e1]
-        e2_id = names_to_ids[e2]
-        weight = data[reddit_edge_weight] if reddit_edge_weight else None
-        link = (e1_id, e2_id, weight) if weight else (e1_id, e2_id)
-        im.add_link(*link)
+    Args:
+        graph (nx.Graph): graph to find the modules of
+        reddit_edge_weight (str, optional): edge attribute to use as weight. Defaults to None.
+        use_cache (bool, optional): load and save the modules in
+            Config.Path.infomap_cache_folder (see run_infomap). Defaults to False.
 
-    im.run()
-    for node in im.tree:
-        if node.is_leaf:
-            graph.nodes[ids_to_names[node.node_id]][
-                "infomap_community"
-            ] = node.module_id
+    Returns:
+        nx.Graph: the graph
+    """
+    module_paths = lf.assign_infomap_communities(
+        graph, weight=reddit_edge_weight, use_cache=use_cache
+    )
+    nx.set_node_attributes(
+        graph,
+        {node: module_path[0] for node, module_path in module_paths.items()},
+        "infomap_community",
+    )
 
     return graph
 
 
 def assign_root_categories(
     graph: nx.Graph,
-    wiki_data: Dict[str, List],
+    wiki_data: Union["lf.WikiCorpus", Dict[str, List]],
     mapping: Dict[str, List[str]],
     name: str,
 ):
@@ -164,7 +170,8 @@ def assign_root_categories(
 
     Args:
         graph (nx.Graph): nootropics graph
-        wiki_data (Dict[str, List]): wikipedia data as obtained by lf.load_wiki_data
+        wiki_data (Union[lf.WikiCorpus, Dict[str, List]]): wikipedia data as obtained by lf.get_wiki_data
+            (or lf.load_wiki_data)
         mapping (Dict[str, List[str]]): Dict of the form {"root_category":["list","of","sub","categories"]}
         name (str): name of the new node attribute to which to assign the mapping.
     """
@@ -173,7 +180,11 @@ def assign_root_categories(
         for subcategory in subcategories:
             inverse_mapping[subcategory.lower()] = category.lower()
 
-    names_to_categories = dict(zip(wiki_data["name"], wiki_data["categories"]))
+    if isinstance(wiki_data, lf.WikiCorpus):
+        # Built once and shared by all calls
+        names_to_categories = wiki_data.by_name("categories")
+    else:
+        names_to_categories = dict(zip(wiki_data["name"], wiki_data["categories"]))
     for node in graph.nodes:
         graph.nodes[node][name] = []
 
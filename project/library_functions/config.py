@@ -25,6 +25,10 @@ class Config:
 
         full_wiki_data = shared_data_folder / "full_wiki_data.json"
 
+        # Artifacts derived from full_wiki_data, keyed by its hash
+        wiki_cache_folder = shared_data_folder / "wiki_cache"
+        wiki_artifacts_hash = wiki_cache_folder / "artifacts_hash.txt"
+
         psychoactive_category_tree_clean = (
             shared_data_folder / "psychoactive_category_tree_clean.json"
         )
@@ -39,6 +43,14 @@ class Config:
             shared_data_folder / "reddit_data_with_NER_and_sentiment.json"
         )
 
+        # One post per line, to stream the posts without loading all of them
+        reddit_data_with_NER_and_sentiment_jsonl = (
+            shared_data_folder / "reddit_data_with_NER_and_sentiment.jsonl"
+        )
+
+        # Memory-mapped columnar version of reddit_data_with_NER_and_sentiment
+        reddit_snapshot = shared_data_folder / "reddit_snapshot"
+
         substance_names = shared_data_folder / "substance_names.json"
 
         synonym_mapping = shared_data_folder / "synonym_mapping.json"
@@ -66,6 +78,18 @@ class Config:
         wiki_gcc = shared_data_folder / "wiki_gcc.gpickle"
         reddit_gcc = shared_data_folder / "reddit_gcc.gpickle"
         reddit_with_text = shared_data_folder / "reddit_with_textdata.gpickle"
+        # Reddit graphs built by create_graph_reddit(cache=True), keyed by their
+        # arguments and the hash of the data
+        reddit_graph_cache_folder = shared_data_folder / "reddit_graph_cache"
+        # Dendrograms of seeded louvain runs, keyed by the graph and the arguments
+        louvain_dendrogram_cache_folder = shared_data_folder / "louvain_dendrogram_cache"
+        # Modules found by infomap, keyed by the graph and the arguments
+        infomap_cache_folder = shared_data_folder / "infomap_cache"
+        # Reddit graph that new posts can be added to
+        reddit_graph_state = shared_data_folder / "reddit_graph_state.pickle"
+
+        # Everything the website needs at boot, written by build.py
+        site_bundle = shared_data_folder / "site_bundle"
 
     class Color:
         red = (1, 0, 0, 0.3)
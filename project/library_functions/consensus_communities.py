@@ -0,0 +1,206 @@
+import multiprocessing
+import os
+from typing import Dict, Hashable, Iterator, List, Sequence, Tuple
+
+import community
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from tqdm.auto import tqdm
+
+# Graph and arguments of the worker processes of louvain_co_association
+_worker_graph: nx.Graph = None
+_worker_weight: str = None
+_worker_resolution: float = None
+_worker_edges: np.ndarray = None
+
+
+def _init_consensus_worker(graph: nx.Graph, weight: str, resolution: float):
+    global _worker_graph, _worker_weight, _worker_resolution, _worker_edges
+    _worker_graph = graph
+    _worker_weight = weight
+    _worker_resolution = resolution
+    _worker_edges = None if graph is None else _edge_indices(graph)
+
+
+def _edge_indices(graph: nx.Graph) -> np.ndarray:
+    node_index = {node: i for i, node in enumerate(graph.nodes)}
+    return np.array(
+        [(node_index[u], node_index[v]) for u, v in graph.edges],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+
+
+def _count_co_associations(seeds: Sequence[int]) -> Tuple[int, np.ndarray]:
+    # Number of runs in which the ends of each edge are in the same community. Only
+    # the labels of the current run are kept.
+    counts = np.zeros(len(_worker_edges), dtype=np.int32)
+    for seed in seeds:
+        partition = community.best_partition(
+            _worker_graph,
+            weight=_worker_weight,
+            resolution=_worker_resolution,
+            random_state=seed,
+        )
+        labels = np.fromiter(
+            (partition[node] for node in _worker_graph.nodes),
+            dtype=np.int64,
+            count=_worker_graph.number_of_nodes(),
+        )
+        counts += labels[_worker_edges[:, 0]] == labels[_worker_edges[:, 1]]
+    return len(seeds), counts
+
+
+def _iter_co_association_counts(
+    graph: nx.Graph,
+    weight: str,
+    resolution: float,
+    tasks: List[Sequence[int]],
+    n_workers: int,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    if len(tasks) <= 1 or n_workers <= 1:
+        _init_consensus_worker(graph, weight, resolution)
+        try:
+            yield from map(_count_co_associations, tasks)
+        finally:
+            _init_consensus_worker(None, None, None)
+        return
+
+    with multiprocessing.Pool(
+        n_workers,
+        initializer=_init_consensus_worker,
+        initargs=(graph, weight, resolution),
+    ) as pool:
+        yield from pool.imap_unordered(_count_co_associations, tasks)
+
+
+def louvain_co_association(
+    graph: nx.Graph,
+    n_runs: int,
+    resolution: float = 1.0,
+    weight: str = "weight",
+    first_seed: int = 0,
+    n_workers: int = None,
+    runs_per_task: int = 10,
+    show_progress_bars: bool = False,
+) -> sp.csr_matrix:
+    """Run the louvain algorithm several times with different seeds and count how often
+    linked nodes end up in the same community.
+
+    The runs are split into tasks executed in a process pool. Each task only returns the
+    counts of its runs, which are added up as the tasks finish: the partitions of the runs
+    are never kept. Co-associations are only counted for the pairs of nodes linked in the
+    graph, so that the matrix is as sparse as the graph.
+
+    Args:
+        graph (nx.Graph): graph to find the communities of
+        n_runs (int): number of runs, with seeds first_seed, first_seed + 1, ...
+        resolution (float, optional): resolution of the louvain algorithm. Defaults to 1.0.
+        weight (str, optional): edge attribute to use as weight. Defaults to "weight".
+        first_seed (int, optional): random state of the first run. Defaults to 0.
+        n_workers (int, optional): number of processes. Defaults to the number of CPUs.
+        runs_per_task (int, optional): number of runs per task. Defaults to 10.
+        show_progress_bars (bool, optional): show a progress bar over the runs. Defaults to False.
+
+    Returns:
+        sp.csr_matrix: symmetric matrix C, in the order of graph.nodes, where C[i, j] is the
+        fraction of the runs in which the linked nodes i and j are in the same community
+    """
+    seeds = list(range(first_seed, first_seed + n_runs))
+    tasks = [
+        seeds[start : start + runs_per_task]
+        for start in range(0, n_runs, runs_per_task)
+    ]
+    if n_workers is None:
+        n_workers = min(len(tasks), os.cpu_count() or 1)
+
+    edges = _edge_indices(graph)
+    counts = np.zeros(len(edges), dtype=np.int64)
+    with tqdm(total=n_runs, disable=not show_progress_bars) as progress_bar:
+        for task_runs, task_counts in _iter_co_association_counts(
+            graph, weight, resolution, tasks, n_workers
+        ):
+            counts += task_counts
+            progress_bar.update(task_runs)
+
+    n_nodes = graph.number_of_nodes()
+    # Self-loops are kept once, other edges are added in both directions
+    loops = edges[:, 0] == edges[:, 1]
+    rows = np.concatenate([edges[:, 0], edges[~loops, 1]])
+    columns = np.concatenate([edges[:, 1], edges[~loops, 0]])
+    values = np.concatenate([counts, counts[~loops]]) / n_runs
+    return sp.csr_matrix((values, (rows, columns)), shape=(n_nodes, n_nodes))
+
+
+def assign_consensus_communities(
+    graph: nx.Graph,
+    n_runs: int = 100,
+    threshold: float = 0.5,
+    resolution: float = 1.0,
+    weight: str = "weight",
+    others_threshold: int = 2,
+    attribute: str = None,
+    first_seed: int = 0,
+    n_workers: int = None,
+    show_progress_bars: bool = False,
+) -> Dict[Hashable, int]:
+    """Find communities that are stable across many runs of the louvain algorithm and
+    assign them as property to the graph's nodes.
+
+    Linked nodes that are in the same community in at least a fraction threshold of the
+    runs (see louvain_co_association) are put in the same consensus community.
+
+    Args:
+        graph (nx.Graph): graph to find the communities of
+        n_runs (int, optional): number of runs of the louvain algorithm. Defaults to 100.
+        threshold (float, optional): minimum fraction of the runs in which linked nodes
+            must be in the same community to be in the same consensus community. Defaults to 0.5.
+        resolution (float, optional): resolution of the louvain algorithm. Defaults to 1.0.
+        weight (str, optional): edge attribute to use as weight. Defaults to "weight".
+        others_threshold (int, optional): minimum size of the communities. Communities smaller than this are mapped to -1. Defaults to 2.
+        attribute (str, optional): node attribute to assign the communities to, as
+            "C-{community:03}". Defaults to "louvain_consensus_community_R{resolution:.2f}".
+        first_seed (int, optional): see louvain_co_association. Defaults to 0.
+        n_workers (int, optional): see louvain_co_association. Defaults to the number of CPUs.
+        show_progress_bars (bool, optional): show a progress bar over the runs. Defaults to False.
+
+    Returns:
+        Dict[Hashable, int]: consensus community of each node, numbered in the order of
+        graph.nodes (-1 for the communities smaller than others_threshold)
+
+    Examples:
+        >>> partition = assign_consensus_communities(
+        >>>     g_reddit_gcc, n_runs=500, weight="count", show_progress_bars=True
+        >>> )
+        >>> g_reddit_gcc.nodes["caffeine"]["louvain_consensus_community_R1.00"]
+    """
+    co_association = louvain_co_association(
+        graph,
+        n_runs,
+        resolution=resolution,
+        weight=weight,
+        first_seed=first_seed,
+        n_workers=n_workers,
+        show_progress_bars=show_progress_bars,
+    )
+    strong_links = co_association.copy()
+    strong_links.data = strong_links.data >= threshold
+    strong_links.eliminate_zeros()
+    # Components are numbered in the order of their first node
+    _, labels = connected_components(strong_links, directed=False)
+
+    # Renumber the communities that are large enough, map the others to -1
+    large = np.bincount(labels) >= others_threshold
+    community_ids = np.full(len(large), -1, dtype=np.int64)
+    community_ids[large] = np.arange(large.sum())
+    labels = community_ids[labels]
+    partition = dict(zip(graph.nodes, labels.tolist()))
+
+    attribute = attribute or f"louvain_consensus_community_R{resolution:.2f}"
+    nx.set_node_attributes(
+        graph,
+        {node: f"C-{node_community:03}" for node, node_community in partition.items()},
+        attribute,
+    )
+    return partition
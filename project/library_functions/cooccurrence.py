@@ -0,0 +1,99 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+
+
+def incidence_matrix(
+    post_table: "lf.PostTable", rows: np.ndarray, substances: Sequence[str]
+) -> sp.csr_matrix:
+    """Build the sparse posts x substances incidence matrix of the given posts.
+
+    Args:
+        post_table (lf.PostTable): table of the reddit posts
+        rows (np.ndarray): rows of the posts to include, in increasing order
+        substances (Sequence[str]): substances to include (e.g. the nodes of the graph).
+            Matches that are not in this list are ignored.
+
+    Returns:
+        sp.csr_matrix: matrix X where X[i, j] is the number of times that substances[j]
+        is matched in the post at rows[i]
+    """
+    substance_index = {substance: j for j, substance in enumerate(substances)}
+    # Column of each word of the vocabulary, -1 if it isn't one of the substances
+    vocabulary_columns = np.array(
+        [substance_index.get(word, -1) for word in post_table.vocabulary] + [-1],
+        dtype=np.int64,
+    )
+
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = post_table.matches_indptr[rows]
+    lengths = post_table.matches_indptr[rows + 1] - starts
+    # Positions of all the matches of the selected posts in matches_indices
+    first_positions = np.cumsum(lengths) - lengths
+    positions = np.arange(lengths.sum()) + np.repeat(starts - first_positions, lengths)
+
+    columns = vocabulary_columns[post_table.matches_indices[positions]]
+    post_of_match = np.repeat(np.arange(len(rows)), lengths)
+    keep = columns >= 0
+
+    # Duplicate entries (substances matched several times in a post) are summed
+    return sp.csr_matrix(
+        (np.ones(keep.sum()), (post_of_match[keep], columns[keep])),
+        shape=(len(rows), len(substances)),
+    )
+
+
+def cooccurrence_pairs(
+    X: sp.csr_matrix,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """List the co-occurrences of substances in each post.
+
+    Every pair of matches in a post is one co-occurrence, like in link_drugs: two
+    substances matched a and b times in a post co-occur a * b times, and a substance
+    matched a times co-occurs a * (a - 1) / 2 times with itself.
+
+    Args:
+        X (sp.csr_matrix): posts x substances incidence matrix, as built by incidence_matrix
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: for each pair of substances
+        (i <= j) co-occurring in a post: row of the post in X, i, j and number of
+        co-occurrences of the pair in the post
+    """
+    X = X.tocsr()
+    X.sum_duplicates()
+    X.sort_indices()
+    entries_per_row = np.diff(X.indptr)
+    entry_rows = np.repeat(np.arange(X.shape[0]), entries_per_row)
+    # Position of each entry within its row
+    entry_positions = np.arange(X.nnz) - X.indptr[entry_rows]
+
+    # Each entry is paired with itself and the following entries of its row
+    pairs_per_entry = entries_per_row[entry_rows] - entry_positions
+    first = np.repeat(np.arange(X.nnz), pairs_per_entry)
+    first_pair_of_entry = np.cumsum(pairs_per_entry) - pairs_per_entry
+    second = (
+        first + np.arange(len(first)) - np.repeat(first_pair_of_entry, pairs_per_entry)
+    )
+
+    multiplicity_first = X.data[first]
+    multiplicity_second = X.data[second]
+    multiplicities = np.where(
+        first == second,
+        multiplicity_first * (multiplicity_first - 1) / 2,
+        multiplicity_first * multiplicity_second,
+    )
+
+    keep = multiplicities > 0
+    return (
+        entry_rows[first][keep],
+        X.indices[first][keep].astype(np.int64),
+        X.indices[second][keep].astype(np.int64),
+        multiplicities[keep],
+    )
@@ -1,4 +1,7 @@
-from typing import List, Any, Union
+import itertools
+import multiprocessing
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Any, Literal, Tuple, Union
 from pathlib import Path
 
 from tqdm.auto import tqdm
@@ -22,6 +25,12 @@ def create_graph_reddit(
     include_link_contents: bool = False,
     alternative_path: Union[str, Path] = None,
     show_progress_bars: bool = False,
+    posts: Union["lf.PostTable", Mapping, Iterable[Tuple[str, Dict]]] = None,
+    backend: Literal["auto", "python", "sparse"] = "auto",
+    n_workers: int = 1,
+    contents_mode: Literal["text", "rows"] = "text",
+    cache: bool = False,
+    cache_format: Literal["npz", "pickle"] = "npz",
 ):
     """
     Args:
@@ -41,10 +50,19 @@ def create_graph_reddit(
                                                 content will be disregarded.
 
         conditional_functions_dict (dict): a dictionary keyed by attribute names
-                                           whose values are functions that
-                                           represent conditions for those
-                                           attributes, e.g.
-                                           {'polarity': lambda x: x > 0.1}
+                                           whose values are conditions for
+                                           those attributes, either
+                                           declarative, e.g.
+                                           {'polarity': ('>', 0.1),
+                                            'subjectivity': ('between', 0.2, 0.8)}
+                                           or as functions, e.g.
+                                           {'polarity': lambda x: x > 0.1}.
+                                           Declarative conditions (operators
+                                           >, >=, <, <=, ==, != and between,
+                                           bounds included) are evaluated on
+                                           all posts at once, and can be
+                                           pickled. Functions are called on
+                                           each post.
 
         include_node_contents (bool): A boolean determining whether to assign
                                       the content of the posts containing a
@@ -56,6 +74,61 @@ def create_graph_reddit(
 
         show_progress_bars (): A boolean deciding whether to show progress bars.
 
+        posts (PostTable, Mapping or Iterable): the posts to build the graph
+                                     from, either as a PostTable, as a
+                                     mapping from post ids to posts or as an
+                                     iterator of (post_id, post) tuples, e.g.
+                                     load_data_reddit(stream=True). Posts are
+                                     consumed one at a time, so memory use is
+                                     proportional to the graph rather than to
+                                     the corpus. Posts in a PostTable are
+                                     filtered on its columns before any of
+                                     them is read. Defaults to the post table
+                                     of the data store, or to streaming the
+                                     posts from alternative_path if it is
+                                     given.
+
+        backend (str): how to link the drugs. "python" walks over every pair
+                       of drugs in every post (see link_drugs). "sparse"
+                       computes the co-occurrences of all posts at once from
+                       a sparse posts x substances matrix (see
+                       link_drugs_sparse), which is much faster. Per-post
+                       edge attributes (number_of_drugs_in_post, polarity,
+                       subjectivity) are then read-only numpy arrays instead
+                       of lists. "auto" uses "sparse" when posts is a
+                       PostTable, "python" otherwise.
+
+        n_workers (int): number of processes linking the drugs with the
+                         "python" backend. Posts are split into shards that
+                         are linked in parallel, and the partial results are
+                         merged in the order of the posts, so the graph is
+                         the same as with a single process.
+
+        contents_mode (str): how to store the node and link contents. "text"
+                             stores a copy of the text of each post on every
+                             node and edge it mentions. "rows" stores the rows
+                             of the posts in the post table instead (as
+                             PostContents, which decode the texts when they
+                             are accessed), and requires the "sparse"
+                             backend. Either way, nodes also get the total
+                             and mean length of their contents
+                             ("contents_total_length",
+                             "contents_mean_length").
+
+        cache (bool): save the graph in Config.Path.reddit_graph_cache_folder,
+                      and load it from there instead of building it when it
+                      was already built with the same arguments from the same
+                      data (the reddit posts of alternative_path, or of the
+                      data store, and the wikipedia data). Changing any of the
+                      arguments that affect the graph, or the data, builds a
+                      new graph. Requires declarative conditions, and posts
+                      read from a file (posts must be None).
+
+        cache_format (str): how to save cached graphs. "npz" stores each
+                            attribute as flat numpy arrays in a compressed
+                            file (see save_graph_npz), "pickle" pickles the
+                            graph.
+
     Returns:
 
     Examples:
@@ -63,7 +136,7 @@ def create_graph_reddit(
         >>>        max_drugs_in_post=10,
         >>>        min_edge_occurrences_to_link=3,
         >>>        min_content_length_in_characters=25,
-        >>>        conditional_functions_dict={'polarity': lambda x: x > 0.1},
+        >>>        conditional_functions_dict={'polarity': ('>', 0.1)},
         >>>        alternative_path=None,
         >>>        include_node_contents=False,
         >>>        include_link_contents=False
@@ -74,49 +147,134 @@ def create_graph_reddit(
     if conditional_functions_dict is None:
         conditional_functions_dict = dict()
 
+    if cache:
+        if posts is not None:
+            raise ValueError(
+                "Only graphs built from a file can be cached: pass alternative_path "
+                "instead of posts"
+            )
+        # Everything the graph depends on: the posts are streamed from
+        # alternative_path, and the post table of the data store is used otherwise
+        arguments = dict(
+            max_drugs_in_post=max_drugs_in_post,
+            min_edge_occurrences_to_link=min_edge_occurrences_to_link,
+            min_content_length_in_characters=min_content_length_in_characters,
+            conditional_functions_dict=conditional_functions_dict,
+            include_node_contents=include_node_contents,
+            include_link_contents=include_link_contents,
+            alternative_path=str(alternative_path) if alternative_path else None,
+            backend=backend
+            if backend != "auto"
+            else ("python" if alternative_path else "sparse"),
+            contents_mode=contents_mode,
+        )
+        source_hash = lf.get_reddit_graph_source_hash(alternative_path)
+        g_reddit = lf.load_cached_reddit_graph(arguments, source_hash, cache_format)
+        if g_reddit is None:
+            g_reddit = create_graph_reddit(
+                **arguments,
+                show_progress_bars=show_progress_bars,
+                n_workers=n_workers,
+            )
+            lf.save_cached_reddit_graph(g_reddit, arguments, source_hash, cache_format)
+        return g_reddit
+
     # Load the clean Reddit and Wiki data
-    drug_database_reddit = lf.load_data_reddit(alternative_path)
-    wiki_data = lf.load_data_wiki()
-    substance_names = lf.load_substance_names()
+    if posts is None:
+        if alternative_path:
+            posts = lf.load_data_reddit(alternative_path, stream=True)
+        else:
+            posts = lf.data_store.post_table
 
     # Initialize graphs
-    g_reddit = nx.Graph()
-    g_reddit.add_nodes_from(substance_names)
-
-    # Assign node properties. Note thad we use drug names as nodes, and that
-    # the drug names are taken from Wikipedia
-    for index_drug, drug in enumerate(wiki_data["name"]):
-        if drug in g_reddit.nodes:
-            g_reddit.nodes[drug]["count"] = 0
-            g_reddit.nodes[drug]["polarity"] = []
-            g_reddit.nodes[drug]["subjectivity"] = []
-            g_reddit.nodes[drug]["contents"] = []
-            g_reddit.nodes[drug]["ids"] = []
-            g_reddit.nodes[drug]["categories"] = wiki_data["categories"][index_drug]
+    g_reddit = empty_graph_reddit()
 
-    # Link drugs that appear in the same post
-    for post_id, reddit_post in tqdm(
-        list(drug_database_reddit.items()), disable=not show_progress_bars
-    ):
+    if backend == "auto":
+        backend = "sparse" if isinstance(posts, lf.PostTable) else "python"
 
-        # Disregard the post if the length of its content does not
-        # surpass the threshold
-        if len(reddit_post["content"]) < min_content_length_in_characters:
-            continue
+    if contents_mode == "rows" and backend != "sparse":
+        raise ValueError("contents_mode='rows' requires the sparse backend")
 
-        # Link the drugs and assign link attributes
-        link_drugs(
-            G=g_reddit,
-            list_of_drugs=reddit_post["matches"],
-            polarity=reddit_post["polarity"],
-            subjectivity=reddit_post["subjectivity"],
-            text=reddit_post["title"] + " " + reddit_post["content"],
+    if backend == "sparse":
+        if not isinstance(posts, lf.PostTable):
+            posts = lf.PostTable.from_posts(posts)
+        rows = select_posts(
+            posts,
             max_drugs_in_post=max_drugs_in_post,
+            min_content_length_in_characters=min_content_length_in_characters,
             conditional_functions_dict=conditional_functions_dict,
+        )
+        link_drugs_sparse(
+            G=g_reddit,
+            post_table=posts,
+            rows=rows,
+            min_edge_occurrences_to_link=min_edge_occurrences_to_link,
+            include_node_contents=include_node_contents,
             include_link_contents=include_link_contents,
+            show_progress_bars=show_progress_bars,
+            contents_mode=contents_mode,
+        )
+        return g_reddit
+
+    # Posts to link, as (post_id, matches, polarity, subjectivity, text) tuples
+    include_text = include_node_contents or include_link_contents
+    if isinstance(posts, lf.PostTable):
+        # Filter the posts on the columns of the table, and only read the
+        # posts that are kept
+        rows = select_posts(
+            posts,
+            max_drugs_in_post=max_drugs_in_post,
+            min_content_length_in_characters=min_content_length_in_characters,
+            conditional_functions_dict=conditional_functions_dict,
+        )
+        posts_to_link = (
+            (
+                posts.ids[row],
+                posts.matches(row),
+                float(posts.polarity[row]),
+                float(posts.subjectivity[row]),
+                posts.text(row) if include_text else None,
+            )
+            for row in rows
+        )
+    else:
+        if isinstance(posts, Mapping):
+            posts = posts.items()
+        posts_to_link = iter_posts_to_link(
+            posts,
+            min_content_length_in_characters=min_content_length_in_characters,
+            conditional_functions_dict=conditional_functions_dict,
+            include_text=include_text,
+        )
+
+    if n_workers > 1:
+        link_drugs_parallel(
+            G=g_reddit,
+            posts_to_link=posts_to_link,
+            n_workers=n_workers,
+            max_drugs_in_post=max_drugs_in_post,
             include_node_contents=include_node_contents,
-            post_id=post_id,
+            include_link_contents=include_link_contents,
+            show_progress_bars=show_progress_bars,
         )
+    else:
+        # Link drugs that appear in the same post
+        for post_id, matches, polarity, subjectivity, text in tqdm(
+            posts_to_link, disable=not show_progress_bars
+        ):
+            # Link the drugs and assign link attributes
+            link_drugs(
+                G=g_reddit,
+                list_of_drugs=matches,
+                polarity=polarity,
+                subjectivity=subjectivity,
+                text=text,
+                max_drugs_in_post=max_drugs_in_post,
+                conditional_functions_dict={},
+                include_link_contents=include_link_contents,
+                include_node_contents=include_node_contents,
+                post_id=post_id,
+            )
 
     # Remove the edges that occur fewer times than the threshold
     if min_edge_occurrences_to_link > 1:
@@ -129,17 +287,134 @@ def create_graph_reddit(
         g_reddit.remove_edges_from(edges_to_remove)
 
     # Weight the parameters
-    attributes_to_weight = ["polarity", "subjectivity"]
-
-    for edge in tqdm(g_reddit.edges, disable=not show_progress_bars):
-        for attribute in attributes_to_weight:
-            g_reddit.edges[edge][attribute + "_weighted"] = weigh_attribute(
-                attribute, g_reddit.edges[edge]
+    weigh_attributes(g_reddit, ["polarity", "subjectivity"])
+
+    # Length statistics of the node contents (also assigned by link_drugs_sparse)
+    if include_node_contents:
+        for node, contents in g_reddit.nodes(data="contents"):
+            lengths = [len(text) for text in contents]
+            g_reddit.nodes[node]["contents_total_length"] = sum(lengths)
+            g_reddit.nodes[node]["contents_mean_length"] = (
+                float(np.mean(lengths)) if lengths else 0.0
             )
 
     return g_reddit
 
 
+def empty_graph_reddit() -> nx.Graph:
+    """Get a graph with a node for each substance, with initialized attributes and no edges.
+
+    Returns:
+        nx.Graph: graph to link the drugs in
+    """
+    wiki_data = lf.data_store.wiki_data
+    substance_names = lf.data_store.substance_names
+
+    g_reddit = nx.Graph()
+    g_reddit.add_nodes_from(substance_names)
+
+    # Assign node properties. Note thad we use drug names as nodes, and that
+    # the drug names are taken from Wikipedia
+    for index_drug, drug in enumerate(wiki_data["name"]):
+        if drug in g_reddit.nodes:
+            g_reddit.nodes[drug]["count"] = 0
+            g_reddit.nodes[drug]["polarity"] = []
+            g_reddit.nodes[drug]["subjectivity"] = []
+            g_reddit.nodes[drug]["contents"] = []
+            g_reddit.nodes[drug]["ids"] = []
+            g_reddit.nodes[drug]["categories"] = wiki_data["categories"][index_drug]
+
+    return g_reddit
+
+
+def select_posts(
+    post_table: "lf.PostTable",
+    max_drugs_in_post: Union[int, np.int] = np.inf,
+    min_content_length_in_characters: Union[int, np.int] = 0,
+    conditional_functions_dict: dict = None,
+) -> np.ndarray:
+    """Get the rows of the posts that pass the filters of create_graph_reddit.
+
+    The length and number of drugs filters, and the declarative conditions, are
+    evaluated on whole columns at once; conditional functions are only called on
+    the posts that pass the other filters.
+
+    Polarity and subjectivity are stored in double precision in every table, so the
+    same posts are selected as when the conditions are evaluated on the raw posts.
+
+    Returns:
+        np.ndarray: rows of the selected posts, in increasing order
+    """
+    n_matches = post_table.n_matches
+    selected = (
+        (post_table.content_lengths >= min_content_length_in_characters)
+        & (n_matches >= 1)
+        & (n_matches <= max_drugs_in_post)
+    )
+
+    for attribute, condition in (conditional_functions_dict or {}).items():
+        if attribute not in ("polarity", "subjectivity"):
+            continue
+        column = getattr(post_table, attribute)
+        if lf.is_declarative_condition(condition):
+            # One masked operation over the whole column
+            selected &= lf.condition_mask(condition, column)
+        else:
+            # Functions can only be called post by post
+            rows = np.flatnonzero(selected)
+            selected[rows] = [bool(condition(float(column[row]))) for row in rows]
+
+    return np.flatnonzero(selected)
+
+
+def iter_posts_to_link(
+    posts: Iterable[Tuple[str, Dict]],
+    min_content_length_in_characters: int = 0,
+    conditional_functions_dict: dict = None,
+    include_text: bool = False,
+) -> Iterator[Tuple[str, List[str], float, float, str]]:
+    """Filter posts on the length of their content and on conditional functions.
+
+    Args:
+        posts (Iterable[Tuple[str, Dict]]): (post_id, post) tuples
+        min_content_length_in_characters (int, optional): see create_graph_reddit. Defaults to 0.
+        conditional_functions_dict (dict, optional): see create_graph_reddit. Defaults to None.
+        include_text (bool, optional): include the text of the posts. Defaults to False.
+
+    Yields:
+        Tuple[str, List[str], float, float, str]: post id, matches, polarity, subjectivity
+        and text (title and content, or None if include_text is False) of the kept posts
+    """
+    conditions = {
+        attribute: lf.as_condition_function(condition)
+        for attribute, condition in (conditional_functions_dict or {}).items()
+    }
+    for post_id, reddit_post in posts:
+
+        # Disregard the post if the length of its content does not
+        # surpass the threshold
+        if len(reddit_post["content"]) < min_content_length_in_characters:
+            continue
+
+        # Discard posts that do NOT meet the polarity/subjectivity criteria
+        if any(
+            not conditions[attribute](reddit_post[attribute])
+            for attribute in ("polarity", "subjectivity")
+            if attribute in conditions
+        ):
+            continue
+
+        yield (
+            post_id,
+            reddit_post["matches"],
+            reddit_post["polarity"],
+            reddit_post["subjectivity"],
+            reddit_post["title"] + " " + reddit_post["content"]
+            if include_text
+            else None,
+        )
+
+
 def link_drugs(
     G: nx.Graph,
     list_of_drugs: List[str],
@@ -159,12 +434,14 @@ def link_drugs(
 
     # Discard posts that do NOT meet the polarity criteria
     if "polarity" in conditional_functions_dict.keys():
-        condition = conditional_functions_dict["polarity"]
+        condition = lf.as_condition_function(conditional_functions_dict["polarity"])
         if not condition(polarity):
             return
     # Discard posts that do NOT meet the subjectivity criteria
     if "subjectivity" in conditional_functions_dict.keys():
-        condition = conditional_functions_dict["subjectivity"]
+        condition = lf.as_condition_function(
+            conditional_functions_dict["subjectivity"]
+        )
         if not condition(subjectivity):
             return
 
@@ -213,12 +490,335 @@ def link_drugs(
                     )
 
 
-def weigh_attribute(attribute_to_weigh, all_edge_attributes):
-    value_attribute = np.array(all_edge_attributes[attribute_to_weigh])
-    number_of_drugs_in_post = np.array(all_edge_attributes["number_of_drugs_in_post"])
-    weights = 1 / (number_of_drugs_in_post - 1)
+class _LinkAccumulator:
+    """Stand-in for the nx.Graph that link_drugs fills, keeping the node and edge
+    attributes in plain dicts, in the order in which they were first added, so that
+    the results of several processes can be merged back in order.
+    """
+
+    def __init__(self, nodes: Iterable[str]):
+        self.nodes = {
+            node: {
+                "count": 0,
+                "polarity": [],
+                "subjectivity": [],
+                "contents": [],
+                "ids": [],
+            }
+            for node in nodes
+        }
+        self.edges = _UndirectedEdges()
+
+    def has_edge(self, u: str, v: str) -> bool:
+        return (u, v) in self.edges or (v, u) in self.edges
+
+    def add_edge(self, u: str, v: str, **attributes):
+        self.edges[(u, v)] = attributes
+
+
+class _UndirectedEdges(dict):
+    def __getitem__(self, edge: Tuple[str, str]) -> Dict:
+        if not dict.__contains__(self, edge):
+            edge = edge[::-1]
+        return dict.__getitem__(self, edge)
+
+
+# Arguments of link_drugs shared by all the shards, set in each worker process
+_shard_arguments: Dict[str, Any] = {}
+
+
+def _init_shard_worker(
+    nodes: List[str],
+    max_drugs_in_post: int,
+    include_node_contents: bool,
+    include_link_contents: bool,
+):
+    _shard_arguments["nodes"] = nodes
+    _shard_arguments["link_drugs"] = {
+        "max_drugs_in_post": max_drugs_in_post,
+        "include_node_contents": include_node_contents,
+        "include_link_contents": include_link_contents,
+    }
+
+
+def _link_drugs_shard(
+    shard: List[Tuple[str, List[str], float, float, str]]
+) -> Tuple[Dict, Dict]:
+    accumulator = _LinkAccumulator(_shard_arguments["nodes"])
+    for post_id, matches, polarity, subjectivity, text in shard:
+        link_drugs(
+            G=accumulator,
+            list_of_drugs=matches,
+            polarity=polarity,
+            subjectivity=subjectivity,
+            text=text,
+            post_id=post_id,
+            conditional_functions_dict={},
+            **_shard_arguments["link_drugs"],
+        )
+    # Only send back what changed
+    nodes = {node: data for node, data in accumulator.nodes.items() if data["count"]}
+    return nodes, dict(accumulator.edges)
+
+
+def _iter_shards(iterable: Iterable, shard_size: int) -> Iterator[List]:
+    shard = []
+    for item in iterable:
+        shard.append(item)
+        if len(shard) == shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+def link_drugs_parallel(
+    G: nx.Graph,
+    posts_to_link: Iterable[Tuple[str, List[str], float, float, str]],
+    n_workers: int,
+    max_drugs_in_post: int = np.inf,
+    include_node_contents: bool = False,
+    include_link_contents: bool = False,
+    show_progress_bars: bool = False,
+    shard_size: int = 5000,
+):
+    """Equivalent of calling link_drugs on each post, using several processes.
+
+    The posts are split into shards of consecutive posts, which are linked in parallel.
+    The partial node and edge attributes of the shards are then merged into G in the
+    order of the shards, so that G ends up exactly as if the posts had been linked one
+    after the other (same lists, in the same order, and same order of the edges).
+
+    Args:
+        G (nx.Graph): graph whose nodes are the substances, with initialized attributes
+        posts_to_link (Iterable[Tuple[str, List[str], float, float, str]]): post id, matches,
+            polarity, subjectivity and text of the posts, e.g. as yielded by iter_posts_to_link
+        n_workers (int): number of processes
+        max_drugs_in_post (int, optional): see create_graph_reddit. Defaults to np.inf.
+        include_node_contents (bool, optional): see create_graph_reddit. Defaults to False.
+        include_link_contents (bool, optional): see create_graph_reddit. Defaults to False.
+        show_progress_bars (bool, optional): show a progress bar over the shards. Defaults to False.
+        shard_size (int, optional): number of posts per shard. Defaults to 5000.
+    """
+    with multiprocessing.Pool(
+        n_workers,
+        initializer=_init_shard_worker,
+        initargs=(
+            list(G.nodes),
+            max_drugs_in_post,
+            include_node_contents,
+            include_link_contents,
+        ),
+    ) as pool:
+        # imap returns the results in the order of the shards
+        results = pool.imap(_link_drugs_shard, _iter_shards(posts_to_link, shard_size))
+        for nodes, edges in tqdm(results, disable=not show_progress_bars):
+            for node, data in nodes.items():
+                node_attributes = G.nodes[node]
+                node_attributes["count"] += data["count"]
+                for key in ("polarity", "subjectivity", "ids", "contents"):
+                    node_attributes[key].extend(data[key])
+
+            for edge, data in edges.items():
+                if G.has_edge(*edge):
+                    edge_attributes = G.edges[edge]
+                    edge_attributes["count"] += data["count"]
+                    for key in ("number_of_drugs_in_post", "polarity", "subjectivity"):
+                        edge_attributes[key].extend(data[key])
+                    if include_link_contents:
+                        edge_attributes["contents"].extend(data["contents"])
+                else:
+                    G.add_edge(*edge, **data)
+
+
+def link_drugs_sparse(
+    G: nx.Graph,
+    post_table: "lf.PostTable",
+    rows: np.ndarray,
+    min_edge_occurrences_to_link: int = 1,
+    include_node_contents: bool = False,
+    include_link_contents: bool = False,
+    show_progress_bars: bool = False,
+    contents_mode: Literal["text", "rows"] = "text",
+):
+    """Vectorized equivalent of calling link_drugs on each of the given posts, removing
+    the rare edges and weighing the edge attributes.
+
+    The co-occurrences are listed from X, the posts x substances incidence matrix, and
+    their attributes are kept in an EdgeAttributeStore, whose read-only per-edge views
+    replace the lists built by link_drugs. The store is available as
+    G.graph["edge_attribute_store"].
 
-    number_of_posts_containing_link = all_edge_attributes["count"]
-    value_weighted = np.sum(weights * value_attribute) / np.sum(weights)
+    Args:
+        G (nx.Graph): graph whose nodes are the substances, with initialized attributes
+        post_table (lf.PostTable): table of the reddit posts
+        rows (np.ndarray): rows of the posts to link, as returned by select_posts
+        min_edge_occurrences_to_link (int, optional): minimum count of the edges to add. Defaults to 1.
+        include_node_contents (bool, optional): add the text of the posts to the nodes. Defaults to False.
+        include_link_contents (bool, optional): add the text of the posts to the edges. Defaults to False.
+        show_progress_bars (bool, optional): show a progress bar over the nodes. Defaults to False.
+        contents_mode (str, optional): see create_graph_reddit. Defaults to "text".
+    """
+    nodes = list(G.nodes)
+    X = lf.incidence_matrix(post_table, rows, nodes)
+
+    assign_node_attributes_sparse(
+        G,
+        post_table=post_table,
+        rows=rows,
+        X=X,
+        include_node_contents=include_node_contents,
+        show_progress_bars=show_progress_bars,
+        contents_mode=contents_mode,
+    )
+
+    store = lf.EdgeAttributeStore.from_cooccurrences(
+        post_table,
+        rows=rows,
+        X=X,
+        nodes=nodes,
+        min_edge_occurrences_to_link=min_edge_occurrences_to_link,
+    )
+    add_store_edges(
+        G,
+        store,
+        post_table=post_table,
+        include_link_contents=include_link_contents,
+        contents_mode=contents_mode,
+    )
+
+
+def add_store_edges(
+    G: nx.Graph,
+    store: "lf.EdgeAttributeStore",
+    post_table: "lf.PostTable",
+    include_link_contents: bool = False,
+    contents_mode: Literal["text", "rows"] = "text",
+):
+    """Add the edges of an EdgeAttributeStore to a graph, with the attributes that
+    link_drugs and weigh_attributes would assign. The store is available as
+    G.graph["edge_attribute_store"].
 
-    return value_weighted
+    Args:
+        G (nx.Graph): graph whose nodes are the substances
+        store (lf.EdgeAttributeStore): store built from the posts of post_table
+        post_table (lf.PostTable): table of the reddit posts
+        include_link_contents (bool, optional): add the text of the posts to the edges. Defaults to False.
+        contents_mode (str, optional): see create_graph_reddit. Defaults to "text".
+    """
+    counts = store.counts.tolist()
+    polarity_weighted = store.weighted("polarity").tolist()
+    subjectivity_weighted = store.weighted("subjectivity").tolist()
+
+    def edge_data(index: int) -> Dict:
+        data = store.edge_attributes(index)
+        data["count"] = counts[index]
+        data["contents"] = None
+        if include_link_contents:
+            start, end = store.offsets[index], store.offsets[index + 1]
+            if contents_mode == "rows":
+                data["contents"] = lf.PostContents(
+                    store.post_rows[start:end], post_table
+                )
+            else:
+                data["contents"] = [
+                    post_table.text(row) for row in store.post_rows[start:end]
+                ]
+        data["polarity_weighted"] = polarity_weighted[index]
+        data["subjectivity_weighted"] = subjectivity_weighted[index]
+        return data
+
+    G.add_edges_from(
+        (source, target, edge_data(index))
+        for index, (source, target) in enumerate(store.edges)
+    )
+    G.graph["edge_attribute_store"] = store
+
+
+def assign_node_attributes_sparse(
+    G: nx.Graph,
+    post_table: "lf.PostTable",
+    rows: np.ndarray,
+    X,
+    include_node_contents: bool = False,
+    show_progress_bars: bool = False,
+    contents_mode: Literal["text", "rows"] = "text",
+):
+    """Assign the node attributes that link_drugs would assign, from an incidence matrix.
+
+    With include_node_contents, the nodes also get the total and mean length of their
+    contents, as "contents_total_length" and "contents_mean_length".
+
+    Args:
+        G (nx.Graph): graph whose nodes are the substances, with initialized attributes
+        post_table (lf.PostTable): table of the reddit posts
+        rows (np.ndarray): rows of the posts, in increasing order
+        X (sp.spmatrix): incidence matrix of these posts and of the nodes of G, as built by
+            lf.incidence_matrix
+        include_node_contents (bool, optional): add the text of the posts to the nodes. Defaults to False.
+        show_progress_bars (bool, optional): show a progress bar over the nodes. Defaults to False.
+        contents_mode (str, optional): see create_graph_reddit. Defaults to "text".
+    """
+    # Assign the node attributes, from the posts mentioning each node in order
+    X_by_node = X.tocsc()
+    X_by_node.sort_indices()
+    text_lengths = post_table.text_lengths if include_node_contents else None
+    for index, node in enumerate(tqdm(list(G.nodes), disable=not show_progress_bars)):
+        start, end = X_by_node.indptr[index], X_by_node.indptr[index + 1]
+        # A post mentioning the node several times is counted several times
+        node_rows = np.repeat(
+            rows[X_by_node.indices[start:end]],
+            X_by_node.data[start:end].astype(np.int64),
+        )
+        attributes = G.nodes[node]
+        if include_node_contents:
+            lengths = text_lengths[node_rows]
+            attributes["contents_total_length"] = int(lengths.sum())
+            attributes["contents_mean_length"] = (
+                float(lengths.mean()) if len(lengths) else 0.0
+            )
+            if contents_mode == "rows":
+                attributes["contents"] = lf.PostContents(node_rows, post_table)
+        if start == end:
+            continue
+
+        attributes["count"] += len(node_rows)
+        attributes["polarity"].extend(post_table.polarity[node_rows].tolist())
+        attributes["subjectivity"].extend(post_table.subjectivity[node_rows].tolist())
+        attributes["ids"].extend(post_table.ids[row] for row in node_rows)
+        if include_node_contents and contents_mode == "text":
+            attributes["contents"].extend(post_table.text(row) for row in node_rows)
+
+
+def weigh_attributes(G: nx.Graph, attributes: List[str]):
+    """Weigh edge attributes by 1 / (number_of_drugs_in_post - 1), for all edges at once.
+
+    The per-edge lists are concatenated into flat arrays, and the weighted means are
+    computed with segment reductions. Adds an "<attribute>_weighted" attribute to the edges.
+
+    Args:
+        G (nx.Graph): graph whose edges have per-post lists of attributes, as built by link_drugs
+        attributes (List[str]): attributes to weigh, e.g. ["polarity", "subjectivity"]
+    """
+    edges_data = [data for _, _, data in G.edges(data=True)]
+    lengths = np.fromiter(
+        (len(data["number_of_drugs_in_post"]) for data in edges_data),
+        dtype=np.int64,
+        count=len(edges_data),
+    )
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+    def flatten(attribute: str) -> np.ndarray:
+        return np.fromiter(
+            itertools.chain.from_iterable(data[attribute] for data in edges_data),
+            dtype=np.float64,
+            count=offsets[-1],
+        )
+
+    number_of_drugs_in_post = flatten("number_of_drugs_in_post")
+    for attribute in attributes:
+        weighted = lf.weighted_segment_means(
+            flatten(attribute), number_of_drugs_in_post, offsets
+        )
+        for data, value in zip(edges_data, weighted.tolist()):
+            data[attribute + "_weighted"] = value
@@ -1,40 +1,119 @@
+import os
+import pickle
+from pathlib import Path
+from typing import Optional, Tuple
+
 import networkx as nx
 
+import wojciech as w
+
 try:
     import library_functions as lf
 except ModuleNotFoundError:
     import project.library_functions as lf
+try:
+    from library_functions.config import Config
+except ModuleNotFoundError:
+    from project.library_functions.config import Config
+
 
+def create_graph_wiki() -> nx.DiGraph:
+    """Build the directed graph of the links between the wikipedia pages of the substances.
 
-def create_graph_wiki():
+    Nodes and edges are listed first and added to the graph in bulk.
+
+    Returns:
+        nx.DiGraph: graph with one node per substance (with the categories, content and
+        url of its page) and one edge per link between pages (with the number of links)
+    """
     # Load data and substance names
-    wiki_data = lf.load_data_wiki()
-    substance_names = lf.load_substance_names()
+    wiki_data = lf.data_store.wiki_data
+    substance_names = lf.data_store.substance_names
+    nodes = set(substance_names)
+
+    # Node properties, for the substances that have a page
+    node_attributes = {
+        drug: {"categories": categories, "content": content, "url": url}
+        for drug, categories, content, url in zip(
+            wiki_data["name"],
+            wiki_data["categories"],
+            wiki_data["content"],
+            wiki_data["url"],
+        )
+        if drug in nodes
+    }
+
+    # Edges, in the order of the pages and of their links
+    edges = [
+        (drug, drug_to_link_to, {"count": n_links})
+        for drug, links in zip(wiki_data["name"], wiki_data["links"])
+        if drug in nodes
+        for drug_to_link_to, n_links in links.items()
+        if drug_to_link_to in nodes
+    ]
 
-    # Get the wiki
     g_wiki = nx.DiGraph()
-    g_wiki.add_nodes_from(substance_names, categories=[])
-
-    for index_drug, drug in enumerate(wiki_data["name"]):
-        if drug in g_wiki.nodes:
-            g_wiki.nodes[drug]["categories"] = wiki_data["categories"][index_drug]
-            g_wiki.nodes[drug]["content"] = wiki_data["content"][index_drug]
-            g_wiki.nodes[drug]["url"] = wiki_data["url"][index_drug]
-
-    # Add node properties.
-    for index_drug, drug in enumerate(wiki_data["name"]):
-        if drug in g_wiki.nodes:
-            g_wiki.nodes[drug]["categories"] = wiki_data["categories"][index_drug]
-            g_wiki.nodes[drug]["content"] = wiki_data["content"][index_drug]
-            g_wiki.nodes[drug]["url"] = wiki_data["url"][index_drug]
-
-    # Add edges.
-    for index_drug, drug in enumerate(wiki_data["name"]):
-        if drug not in g_wiki.nodes:
-            continue
-
-        for drug_to_link_to, n_links in wiki_data["links"][index_drug].items():
-            if drug_to_link_to in g_wiki.nodes:
-                g_wiki.add_edge(drug, drug_to_link_to, count=n_links)
+    g_wiki.add_nodes_from(
+        (drug, node_attributes.get(drug, {"categories": []})) for drug in substance_names
+    )
+    g_wiki.add_edges_from(edges)
 
     return g_wiki
+
+
+def _load_graph(path: Path, source_hash: str) -> Optional[nx.Graph]:
+    try:
+        with open(path, "rb") as f:
+            saved = pickle.load(f)
+        if saved["source_hash"] != source_hash:
+            return None
+        return saved["graph"]
+    except FileNotFoundError:
+        return None
+    except (*lf.CACHE_READ_ERRORS, TypeError):
+        # Truncated or corrupt file: it is rebuilt
+        lf.discard_cache_entry(path)
+        return None
+
+
+def _save_graph(path: Path, source_hash: str, graph: nx.Graph):
+    # Write to a temporary file first so that concurrent readers never see a
+    # half-written graph
+    temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(temp_path, "wb") as f:
+        pickle.dump(
+            {"source_hash": source_hash, "graph": graph},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(temp_path, path)
+
+
+def load_graphs_wiki(use_cache: bool = True) -> Tuple[nx.DiGraph, nx.Graph]:
+    """Get the wiki graph and the GCC of its undirected version.
+
+    Both graphs are saved to Config.Path.wiki_digraph and Config.Path.wiki_gcc along with
+    the hash of the wikipedia data they were built from, and loaded from there as long as
+    that data doesn't change.
+
+    Args:
+        use_cache (bool, optional): load the saved graphs if they are up to date. If False,
+            the graphs are rebuilt (and saved). Defaults to True.
+
+    Returns:
+        Tuple[nx.DiGraph, nx.Graph]: directed wiki graph, and undirected GCC
+    """
+    source_hash = lf.get_wiki_source_hash()
+
+    if use_cache:
+        g_wiki = _load_graph(Config.Path.wiki_digraph, source_hash)
+        g_wiki_gcc = _load_graph(Config.Path.wiki_gcc, source_hash)
+        if g_wiki is not None and g_wiki_gcc is not None:
+            return g_wiki, g_wiki_gcc
+
+    g_wiki = create_graph_wiki()
+    g_wiki_gcc = w.graph.largest_connected_component(g_wiki.to_undirected())
+    _save_graph(Config.Path.wiki_digraph, source_hash, g_wiki)
+    _save_graph(Config.Path.wiki_gcc, source_hash, g_wiki_gcc)
+
+    return g_wiki, g_wiki_gcc
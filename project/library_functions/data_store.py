@@ -0,0 +1,137 @@
+import json
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Callable, Dict, Tuple
+
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+try:
+    from library_functions.config import Config
+except ModuleNotFoundError:
+    from project.library_functions.config import Config
+
+
+def _load_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+class DataStore:
+    """Process-wide store for the datasets used by the library functions and the website.
+
+    Each dataset is loaded on first access and memoized, so that it is parsed at
+    most once per process no matter how many modules use it. The store hands out
+    read-only views: callers that need to modify the data must copy it first.
+    """
+
+    def __init__(self):
+        self._datasets: Dict[str, object] = {}
+        self._lock = threading.RLock()
+
+    def _get(self, name: str, loader: Callable[[], object]):
+        # Fast path without locking once the dataset is loaded
+        try:
+            return self._datasets[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._datasets:
+                self._datasets[name] = loader()
+            return self._datasets[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._datasets
+
+    def clear(self):
+        """Forget all loaded datasets, e.g. after the underlying files changed."""
+        with self._lock:
+            self._datasets.clear()
+
+    @property
+    def reddit_data(self) -> Mapping:
+        """Mapping from reddit post ids to posts."""
+
+        def load():
+            reddit_data = lf.load_data_reddit()
+            if isinstance(reddit_data, dict):
+                reddit_data = MappingProxyType(reddit_data)
+            return reddit_data
+
+        return self._get("reddit_data", load)
+
+    @property
+    def post_table(self) -> "lf.PostTable":
+        """Reddit posts as a table of columns, sharing the snapshot's memory when possible."""
+
+        def load():
+            reddit_data = self.reddit_data
+            if isinstance(reddit_data, lf.RedditSnapshot):
+                return lf.PostTable.from_snapshot(reddit_data)
+            return lf.PostTable.from_posts(reddit_data)
+
+        return self._get("post_table", load)
+
+    @property
+    def wiki_data(self) -> "lf.WikiCorpus":
+        """Flat wikipedia data, mapping each property to a tuple with one value per page
+        and indexed by page name."""
+        return self._get("wiki_data", lambda: lf.WikiCorpus(lf.load_data_wiki()))
+
+    def _load_wiki_file(self, path):
+        # The secondary wiki files are written by load_data_wiki: make sure that it
+        # ran first, so that they reflect the current wikipedia data.
+        self.wiki_data
+        return _load_json(path)
+
+    @property
+    def synonym_mapping(self) -> Mapping:
+        """Mapping from synonyms (and names) to substance names."""
+        return self._get(
+            "synonym_mapping",
+            lambda: MappingProxyType(self._load_wiki_file(Config.Path.synonym_mapping)),
+        )
+
+    @property
+    def substance_names(self) -> Tuple[str]:
+        return self._get(
+            "substance_names",
+            lambda: tuple(self._load_wiki_file(Config.Path.substance_names)),
+        )
+
+    @property
+    def contents_per_substance(self) -> Mapping:
+        return self._get(
+            "contents_per_substance",
+            lambda: MappingProxyType(
+                self._load_wiki_file(Config.Path.contents_per_substance)
+            ),
+        )
+
+    @property
+    def urls_per_substance(self) -> Mapping:
+        return self._get(
+            "urls_per_substance",
+            lambda: MappingProxyType(
+                self._load_wiki_file(Config.Path.urls_per_substance)
+            ),
+        )
+
+    @property
+    def mechanism_categories_mapping(self) -> Mapping:
+        return self._get(
+            "mechanism_categories_mapping",
+            lambda: MappingProxyType(_load_json(Config.Path.wiki_mechanism_categories)),
+        )
+
+    @property
+    def effect_categories_mapping(self) -> Mapping:
+        return self._get(
+            "effect_categories_mapping",
+            lambda: MappingProxyType(_load_json(Config.Path.wiki_effect_categories)),
+        )
+
+
+data_store = DataStore()
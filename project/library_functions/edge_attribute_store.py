@@ -0,0 +1,167 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+
+
+def weighted_segment_means(
+    values: np.ndarray, number_of_drugs_in_post: np.ndarray, offsets: np.ndarray
+) -> np.ndarray:
+    """Weigh an attribute like weigh_attributes, for all edges at once.
+
+    Args:
+        values (np.ndarray): values of the attribute for all the occurrences of all the
+            edges, one edge after the other
+        number_of_drugs_in_post (np.ndarray): number of drugs in the post of each occurrence
+        offsets (np.ndarray): the occurrences of edge i are at offsets[i]:offsets[i + 1]
+
+    Returns:
+        np.ndarray: mean of the values of each edge, weighted by 1 / (number_of_drugs_in_post - 1)
+    """
+    starts = offsets[:-1]
+    if len(starts) == 0:
+        return np.zeros(0)
+    weights = 1 / (np.asarray(number_of_drugs_in_post, dtype=np.float64) - 1)
+    weighted_sums = np.add.reduceat(weights * values, starts)
+    return weighted_sums / np.add.reduceat(weights, starts)
+
+
+class EdgeAttributeStore:
+    """Per-occurrence attributes of the edges of a reddit graph, stored as columns.
+
+    Instead of one list per edge and attribute, each attribute is one flat array holding
+    the values of all the edges, one edge after the other, and the values of edge i are
+    at offsets[i]:offsets[i + 1]. The arrays are read-only, and so are the per-edge
+    slices handed out by edge_attributes.
+    """
+
+    # Attributes stored for each occurrence of an edge, and their type
+    columns = {
+        "number_of_drugs_in_post": np.int16,
+        "polarity": np.float64,
+        "subjectivity": np.float64,
+        "post_rows": np.int32,
+    }
+
+    def __init__(
+        self,
+        edges: List[Tuple[str, str]],
+        offsets: np.ndarray,
+        **columns: np.ndarray,
+    ):
+        """
+        Args:
+            edges (List[Tuple[str, str]]): nodes of each edge
+            offsets (np.ndarray): the occurrences of edge i are at offsets[i]:offsets[i + 1]
+            **columns (np.ndarray): flat array for each of EdgeAttributeStore.columns
+        """
+        self.edges = edges
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.offsets.flags.writeable = False
+        for name, dtype in self.columns.items():
+            column = np.asarray(columns[name], dtype=dtype)
+            column.flags.writeable = False
+            setattr(self, name, column)
+
+    @classmethod
+    def from_cooccurrences(
+        cls,
+        post_table: "lf.PostTable",
+        rows: np.ndarray,
+        X,
+        nodes: Sequence[str],
+        min_edge_occurrences_to_link: int = 1,
+    ) -> "EdgeAttributeStore":
+        """Collect the occurrences of the edges between substances co-occurring in posts.
+
+        Edges are sorted by the columns of X of their ends, and the occurrences of each
+        edge are in the order of the posts, like in the lists built by link_drugs.
+
+        Args:
+            post_table (lf.PostTable): table of the reddit posts
+            rows (np.ndarray): rows of the posts, in increasing order
+            X (sp.spmatrix): incidence matrix of these posts and of the nodes, as built by
+                lf.incidence_matrix
+            nodes (Sequence[str]): the substances of the columns of X
+            min_edge_occurrences_to_link (int, optional): only keep the edges occurring at
+                least this many times. Defaults to 1.
+
+        Returns:
+            EdgeAttributeStore: store with the kept edges
+        """
+        pair_rows, sources, targets, multiplicities = lf.cooccurrence_pairs(X)
+        multiplicities = multiplicities.astype(np.int64)
+        edge_keys, pair_edges = np.unique(
+            sources * len(nodes) + targets, return_inverse=True
+        )
+        counts = np.bincount(pair_edges, weights=multiplicities, minlength=len(edge_keys))
+        counts = counts.astype(np.int64)
+
+        # Drop the edges that occur too seldom, and renumber the others
+        kept_edges = counts >= min_edge_occurrences_to_link
+        new_indices = np.cumsum(kept_edges) - 1
+        kept_pairs = kept_edges[pair_edges]
+        pair_edges = new_indices[pair_edges[kept_pairs]]
+        pair_rows = pair_rows[kept_pairs]
+        multiplicities = multiplicities[kept_pairs]
+
+        # Group the pairs by edge, keeping the order of the posts within each edge, and
+        # repeat the pairs co-occurring several times in the same post
+        order = np.argsort(pair_edges, kind="stable")
+        occurrences = np.repeat(order, multiplicities[order])
+        occurrence_rows = np.asarray(rows)[pair_rows[occurrences]]
+
+        edge_sources, edge_targets = np.divmod(edge_keys[kept_edges], len(nodes))
+        return cls(
+            edges=[
+                (nodes[source], nodes[target])
+                for source, target in zip(edge_sources.tolist(), edge_targets.tolist())
+            ],
+            offsets=np.concatenate([[0], np.cumsum(counts[kept_edges])]),
+            number_of_drugs_in_post=post_table.n_matches[occurrence_rows],
+            polarity=post_table.polarity[occurrence_rows],
+            subjectivity=post_table.subjectivity[occurrence_rows],
+            post_rows=occurrence_rows,
+        )
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Number of occurrences of each edge."""
+        return np.diff(self.offsets)
+
+    def weighted(self, attribute: str) -> np.ndarray:
+        """Weigh an attribute for all edges at once, like weigh_attributes.
+
+        Args:
+            attribute (str): "polarity" or "subjectivity"
+
+        Returns:
+            np.ndarray: weighted value of the attribute for each edge
+        """
+        return weighted_segment_means(
+            getattr(self, attribute), self.number_of_drugs_in_post, self.offsets
+        )
+
+    def edge_attributes(self, index: int) -> Dict[str, np.ndarray]:
+        """Get the per-occurrence attributes of an edge.
+
+        Args:
+            index (int): index of the edge
+
+        Returns:
+            Dict[str, np.ndarray]: read-only views (no copy) on the values of the edge
+            for number_of_drugs_in_post, polarity and subjectivity
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return {
+            "number_of_drugs_in_post": self.number_of_drugs_in_post[start:end],
+            "polarity": self.polarity[start:end],
+            "subjectivity": self.subjectivity[start:end],
+        }
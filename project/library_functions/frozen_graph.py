@@ -0,0 +1,721 @@
+import copy
+import itertools
+from collections.abc import Mapping
+from typing import Dict, Hashable, Iterable, Iterator, List, Sequence, Union
+
+import networkx as nx
+import numpy as np
+
+
+class _Missing:
+    """Value of an attribute for the nodes or edges that don't have it."""
+
+    def __reduce__(self):
+        # Unpickled columns refer to the same object
+        return "_MISSING"
+
+    def __repr__(self) -> str:
+        return "_MISSING"
+
+
+_MISSING = _Missing()
+
+
+def _make_column(values: List) -> Union[np.ndarray, List]:
+    # Columns of ints or of floats are stored as arrays, everything else as lists
+    types = set(map(type, values))
+    if types == {int}:
+        return np.array(values, dtype=np.int64)
+    if types == {float}:
+        return np.array(values, dtype=np.float64)
+    return values
+
+
+def _read(column: Union[np.ndarray, List], index: int):
+    if isinstance(column, np.ndarray):
+        return column[index].item()
+    return column[index]
+
+
+def _select(column: Union[np.ndarray, List], mask: np.ndarray):
+    if isinstance(column, np.ndarray):
+        return column[mask]
+    return list(itertools.compress(column, mask.tolist()))
+
+
+class _AttributeRow(Mapping):
+    """Read-only attributes of a node or an edge, read from the columns of the graph."""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: Dict[str, Union[np.ndarray, List]], index: int):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, name: str):
+        value = _read(self._columns[name], self._index)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for name, column in self._columns.items():
+            if isinstance(column, np.ndarray) or column[self._index] is not _MISSING:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class _Adjacency:
+    """Neighbors of each node in CSR form: the neighbors of node i are
+    indices[indptr[i]:indptr[i + 1]] (in the order of the networkx adjacency), through
+    the edges edge_ids[indptr[i]:indptr[i + 1]]."""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, edge_ids: np.ndarray):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.edge_ids = np.asarray(edge_ids, dtype=np.int64)
+        # Same rows with the neighbors sorted, to look edges up by binary search
+        rows = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        order = np.lexsort((self.indices, rows))
+        self.sorted_indices = self.indices[order]
+        self.sorted_edge_ids = self.edge_ids[order]
+        for array in (
+            self.indptr,
+            self.indices,
+            self.edge_ids,
+            self.sorted_indices,
+            self.sorted_edge_ids,
+        ):
+            array.flags.writeable = False
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def neighbors(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def edges(self, node: int) -> np.ndarray:
+        return self.edge_ids[self.indptr[node] : self.indptr[node + 1]]
+
+    def edge_id(self, node: int, neighbor: int) -> int:
+        start, end = self.indptr[node], self.indptr[node + 1]
+        position = start + np.searchsorted(self.sorted_indices[start:end], neighbor)
+        if position < end and self.sorted_indices[position] == neighbor:
+            return int(self.sorted_edge_ids[position])
+        return -1
+
+    def select(
+        self,
+        node_mask: np.ndarray,
+        new_node_index: np.ndarray,
+        new_edge_index: np.ndarray,
+    ) -> "_Adjacency":
+        rows = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        keep = node_mask[rows] & node_mask[self.indices]
+        lengths = np.bincount(
+            new_node_index[rows[keep]], minlength=int(node_mask.sum())
+        )
+        return _Adjacency(
+            indptr=np.concatenate([[0], np.cumsum(lengths)]),
+            indices=new_node_index[self.indices[keep]],
+            edge_ids=new_edge_index[self.edge_ids[keep]],
+        )
+
+
+class _AdjacencyRow(Mapping):
+    """Neighbors of a node, mapped to the attributes of the edge leading to them."""
+
+    __slots__ = ("_graph", "_adjacency", "_node")
+
+    def __init__(self, graph: "FrozenGraph", adjacency: _Adjacency, node: int):
+        self._graph = graph
+        self._adjacency = adjacency
+        self._node = node
+
+    def __getitem__(self, neighbor: Hashable) -> _AttributeRow:
+        edge_id = -1
+        if neighbor in self._graph._node_index:
+            edge_id = self._adjacency.edge_id(
+                self._node, self._graph._node_index[neighbor]
+            )
+        if edge_id < 0:
+            raise KeyError(neighbor)
+        return _AttributeRow(self._graph._edge_columns, edge_id)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        nodes = self._graph._nodes
+        return (nodes[i] for i in self._adjacency.neighbors(self._node).tolist())
+
+    def __len__(self) -> int:
+        return int(
+            self._adjacency.indptr[self._node + 1] - self._adjacency.indptr[self._node]
+        )
+
+    def __contains__(self, neighbor) -> bool:
+        try:
+            self[neighbor]
+        except (KeyError, TypeError):
+            return False
+        return True
+
+
+class _AdjacencyView(Mapping):
+    """Mapping from each node to its _AdjacencyRow, like networkx's adjacency views."""
+
+    def __init__(self, graph: "FrozenGraph", adjacency: _Adjacency):
+        self._graph = graph
+        self._adjacency = adjacency
+
+    def __getitem__(self, node: Hashable) -> _AdjacencyRow:
+        return _AdjacencyRow(
+            self._graph, self._adjacency, self._graph._node_index[node]
+        )
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._graph._nodes)
+
+    def __len__(self) -> int:
+        return len(self._graph._nodes)
+
+    def __contains__(self, node) -> bool:
+        return node in self._graph
+
+
+class _NodeDataView:
+    def __init__(self, graph: "FrozenGraph", data: Union[bool, str], default):
+        self._graph = graph
+        self._data = data
+        self._default = default
+
+    def __len__(self) -> int:
+        return len(self._graph._nodes)
+
+    def __iter__(self) -> Iterator:
+        graph = self._graph
+        if self._data is True:
+            return zip(graph._nodes, graph.nodes.values())
+        values = graph.node_column(self._data, self._default)
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+        return zip(graph._nodes, values)
+
+
+class _NodeView(Mapping):
+    """Nodes of a FrozenGraph, mapped to their attributes, like networkx's G.nodes."""
+
+    def __init__(self, graph: "FrozenGraph"):
+        self._graph = graph
+
+    def __getitem__(self, node: Hashable) -> _AttributeRow:
+        return _AttributeRow(self._graph._node_columns, self._graph._node_index[node])
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._graph._nodes)
+
+    def __len__(self) -> int:
+        return len(self._graph._nodes)
+
+    def __contains__(self, node) -> bool:
+        return node in self._graph
+
+    def __call__(self, data: Union[bool, str] = False, default=None):
+        if data is False:
+            return self
+        return _NodeDataView(self._graph, data, default)
+
+    def data(self, data: Union[bool, str] = True, default=None) -> _NodeDataView:
+        return _NodeDataView(self._graph, data, default)
+
+    def __repr__(self) -> str:
+        return f"NodeView({tuple(self)})"
+
+
+class _EdgeDataView:
+    def __init__(self, graph: "FrozenGraph", nbunch, data: Union[bool, str], default):
+        self._graph = graph
+        self._nbunch = nbunch
+        self._data = data
+        self._default = default
+
+    def _edges(self) -> Iterator:
+        """Iterate over the edges as (index of u, index of v, edge id) tuples."""
+        graph = self._graph
+        if self._nbunch is None:
+            return zip(
+                graph._edges[:, 0].tolist(),
+                graph._edges[:, 1].tolist(),
+                range(len(graph._edges)),
+            )
+        return self._edges_of_nodes()
+
+    def _edges_of_nodes(self) -> Iterator:
+        # Like networkx: edges from the given nodes, each undirected edge only once
+        graph = self._graph
+        seen = set()
+        for node in graph.nbunch_iter(self._nbunch):
+            u = graph._node_index[node]
+            neighbors = graph._out.neighbors(u).tolist()
+            edge_ids = graph._out.edges(u).tolist()
+            for v, edge_id in zip(neighbors, edge_ids):
+                if graph._directed or v not in seen:
+                    yield u, v, edge_id
+            seen.add(u)
+
+    def __iter__(self) -> Iterator:
+        graph = self._graph
+        nodes = graph._nodes
+        if self._data is False:
+            return ((nodes[u], nodes[v]) for u, v, _ in self._edges())
+        if self._data is True:
+            return (
+                (nodes[u], nodes[v], _AttributeRow(graph._edge_columns, edge_id))
+                for u, v, edge_id in self._edges()
+            )
+        values = graph.edge_column(self._data, self._default)
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+        return (
+            (nodes[u], nodes[v], values[edge_id]) for u, v, edge_id in self._edges()
+        )
+
+    def __len__(self) -> int:
+        if self._nbunch is None:
+            return len(self._graph._edges)
+        return sum(1 for _ in self._edges())
+
+
+class _EdgeView:
+    """Edges of a FrozenGraph, like networkx's G.edges."""
+
+    def __init__(self, graph: "FrozenGraph"):
+        self._graph = graph
+
+    def __iter__(self) -> Iterator:
+        return iter(_EdgeDataView(self._graph, None, False, None))
+
+    def __len__(self) -> int:
+        return len(self._graph._edges)
+
+    def __contains__(self, edge) -> bool:
+        try:
+            u, v = edge
+            return self._graph.has_edge(u, v)
+        except (TypeError, ValueError):
+            return False
+
+    def __getitem__(self, edge) -> _AttributeRow:
+        u, v = edge
+        edge_id = self._graph._edge_id(u, v)
+        if edge_id < 0:
+            raise KeyError(f"The edge {u}-{v} is not in the graph.")
+        return _AttributeRow(self._graph._edge_columns, edge_id)
+
+    def __call__(self, nbunch=None, data: Union[bool, str] = False, default=None):
+        if nbunch is None and data is False:
+            return self
+        return _EdgeDataView(self._graph, nbunch, data, default)
+
+    def data(self, data: Union[bool, str] = True, default=None, nbunch=None):
+        return _EdgeDataView(self._graph, nbunch, data, default)
+
+    def __repr__(self) -> str:
+        return f"EdgeView({list(self)})"
+
+
+class _DegreeView:
+    """Degrees of the nodes of a FrozenGraph, like networkx's G.degree: G.degree[n] and
+    G.degree(n) give the degree of n, and iterating gives (node, degree) tuples."""
+
+    def __init__(
+        self, graph: "FrozenGraph", direction: str = None, nbunch=None, weight=None
+    ):
+        self._graph = graph
+        self._direction = direction
+        self._nbunch = nbunch
+        self._weight = weight
+
+    def _values(self) -> np.ndarray:
+        return self._graph._degrees(self._direction, self._weight)
+
+    def __getitem__(self, node: Hashable):
+        return self._values()[self._graph._node_index[node]].item()
+
+    def __call__(self, nbunch=None, weight=None):
+        if nbunch is not None and nbunch in self._graph:
+            degrees = self._graph._degrees(self._direction, weight)
+            return degrees[self._graph._node_index[nbunch]].item()
+        return _DegreeView(self._graph, self._direction, nbunch, weight)
+
+    def __iter__(self) -> Iterator:
+        graph = self._graph
+        values = self._values().tolist()
+        if self._nbunch is None:
+            return zip(graph._nodes, values)
+        return (
+            (node, values[graph._node_index[node]])
+            for node in graph.nbunch_iter(self._nbunch)
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class FrozenGraph:
+    """Immutable graph stored as arrays, implementing the part of the networkx API that
+    the website uses to read its graphs.
+
+    The neighbors of each node are stored in CSR form (one array of neighbors, sliced
+    per node), and the attributes of the nodes and of the edges as one column per
+    attribute, instead of one dict per node and edge. Degrees and neighbors are slices
+    of these arrays, and G.nodes[n] and G.edges[u, v] are read-only views on the
+    columns. Convert a graph with FrozenGraph.from_networkx once it's complete, and back
+    with to_networkx to modify it.
+
+    Examples:
+        >>> frozen = FrozenGraph.from_networkx(g_reddit)
+        >>> frozen.nodes["caffeine"]["count"]
+        >>> sorted(frozen.edges("caffeine", data="count"), key=lambda e: e[2])
+        >>> frozen.degree("caffeine")
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[Hashable],
+        edges: np.ndarray,
+        succ: _Adjacency,
+        pred: _Adjacency = None,
+        node_columns: Dict[str, Union[np.ndarray, List]] = None,
+        edge_columns: Dict[str, Union[np.ndarray, List]] = None,
+        graph_attributes: Dict = None,
+        directed: bool = False,
+    ):
+        """
+        Args:
+            nodes (Sequence[Hashable]): the nodes
+            edges (np.ndarray): (number of edges, 2) array with the indices of the nodes
+                of each edge
+            succ (_Adjacency): neighbors (successors if directed) of each node
+            pred (_Adjacency, optional): predecessors of each node, if directed
+            node_columns (Dict[str, Union[np.ndarray, List]], optional): value of each node
+                attribute for each node (_MISSING if it doesn't have it)
+            edge_columns (Dict[str, Union[np.ndarray, List]], optional): same for edges
+            graph_attributes (Dict, optional): attributes of the graph (G.graph)
+            directed (bool, optional): whether the graph is directed. Defaults to False.
+        """
+        self._nodes = list(nodes)
+        self._node_index = {node: index for index, node in enumerate(self._nodes)}
+        self._edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        self._edges.flags.writeable = False
+        self._out = succ
+        self._in = pred if directed else succ
+        self._node_columns = node_columns or {}
+        self._edge_columns = edge_columns or {}
+        self._directed = directed
+        self.graph = dict(graph_attributes or {})
+        self._degree_cache: Dict = {}
+
+    @classmethod
+    def from_networkx(cls, G: nx.Graph) -> "FrozenGraph":
+        """Freeze a networkx graph.
+
+        Args:
+            G (nx.Graph): graph or directed graph (not a multigraph)
+
+        Raises:
+            TypeError: if G is a multigraph
+
+        Returns:
+            FrozenGraph: graph with the same nodes, edges and attributes, iterated over
+            in the same order
+        """
+        if G.is_multigraph():
+            raise TypeError("Multigraphs can't be frozen")
+        directed = G.is_directed()
+        nodes = list(G.nodes)
+        node_index = {node: index for index, node in enumerate(nodes)}
+
+        edges = []
+        edge_attributes = []
+        edge_index = {}
+        for u, v, data in G.edges(data=True):
+            edge_index[u, v] = len(edges)
+            if not directed:
+                edge_index[v, u] = len(edges)
+            edges.append((node_index[u], node_index[v]))
+            edge_attributes.append(data)
+
+        def adjacency(neighbors_of: Mapping, reverse: bool = False) -> _Adjacency:
+            indptr = [0]
+            indices = []
+            edge_ids = []
+            for node in nodes:
+                for neighbor in neighbors_of[node]:
+                    indices.append(node_index[neighbor])
+                    edge = (neighbor, node) if reverse else (node, neighbor)
+                    edge_ids.append(edge_index[edge])
+                indptr.append(len(indices))
+            return _Adjacency(indptr, indices, edge_ids)
+
+        return cls(
+            nodes=nodes,
+            edges=np.array(edges, dtype=np.int32).reshape(-1, 2),
+            succ=adjacency(G.succ if directed else G.adj),
+            pred=adjacency(G.pred, reverse=True) if directed else None,
+            node_columns=cls._columns(list(G.nodes.values())),
+            edge_columns=cls._columns(edge_attributes),
+            graph_attributes=G.graph,
+            directed=directed,
+        )
+
+    @staticmethod
+    def _columns(attributes: List[Mapping]) -> Dict[str, Union[np.ndarray, List]]:
+        # Attributes are kept in the order in which they were first assigned
+        names = list(dict.fromkeys(name for data in attributes for name in data))
+        return {
+            name: _make_column([data.get(name, _MISSING) for data in attributes])
+            for name in names
+        }
+
+    def to_networkx(self) -> nx.Graph:
+        """Get a (mutable) networkx copy of the graph.
+
+        Returns:
+            nx.Graph: graph, or directed graph, with the same nodes, edges and attributes
+        """
+        G = nx.DiGraph() if self._directed else nx.Graph()
+        G.graph.update(self.graph)
+        G.add_nodes_from((node, dict(data)) for node, data in self.nodes.items())
+        G.add_edges_from((u, v, dict(data)) for u, v, data in self.edges(data=True))
+        return G
+
+    # Queries
+
+    @property
+    def nodes(self) -> _NodeView:
+        return _NodeView(self)
+
+    @property
+    def edges(self) -> _EdgeView:
+        return _EdgeView(self)
+
+    @property
+    def adj(self) -> _AdjacencyView:
+        return _AdjacencyView(self, self._out)
+
+    @property
+    def succ(self) -> _AdjacencyView:
+        return _AdjacencyView(self, self._out)
+
+    @property
+    def pred(self) -> _AdjacencyView:
+        return _AdjacencyView(self, self._in)
+
+    # Read directly by some networkx algorithms (e.g. connected components)
+    _adj = adj
+    _succ = succ
+    _pred = pred
+
+    @property
+    def degree(self) -> _DegreeView:
+        return _DegreeView(self)
+
+    @property
+    def in_degree(self) -> _DegreeView:
+        if not self._directed:
+            raise AttributeError("in_degree is only defined for directed graphs")
+        return _DegreeView(self, "in")
+
+    @property
+    def out_degree(self) -> _DegreeView:
+        if not self._directed:
+            raise AttributeError("out_degree is only defined for directed graphs")
+        return _DegreeView(self, "out")
+
+    def _degrees(self, direction: str = None, weight: str = None) -> np.ndarray:
+        key = (direction, weight)
+        if key not in self._degree_cache:
+            if weight is None:
+                edge_weights = np.ones(len(self._edges), dtype=np.int64)
+            else:
+                edge_weights = np.array(
+                    self.edge_column(weight, default=1), dtype=np.float64
+                )
+
+            def sums(adjacency: _Adjacency) -> np.ndarray:
+                rows = np.repeat(np.arange(len(self._nodes)), adjacency.lengths)
+                return np.bincount(
+                    rows,
+                    weights=edge_weights[adjacency.edge_ids],
+                    minlength=len(self._nodes),
+                ).astype(edge_weights.dtype)
+
+            if direction == "out":
+                degrees = sums(self._out)
+            elif direction == "in":
+                degrees = sums(self._in)
+            elif self._directed:
+                degrees = sums(self._out) + sums(self._in)
+            else:
+                # Self-loops count twice, like in networkx
+                degrees = sums(self._out)
+                self_loops = self._edges[:, 0] == self._edges[:, 1]
+                np.add.at(degrees, self._edges[self_loops, 0], edge_weights[self_loops])
+            degrees.flags.writeable = False
+            self._degree_cache[key] = degrees
+        return self._degree_cache[key]
+
+    def node_column(self, name: str, default=None) -> Union[np.ndarray, List]:
+        """Get the values of a node attribute for all nodes, in node order.
+
+        Args:
+            name (str): name of the attribute
+            default (optional): value for the nodes that don't have the attribute. Defaults to None.
+
+        Returns:
+            Union[np.ndarray, List]: read-only array for attributes that are ints or floats
+            on all nodes, list otherwise
+        """
+        return self._column(self._node_columns, name, default, len(self._nodes))
+
+    def edge_column(self, name: str, default=None) -> Union[np.ndarray, List]:
+        """Get the values of an edge attribute for all edges, in the order of G.edges.
+
+        See node_column.
+        """
+        return self._column(self._edge_columns, name, default, len(self._edges))
+
+    @staticmethod
+    def _column(columns: Dict, name: str, default, length: int):
+        column = columns.get(name)
+        if column is None:
+            return [default] * length
+        if isinstance(column, np.ndarray):
+            column = column.view()
+            column.flags.writeable = False
+            return column
+        return [default if value is _MISSING else value for value in column]
+
+    def _edge_id(self, u: Hashable, v: Hashable) -> int:
+        try:
+            u, v = self._node_index[u], self._node_index[v]
+        except (KeyError, TypeError):
+            return -1
+        return self._out.edge_id(u, v)
+
+    def has_node(self, node: Hashable) -> bool:
+        return node in self
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool:
+        return self._edge_id(u, v) >= 0
+
+    def neighbors(self, node: Hashable) -> Iterator[Hashable]:
+        return iter(self.adj[node])
+
+    successors = neighbors
+
+    def predecessors(self, node: Hashable) -> Iterator[Hashable]:
+        return iter(self.pred[node])
+
+    def nbunch_iter(self, nbunch=None) -> Iterator[Hashable]:
+        if nbunch is None:
+            return iter(self._nodes)
+        if nbunch in self:
+            return iter([nbunch])
+        return (node for node in nbunch if node in self)
+
+    def is_directed(self) -> bool:
+        return self._directed
+
+    def is_multigraph(self) -> bool:
+        return False
+
+    def number_of_nodes(self) -> int:
+        return len(self._nodes)
+
+    order = number_of_nodes
+
+    def number_of_edges(self, u: Hashable = None, v: Hashable = None) -> int:
+        if u is None:
+            return len(self._edges)
+        return int(self.has_edge(u, v))
+
+    def size(self, weight: str = None) -> Union[int, float]:
+        if weight is None:
+            return len(self._edges)
+        return sum(self.edge_column(weight, default=1))
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node) -> bool:
+        try:
+            return node in self._node_index
+        except TypeError:
+            return False
+
+    def __getitem__(self, node: Hashable) -> _AdjacencyRow:
+        return self.adj[node]
+
+    # Derived graphs
+
+    def subgraph(self, nodes: Iterable[Hashable]) -> "FrozenGraph":
+        """Get the subgraph induced by some nodes.
+
+        Unlike networkx, this is a new (frozen) graph rather than a view, so that
+        G.subgraph(nodes).copy() works the same for both.
+
+        Args:
+            nodes (Iterable[Hashable]): nodes to keep
+
+        Returns:
+            FrozenGraph: graph with the nodes, the edges between them and their
+            attributes, in the same order as in this graph
+        """
+        node_mask = np.zeros(len(self._nodes), dtype=bool)
+        node_mask[[self._node_index[node] for node in self.nbunch_iter(nodes)]] = True
+        new_node_index = np.cumsum(node_mask) - 1
+        edge_mask = node_mask[self._edges[:, 0]] & node_mask[self._edges[:, 1]]
+        new_edge_index = np.cumsum(edge_mask) - 1
+
+        succ = self._out.select(node_mask, new_node_index, new_edge_index)
+        return FrozenGraph(
+            nodes=list(itertools.compress(self._nodes, node_mask.tolist())),
+            edges=new_node_index[self._edges[edge_mask]],
+            succ=succ,
+            pred=(
+                self._in.select(node_mask, new_node_index, new_edge_index)
+                if self._directed
+                else None
+            ),
+            node_columns={
+                name: _select(column, node_mask)
+                for name, column in self._node_columns.items()
+            },
+            edge_columns={
+                name: _select(column, edge_mask)
+                for name, column in self._edge_columns.items()
+            },
+            graph_attributes=self.graph,
+            directed=self._directed,
+        )
+
+    def copy(self) -> "FrozenGraph":
+        # The arrays and columns are never modified, so they are shared
+        frozen = copy.copy(self)
+        frozen.graph = dict(self.graph)
+        return frozen
+
+    def __repr__(self) -> str:
+        kind = "directed" if self._directed else "undirected"
+        return (
+            f"FrozenGraph({kind}, {len(self._nodes)} nodes, {len(self._edges)} edges)"
+        )
@@ -2,6 +2,8 @@ import json
 from typing import Dict, List, Literal, Set, Tuple
 import random
 
+import numpy as np
+
 try:
     import library_functions as lf
 except ModuleNotFoundError:
@@ -11,11 +13,6 @@ try:
 except ModuleNotFoundError:
     from project.library_functions.config import Config
 
-# pre-compute some stuff for efficiency
-reddit_data = lf.load_data_reddit()
-post_lengths = [len(data["title"] + data["content"]) for data in reddit_data.values()]
-n_of_matches_per_post = [len(data["matches"]) for data in reddit_data.values()]
-
 
 def get_post_lengths() -> List[int]:
     """Get a list of the lengths of individual posts
@@ -23,27 +20,32 @@ def get_post_lengths() -> List[int]:
     Returns:
         List[int]: The length in characters of each of the reddit posts
     """
-    return post_lengths.copy()
+    return lf.data_store.post_table.post_lengths.tolist()
 
 
 def get_n_of_matches_per_post() -> List[int]:
-    return n_of_matches_per_post.copy()
+    return lf.data_store.post_table.n_matches.tolist()
 
 
 def get_top_posts(
     attribute: Literal["length", "mentions"], reverse: bool = False, amount: int = 10
 ) -> List[Tuple[str, int, str]]:
-    tuples = []
-    for index, (id, post) in enumerate(reddit_data.items()):
-
-        if attribute == "mentions":
-            attr = n_of_matches_per_post[index]
-        else:
-            attr = post_lengths[index]
-        tuples.append(
-            (post["title"], attr, f"https://www.reddit.com/r/Nootropics/comments/{id}")
+    post_table = lf.data_store.post_table
+    if attribute == "mentions":
+        values = post_table.n_matches
+    else:
+        values = post_table.post_lengths
+
+    # Stable sort, so that ties keep the order of the posts (like sorted() did,
+    # also when reversed)
+    order = np.argsort(-values if reverse else values, kind="stable")
+
+    # Only the titles of the selected posts are decoded
+    return [
+        (
+            post_table.titles[row],
+            int(values[row]),
+            f"https://www.reddit.com/r/Nootropics/comments/{post_table.ids[row]}",
         )
-
-    sorted_tuples = sorted(tuples, key=lambda x: x[1], reverse=reverse)
-
-    return sorted_tuples[:amount]
\ No newline at end of file
+        for row in order[:amount]
+    ]
@@ -1,4 +1,3 @@
-import json
 from typing import Dict, List, Literal, Set, Tuple
 import random
 
@@ -6,19 +5,9 @@ try:
     import library_functions as lf
 except ModuleNotFoundError:
     import project.library_functions as lf
-try:
-    from library_functions.config import Config
-except ModuleNotFoundError:
-    from project.library_functions.config import Config
-
-# pre-fetch/compute some stuff to make computations faster
-
-wiki_data = lf.load_data_wiki()
-with open(Config.Path.wiki_mechanism_categories, "r") as f:
-    mechanism_categories_mapping = json.load(f)
 
-with open(Config.Path.wiki_effect_categories, "r") as f:
-    effects_categories_mapping = json.load(f)
+# Values computed from the wiki data on first use (e.g. page lengths), keyed by property name
+_derived_properties: Dict[str, List] = {}
 
 
 def get_page_from_name(name: str) -> Dict:
@@ -31,16 +20,8 @@ def get_page_from_name(name: str) -> Dict:
     Returns:
         Dict: Dict containing name, redirects, links, contents, categories, and url
     """
-    name = synonyms_to_names[name]
-    wiki_data_index = wiki_data["name"].index(name)
-    return {
-        "name": wiki_data["name"][wiki_data_index],
-        "url": wiki_data["url"][wiki_data_index],
-        "categories": wiki_data["categories"][wiki_data_index],
-        "content": wiki_data["content"][wiki_data_index],
-        "links": wiki_data["links"][wiki_data_index],
-        "synonyms": wiki_data["synonyms"][wiki_data_index],
-    }
+    name = lf.data_store.synonym_mapping[name]
+    return dict(lf.data_store.wiki_data.page(name))
 
 
 def get_random_page() -> Dict:
@@ -49,7 +30,7 @@ def get_random_page() -> Dict:
     Returns:
         Dict: Dict containing name, redirects, links, contents, categories, and url
     """
-    name = random.choice(wiki_data["names"])
+    name = random.choice(lf.data_store.wiki_data.names)
     return get_page_from_name(name)
 
 
@@ -62,9 +43,9 @@ def get_wiki_page_names(with_synonyms: bool = False) -> Set[str]:
         List[str]: List containing all substance names on wikipedia , eventually with synonyms
     """
 
-    names = set(wiki_data["name"])
+    names = set(lf.data_store.wiki_data.index.keys())
     if with_synonyms:
-        names = names.union(synonyms_to_names.keys())
+        names = names.union(lf.data_store.synonym_mapping.keys())
     return names
 
 
@@ -74,12 +55,7 @@ def get_wiki_synonyms_mapping() -> Dict[str, str]:
     Returns:
         Dict[str, str]: Dict mapping synonyms (and names) to names
     """
-    with open(Config.Path.synonym_mapping, "r") as f:
-        return json.load(f)
-
-
-synonyms_to_names = get_wiki_synonyms_mapping()
-all_names_and_synonyms = get_wiki_page_names(with_synonyms=True)
+    return lf.data_store.synonym_mapping.copy()
 
 
 def get_page_lengths() -> List[int]:
@@ -88,8 +64,11 @@ def get_page_lengths() -> List[int]:
     Returns:
         List[int]: List of the number of characters in each wiki page
     """
-    wiki_data["length"] = [len(p) for p in wiki_data["content"]]
-    return wiki_data["length"]
+    if "length" not in _derived_properties:
+        _derived_properties["length"] = [
+            len(p) for p in lf.data_store.wiki_data["content"]
+        ]
+    return _derived_properties["length"]
 
 
 def get_number_of_links() -> List[int]:
@@ -98,12 +77,13 @@ def get_number_of_links() -> List[int]:
     Returns:
         List[int]: List of the number of links that each page has towards other pages
     """
+    all_names_and_synonyms = get_wiki_page_names(with_synonyms=True)
     valid_links_numbers = []
-    wiki_data["valid_links"] = []
-    for links in wiki_data["links"]:
+    _derived_properties["valid_links"] = []
+    for links in lf.data_store.wiki_data["links"]:
         valid_links = [link for link in links if link.lower() in all_names_and_synonyms]
         valid_links_numbers.append(len(valid_links))
-        wiki_data["valid_links"].append(valid_links)
+        _derived_properties["valid_links"].append(valid_links)
 
     return valid_links_numbers
 
@@ -115,7 +95,7 @@ def get_number_of_categories() -> List[int]:
         List[int]: List of the number of categories that each page belongs to
     """
 
-    return [len(cats) for cats in wiki_data["categories"]]
+    return [len(cats) for cats in lf.data_store.wiki_data["categories"]]
 
 
 def get_number_of_synonyms() -> List[int]:
@@ -125,7 +105,7 @@ def get_number_of_synonyms() -> List[int]:
         List[int]: List of the number of redirects that each page has
     """
 
-    return [len(syns) for syns in wiki_data["synonyms"]]
+    return [len(syns) for syns in lf.data_store.wiki_data["synonyms"]]
 
 
 def get_name_by(indices: List[int]) -> List[str]:
@@ -137,13 +117,20 @@ def get_name_by(indices: List[int]) -> List[str]:
     Returns:
         List[str]: List of names corresponding to the given indices
     """
-    return [wiki_data["name"][i] for i in indices]
+    names = lf.data_store.wiki_data.names
+    return [names[i] for i in indices]
 
 
 def get_top(property: str, amount: int = 10, reverse=False) -> List[Tuple[str, int]]:
+    wiki_data = lf.data_store.wiki_data
+    values = (
+        wiki_data[property]
+        if property in wiki_data
+        else _derived_properties[property]
+    )
     tuples = zip(
         wiki_data["name"],
-        [p if type(p) == int else len(p) for p in wiki_data[property]],
+        [p if type(p) == int else len(p) for p in values],
     )
     sorted_tuples = sorted(
         tuples, key=lambda x: x[1] if type(x[1]) == int else len(x[1]), reverse=reverse
@@ -151,19 +138,19 @@ def get_top(property: str, amount: int = 10, reverse=False) -> List[Tuple[str, i
     return sorted_tuples[:amount]
 
 
-def get_wiki_data() -> Dict:
-    """Get a copy of the wiki_data dict
+def get_wiki_data() -> "lf.WikiCorpus":
+    """Get the wiki_data dict
 
     Returns:
-        Dict: shallow copy of the wiki_data dict
+        lf.WikiCorpus: read-only, indexed view of the wiki_data dict, shared by all callers
     """
-    return wiki_data.copy()
+    return lf.data_store.wiki_data
 
 
 def get_root_category_mapping(which: Literal["effects", "mechanisms"]) -> Dict:
     if which == "effects":
-        return effects_categories_mapping.copy()
+        return lf.data_store.effect_categories_mapping.copy()
     elif which == "mechanisms":
-        return mechanism_categories_mapping.copy()
+        return lf.data_store.mechanism_categories_mapping.copy()
     else:
         raise RuntimeError("Can only be one of 'effects','mechanisms'")
\ No newline at end of file
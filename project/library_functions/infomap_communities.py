@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Tuple
+
+import infomap
+import networkx as nx
+from infomap import Infomap
+
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+try:
+    from library_functions.config import Config
+except ModuleNotFoundError:
+    from project.library_functions.config import Config
+
+# Bump whenever the modules computed for the same graph and arguments change, so that
+# old entries are ignored
+INFOMAP_CACHE_VERSION = 1
+
+infomap_flags = "--flow-model undirected --prefer-modular-solution --silent"
+
+ModulePaths = Dict[Hashable, Tuple[int, ...]]
+
+
+def get_infomap_cache_path(
+    fingerprint: str, weight: Optional[str], trials: int
+) -> Path:
+    """Get the file the modules found by run_infomap are cached in.
+
+    Args:
+        fingerprint (str): fingerprint of the graph, as returned by get_graph_fingerprint
+        weight (Optional[str]): edge attribute used as weight
+        trials (int): number of trials of infomap
+
+    Returns:
+        Path: file in Config.Path.infomap_cache_folder
+    """
+    serialized = json.dumps(
+        {
+            "version": INFOMAP_CACHE_VERSION,
+            "infomap_version": getattr(infomap, "__version__", None),
+            "flags": infomap_flags,
+            "graph": fingerprint,
+            "weight": weight,
+            "trials": trials,
+        },
+        sort_keys=True,
+    )
+    name = hashlib.sha256(serialized.encode()).hexdigest()[:32]
+    return Config.Path.infomap_cache_folder / f"{name}.pickle"
+
+
+def _run_infomap(graph: nx.Graph, weight: Optional[str], trials: int) -> ModulePaths:
+    # Infomap only works with integer ids: nodes are numbered in the order of the graph
+    nodes = list(graph.nodes)
+    node_index = {node: i for i, node in enumerate(nodes)}
+
+    if weight:
+        edges = graph.edges(data=weight, default=1)
+    else:
+        edges = ((u, v, 1) for u, v in graph.edges)
+    links = [(node_index[u], node_index[v], float(w)) for u, v, w in edges]
+
+    im = Infomap(f"{infomap_flags} -N {trials}")
+    im.add_nodes(range(len(nodes)))
+    im.add_links(links)
+    im.run()
+
+    modules = im.get_multilevel_modules()
+    return {node: modules[node_id] for node_id, node in enumerate(nodes)}
+
+
+def run_infomap(
+    graph: nx.Graph,
+    weight: Optional[str] = None,
+    trials: int = 10,
+    use_cache: bool = True,
+) -> ModulePaths:
+    """Find the hierarchical modules of a graph with infomap.
+
+    Results are cached in Config.Path.infomap_cache_folder, keyed by the fingerprint of
+    the graph, the weight and the number of trials, so that the trials only run once.
+
+    Args:
+        graph (nx.Graph): graph to find the modules of
+        weight (Optional[str], optional): edge attribute to use as weight (1 if missing).
+            Defaults to None (unweighted).
+        trials (int, optional): number of times infomap is run, keeping the best
+            solution. Defaults to 10.
+        use_cache (bool, optional): load and save the results. Defaults to True.
+
+    Returns:
+        ModulePaths: path of each node in the module hierarchy, from the top module to the
+        module containing it, as returned by Infomap.get_multilevel_modules
+    """
+    if use_cache:
+        fingerprint = lf.get_graph_fingerprint(graph, weight)
+        path = get_infomap_cache_path(fingerprint, weight, trials)
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except lf.CACHE_READ_ERRORS:
+            lf.discard_cache_entry(path)
+
+    module_paths = _run_infomap(graph, weight, trials)
+
+    if use_cache:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so that concurrent readers never see a
+        # half-written result
+        temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+        with open(temp_path, "wb") as f:
+            pickle.dump(module_paths, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    return module_paths
+
+
+def assign_infomap_communities(
+    graph: nx.Graph,
+    weight: Optional[str] = None,
+    trials: int = 10,
+    attribute_prefix: str = "infomap_community",
+    use_cache: bool = True,
+) -> ModulePaths:
+    """Find the hierarchical modules of a graph with infomap (see run_infomap) and assign
+    them as property to the graph's nodes.
+
+    Like the louvain communities, the module of each level of the hierarchy is assigned to
+    "{attribute_prefix}_L{level}" as "L{level}-{module:03}", L0 being the top level.
+
+    Args:
+        graph (nx.Graph): graph to find the modules of
+        weight (Optional[str], optional): see run_infomap. Defaults to None.
+        trials (int, optional): see run_infomap. Defaults to 10.
+        attribute_prefix (str, optional): prefix of the node attributes. Defaults to "infomap_community".
+        use_cache (bool, optional): see run_infomap. Defaults to True.
+
+    Returns:
+        ModulePaths: path of each node in the module hierarchy
+    """
+    module_paths = run_infomap(graph, weight=weight, trials=trials, use_cache=use_cache)
+    n_levels = len(next(iter(module_paths.values()), ()))
+    for level in range(n_levels):
+        nx.set_node_attributes(
+            graph,
+            {
+                node: f"L{level}-{module_path[level]:03}"
+                for node, module_path in module_paths.items()
+            },
+            f"{attribute_prefix}_L{level}",
+        )
+    return module_paths
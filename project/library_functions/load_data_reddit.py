@@ -1,4 +1,12 @@
 import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
 
 try:
     from library_functions.config import Config
@@ -6,12 +14,179 @@ except ModuleNotFoundError:
     from project.library_functions.config import Config
 
 
-def load_data_reddit(alternative_path=None):
+def load_data_reddit(alternative_path=None, use_snapshot=True, stream=False):
+    """Load the reddit posts.
+
+    Args:
+        alternative_path (optional): json (or json-lines, if it ends with .jsonl) file to load
+            instead of the default data. Defaults to None.
+        use_snapshot (bool, optional): for the default data, open the memory-mapped snapshot
+            (writing it first if needed) instead of parsing the json. Defaults to True.
+        stream (bool, optional): instead of loading all posts at once, return an iterator
+            that yields (post_id, post) tuples one at a time. Defaults to False.
+
+    Returns:
+        Mapping: mapping from post ids to posts (read-only if loaded from the snapshot), or
+        an iterator of (post_id, post) tuples if stream is True.
+    """
     if alternative_path:
         filepath = alternative_path
     else:
         filepath = Config.Path.reddit_data_with_NER_and_sentiment
+        if use_snapshot:
+            if stream and not lf.is_reddit_snapshot_fresh(source=filepath):
+                # Don't parse the whole json just to write the snapshot
+                return stream_reddit_posts(filepath)
+            snapshot = lf.open_reddit_snapshot(source=filepath)
+            # Posts are only decoded as they are iterated over
+            return iter(snapshot.items()) if stream else snapshot
+
+    if stream:
+        return stream_reddit_posts(filepath)
+
+    if Path(filepath).suffix == ".jsonl":
+        return dict(iter_json_lines(filepath))
+
     with open(filepath) as file:
         drug_database_reddit = json.load(file)
 
     return drug_database_reddit
+
+
+def get_reddit_posts_file(filepath=None) -> Path:
+    """Get the file that stream_reddit_posts reads the posts of a json file from.
+
+    That is the json-lines version of the file (same name, with the .jsonl extension) if
+    it exists and is at least as new as the json file, and the json file otherwise.
+
+    Args:
+        filepath (optional): json or json-lines file. Defaults to Config.Path.reddit_data_with_NER_and_sentiment.
+
+    Returns:
+        Path: file to read
+    """
+    filepath = Path(filepath) if filepath else Config.Path.reddit_data_with_NER_and_sentiment
+    jsonl_filepath = filepath.with_suffix(".jsonl")
+    if filepath == jsonl_filepath or not jsonl_filepath.exists():
+        return filepath
+    if not filepath.exists():
+        return jsonl_filepath
+    # An older json-lines file was written before the last update of the json file
+    if os.stat(jsonl_filepath).st_mtime_ns < os.stat(filepath).st_mtime_ns:
+        return filepath
+    return jsonl_filepath
+
+
+def stream_reddit_posts(filepath=None) -> Iterator[Tuple[str, Dict]]:
+    """Iterate over the reddit posts without loading all of them in memory.
+
+    If an up-to-date json-lines version of the file exists (see get_reddit_posts_file),
+    it is read line by line. Otherwise, the json file is parsed incrementally.
+
+    Args:
+        filepath (optional): json or json-lines file. Defaults to Config.Path.reddit_data_with_NER_and_sentiment.
+
+    Yields:
+        Tuple[str, Dict]: post id and post
+    """
+    filepath = get_reddit_posts_file(filepath)
+    if filepath.suffix == ".jsonl":
+        return iter_json_lines(filepath)
+    return iter_json_object(filepath)
+
+
+def iter_json_lines(filepath) -> Iterator[Tuple[str, Dict]]:
+    """Iterate over a json-lines file as written by save_reddit_data_jsonl.
+
+    Args:
+        filepath: file where each line is a post with an additional "id" key
+
+    Yields:
+        Tuple[str, Dict]: post id and post (without the "id" key)
+    """
+    with open(filepath, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            post = json.loads(line)
+            yield post.pop("id"), post
+
+
+def iter_json_object(filepath, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, object]]:
+    """Incrementally parse a json file containing a single object, yielding its items one at a time.
+
+    Only one chunk of the file and the value being parsed are kept in memory.
+
+    Args:
+        filepath: json file whose top-level value is an object
+        chunk_size (int, optional): amount of characters to read at once. Defaults to 1 << 20.
+
+    Yields:
+        Tuple[str, object]: key and value of each item of the object
+    """
+    decoder = json.JSONDecoder()
+    whitespace = " \t\n\r"
+
+    with open(filepath, "r") as file:
+        buffer = ""
+        position = 0
+        eof = False
+
+        def read_more() -> bool:
+            nonlocal buffer, position, eof
+            if eof:
+                return False
+            chunk = file.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            # Drop what was already parsed
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+
+        def next_character() -> str:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in whitespace:
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if not read_more():
+                    raise ValueError(f"Unexpected end of file in {filepath}")
+
+        def next_value():
+            nonlocal position
+            next_character()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                    # A value that ends exactly at the end of the buffer may be
+                    # truncated (e.g. a number), so only accept it if more follows
+                    if end < len(buffer) or eof:
+                        position = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                read_more()
+
+        def expect(character: str):
+            nonlocal position
+            found = next_character()
+            if found != character:
+                raise ValueError(
+                    f"Expected '{character}' but found '{found}' in {filepath}"
+                )
+            position += 1
+
+        expect("{")
+        if next_character() == "}":
+            return
+        while True:
+            key = next_value()
+            expect(":")
+            yield key, next_value()
+            if next_character() == "}":
+                return
+            expect(",")
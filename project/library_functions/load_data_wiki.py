@@ -11,8 +11,16 @@ try:
 except ModuleNotFoundError:
     from project.library_functions.config import Config
 
+# Flat wiki data that was already loaded in this process, keyed by the hash of its source
+_loaded: Dict[str, Dict] = {}
 
-def load_data_wiki():
+
+def parse_data_wiki() -> Dict:
+    """Parse the raw wikipedia data into a flat dict of lists.
+
+    Returns:
+        Dict: dict mapping each property (name, categories, content, links, synonyms, url) to a list with one value per page
+    """
     with open(Config.Path.full_wiki_data) as file:
         drug_database = json.load(file)
 
@@ -39,6 +47,29 @@ def load_data_wiki():
 
         wiki_data["url"].append(data["url"])
 
-    lf.save_synonym_mapping(wiki_data)
-
     return wiki_data
+
+
+def load_data_wiki() -> Dict:
+    """Load the flat wikipedia data.
+
+    The parsed data is cached on disk and in memory, keyed by the hash of
+    full_wiki_data.json, and the secondary files (synonym mapping, substance names,
+    urls and contents) are only rewritten when that file changes.
+
+    Returns:
+        Dict: dict mapping each property (name, categories, content, links, synonyms, url) to a list with one value per page
+    """
+    source_hash = lf.get_wiki_source_hash()
+
+    if source_hash not in _loaded:
+        wiki_data = lf.load_cached_wiki_artifact("wiki_data", source_hash)
+        if wiki_data is None:
+            wiki_data = parse_data_wiki()
+            lf.save_cached_wiki_artifact("wiki_data", source_hash, wiki_data)
+
+        lf.update_wiki_data_files(wiki_data, source_hash)
+        _loaded[source_hash] = wiki_data
+
+    # Shallow copy, so that callers adding keys don't affect each other
+    return _loaded[source_hash].copy()
@@ -0,0 +1,313 @@
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import community
+import networkx as nx
+import numpy as np
+from tqdm.auto import tqdm
+
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+try:
+    from library_functions.config import Config
+except ModuleNotFoundError:
+    from project.library_functions.config import Config
+
+# Bump whenever the dendrograms computed for the same graph and arguments change, so
+# that old entries are ignored
+DENDROGRAM_CACHE_VERSION = 1
+
+Dendrogram = List[Dict]
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def get_graph_fingerprint(graph: nx.Graph, weight: str = "weight") -> str:
+    """Get the hash of the nodes and weighted edges of a graph.
+
+    The order of the nodes and edges is part of the fingerprint, since the communities
+    found by the louvain algorithm depend on it.
+
+    Args:
+        graph (nx.Graph): graph
+        weight (str, optional): edge attribute used as weight (1 if missing). Defaults to "weight".
+
+    Returns:
+        str: hex digest
+    """
+    sha = hashlib.sha256()
+    sha.update(json.dumps(list(graph.nodes), default=_to_json).encode())
+    sha.update(
+        json.dumps(list(graph.edges(data=weight, default=1)), default=_to_json).encode()
+    )
+    return sha.hexdigest()
+
+
+def get_dendrogram_cache_path(
+    fingerprint: str, weight: str, resolution: float, seed: int
+) -> Path:
+    """Get the file the dendrogram of a seeded louvain run is cached in.
+
+    Args:
+        fingerprint (str): fingerprint of the graph, as returned by get_graph_fingerprint
+        weight (str): edge attribute used as weight
+        resolution (float): resolution of the louvain algorithm
+        seed (int): random state of the louvain algorithm
+
+    Returns:
+        Path: file in Config.Path.louvain_dendrogram_cache_folder
+    """
+    serialized = json.dumps(
+        {
+            "version": DENDROGRAM_CACHE_VERSION,
+            "louvain_version": getattr(community, "__version__", None),
+            "graph": fingerprint,
+            "weight": weight,
+            "resolution": float(resolution),
+            "seed": seed,
+        },
+        sort_keys=True,
+    )
+    name = hashlib.sha256(serialized.encode()).hexdigest()[:32]
+    return Config.Path.louvain_dendrogram_cache_folder / f"{name}.pickle"
+
+
+def _load_dendrogram(path: Path) -> Optional[Dendrogram]:
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except lf.CACHE_READ_ERRORS:
+        lf.discard_cache_entry(path)
+        return None
+
+
+def _save_dendrogram(path: Path, dendrogram: Dendrogram):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first so that concurrent readers never see a
+    # half-written dendrogram
+    temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(temp_path, "wb") as f:
+        pickle.dump(dendrogram, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+# Graph and weight of the worker processes of run_louvain_dendrograms
+_worker_graph: nx.Graph = None
+_worker_weight: str = None
+
+
+def _init_louvain_worker(graph: nx.Graph, weight: str):
+    global _worker_graph, _worker_weight
+    _worker_graph = graph
+    _worker_weight = weight
+
+
+def _generate_dendrogram(
+    run: Tuple[float, Optional[int]],
+) -> Tuple[Tuple[float, Optional[int]], Dendrogram]:
+    resolution, seed = run
+    dendrogram = community.generate_dendrogram(
+        _worker_graph,
+        weight=_worker_weight,
+        resolution=resolution,
+        random_state=seed,
+    )
+    return run, dendrogram
+
+
+def _iter_dendrograms(
+    graph: nx.Graph,
+    weight: str,
+    runs: List[Tuple[float, Optional[int]]],
+    n_workers: int,
+) -> Iterator[Tuple[Tuple[float, Optional[int]], Dendrogram]]:
+    if len(runs) <= 1 or n_workers <= 1:
+        _init_louvain_worker(graph, weight)
+        try:
+            yield from map(_generate_dendrogram, runs)
+        finally:
+            _init_louvain_worker(None, None)
+        return
+
+    with multiprocessing.Pool(
+        n_workers, initializer=_init_louvain_worker, initargs=(graph, weight)
+    ) as pool:
+        yield from pool.imap_unordered(_generate_dendrogram, runs)
+
+
+def run_louvain_dendrograms(
+    graph: nx.Graph,
+    resolutions: Sequence[float],
+    seeds: Sequence[Optional[int]] = (None,),
+    weight: str = "weight",
+    n_workers: int = None,
+    use_cache: bool = True,
+    show_progress_bars: bool = False,
+) -> Dict[Tuple[float, Optional[int]], Dendrogram]:
+    """Run the louvain algorithm on a graph for every combination of resolution and seed.
+
+    Runs are executed in a process pool. The dendrograms of seeded runs are cached in
+    Config.Path.louvain_dendrogram_cache_folder, keyed by the fingerprint of the graph,
+    the weight, the resolution and the seed, and are only computed once. Unseeded runs
+    are never cached.
+
+    Args:
+        graph (nx.Graph): graph to find the communities of
+        resolutions (Sequence[float]): resolutions of the louvain algorithm
+        seeds (Sequence[Optional[int]], optional): random states of the louvain algorithm,
+            None for an unseeded run. Defaults to (None,).
+        weight (str, optional): edge attribute to use as weight. Defaults to "weight".
+        n_workers (int, optional): number of processes. Defaults to the number of CPUs (or
+            of runs to compute, if lower). Runs are computed in this process if only one
+            is needed.
+        use_cache (bool, optional): load and save the dendrograms of seeded runs. Defaults to True.
+        show_progress_bars (bool, optional): show a progress bar over the runs. Defaults to False.
+
+    Returns:
+        Dict[Tuple[float, Optional[int]], Dendrogram]: dendrograms as returned by
+        community.generate_dendrogram, keyed by (resolution, seed)
+
+    Examples:
+        >>> dendrograms = run_louvain_dendrograms(
+        >>>     g_reddit_gcc, resolutions=[0.6, 0.8, 1.0], seeds=[0], weight="count"
+        >>> )
+        >>> partition = community.partition_at_level(dendrograms[(0.8, 0)], 0)
+    """
+    runs = list(dict.fromkeys(itertools.product(resolutions, seeds)))
+    dendrograms = {}
+
+    cache_paths = {}
+    if use_cache:
+        fingerprint = get_graph_fingerprint(graph, weight)
+        for resolution, seed in runs:
+            if seed is None:
+                continue
+            path = get_dendrogram_cache_path(fingerprint, weight, resolution, seed)
+            dendrogram = _load_dendrogram(path)
+            if dendrogram is None:
+                cache_paths[(resolution, seed)] = path
+            else:
+                dendrograms[(resolution, seed)] = dendrogram
+
+    missing_runs = [run for run in runs if run not in dendrograms]
+    if n_workers is None:
+        n_workers = min(len(missing_runs), os.cpu_count() or 1)
+    for run, dendrogram in tqdm(
+        _iter_dendrograms(graph, weight, missing_runs, n_workers),
+        total=len(missing_runs),
+        disable=not show_progress_bars,
+    ):
+        dendrograms[run] = dendrogram
+        if run in cache_paths:
+            _save_dendrogram(cache_paths[run], dendrogram)
+
+    return {run: dendrograms[run] for run in runs}
+
+
+def _load_saved_dendrograms(
+    path: Path, fingerprint: str, weight: str, seed: int
+) -> Dict[float, Dendrogram]:
+    try:
+        with open(path, "r") as f:
+            saved = json.load(f)
+        saved_key = (saved["graph"], saved["weight"], saved["seed"])
+        if saved_key != (fingerprint, weight, seed):
+            return {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, KeyError, TypeError):
+        # Truncated or corrupt file: it is overwritten with the computed dendrograms
+        return {}
+    # Levels are saved as lists of (node or community, community) pairs, so that the
+    # keys keep their type
+    return {
+        float(resolution): [dict(level) for level in dendrogram]
+        for resolution, dendrogram in saved["dendrograms"].items()
+    }
+
+
+def _save_dendrograms(
+    path: Path,
+    fingerprint: str,
+    weight: str,
+    seed: int,
+    dendrograms: Dict[float, Dendrogram],
+):
+    saved = {
+        "graph": fingerprint,
+        "weight": weight,
+        "seed": seed,
+        "dendrograms": {
+            str(resolution): [list(level.items()) for level in dendrogram]
+            for resolution, dendrogram in dendrograms.items()
+        },
+    }
+    # Write to a temporary file first so that workers booting concurrently never
+    # see a half-written file
+    temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(temp_path, "w+") as f:
+        json.dump(saved, f, default=_to_json)
+    os.replace(temp_path, path)
+
+
+def get_louvain_dendrograms(
+    graph: nx.Graph,
+    resolutions: Sequence[float],
+    seed: int,
+    weight: str = "weight",
+    saved: str = None,
+) -> Dict[float, Dendrogram]:
+    """Get the dendrograms of seeded louvain runs on a graph, loading them from disk if
+    they were saved for the same graph.
+
+    Since the runs are seeded, every process gets the same communities, whether it
+    loads them or computes them.
+
+    Args:
+        graph (nx.Graph): graph to find the communities of
+        resolutions (Sequence[float]): resolutions of the louvain algorithm
+        seed (int): random state of the louvain algorithm
+        weight (str, optional): edge attribute to use as weight. Defaults to "weight".
+        saved (str, optional): file in Config.Path.shared_data_folder (e.g. next to the
+            layout of the graph) that the dendrograms are loaded from and saved to. The
+            saved dendrograms are only used if they were computed on the same graph, with
+            the same weight and seed. Defaults to None (always compute them).
+
+    Returns:
+        Dict[float, Dendrogram]: dendrograms as returned by community.generate_dendrogram,
+        keyed by resolution
+    """
+    resolutions = [float(resolution) for resolution in resolutions]
+    fingerprint = get_graph_fingerprint(graph, weight)
+    path = Config.Path.shared_data_folder / saved if saved else None
+
+    dendrograms = (
+        _load_saved_dendrograms(path, fingerprint, weight, seed) if path else {}
+    )
+    missing_resolutions = [
+        resolution for resolution in resolutions if resolution not in dendrograms
+    ]
+    if missing_resolutions:
+        computed = run_louvain_dendrograms(
+            graph, missing_resolutions, seeds=[seed], weight=weight
+        )
+        for (resolution, _), dendrogram in computed.items():
+            dendrograms[resolution] = dendrogram
+        if path:
+            _save_dendrograms(path, fingerprint, weight, seed, dendrograms)
+
+    return {resolution: dendrograms[resolution] for resolution in resolutions}
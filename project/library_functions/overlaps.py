@@ -150,6 +150,26 @@ def draw_overlaps_plotly(
     overlaps, A, B = overlap_matrix(
         attribute_A=attribute_A, attribute_B=attribute_B, graph=graph
     )
+    fig = overlap_figure(overlaps, A, B)
+
+    if save:
+        with open(Config.Path.shared_data_folder / save, "wb+") as f:
+            pickle.dump(fig, f)
+
+    return fig
+
+
+def overlap_figure(overlaps: np.ndarray, A: List[str], B: List[str]):
+    """Get the 2D-histogram for an overlap matrix as returned by overlap_matrix.
+
+    Args:
+        overlaps (np.ndarray): 2D numpy array containing the overlaps
+        A (List[str]): categories corresponding to the rows of the matrix
+        B (List[str]): categories corresponding to the columns of the matrix
+
+    Returns:
+        [type]: plotly figure containing the 2D histogram
+    """
     heatmap_text = np.around(overlaps, decimals=2)
     fig = ff.create_annotated_heatmap(
         z=overlaps,
@@ -162,9 +182,4 @@ def draw_overlaps_plotly(
     )
     for i in range(len(fig.layout.annotations)):
         fig.layout.annotations[i].font.size = 8
-
-    if save:
-        with open(Config.Path.shared_data_folder / save, "wb+") as f:
-            pickle.dump(fig, f)
-
     return fig
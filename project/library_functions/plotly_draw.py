@@ -1,6 +1,5 @@
 #%%
 
-import json
 from typing import Dict, List, Tuple, Union
 
 import networkx as nx
@@ -8,15 +7,10 @@ import numpy as np
 import plotly.graph_objects as go
 
 try:
-    from library_functions.config import Config
-except:
-    from project.library_functions.config import Config
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
 
-# %%
-with open(Config.Path.contents_per_substance, "r+") as f:
-    contents_per_substance = json.load(f)
-with open(Config.Path.urls_per_substance, "r+") as f:
-    url_per_substance = json.load(f)
 
 
 def get_edge_traces(
@@ -95,6 +89,8 @@ def split_text_at(text: str, length: int) -> str:
 
 
 def get_nodes_hover(graph: nx.Graph) -> List[str]:
+    contents_per_substance = lf.data_store.contents_per_substance
+    url_per_substance = lf.data_store.urls_per_substance
     node_hovers = []
 
     for name, data in graph.nodes(data=True):
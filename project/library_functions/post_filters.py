@@ -0,0 +1,90 @@
+import operator
+from typing import Callable, Tuple, Union
+
+import numpy as np
+
+# Operators of declarative conditions, working on single values as well as on arrays
+_comparison_operators = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+Condition = Union[Callable[[float], bool], Tuple]
+
+
+def is_declarative_condition(condition: Condition) -> bool:
+    """Check whether a condition is declarative, e.g. (">", 0.1), rather than a function."""
+    return isinstance(condition, tuple)
+
+
+def _check_condition(condition: Tuple):
+    if not condition:
+        raise ValueError("Empty condition")
+    operator_name, *arguments = condition
+    if operator_name in _comparison_operators:
+        expected_arguments = 1
+    elif operator_name == "between":
+        expected_arguments = 2
+    else:
+        raise ValueError(
+            f"Unknown operator '{operator_name}' in condition {condition}: use one of "
+            f"{list(_comparison_operators) + ['between']}"
+        )
+    if len(arguments) != expected_arguments:
+        raise ValueError(
+            f"Operator '{operator_name}' takes {expected_arguments} value(s), got {condition}"
+        )
+
+
+def condition_mask(condition: Tuple, values: np.ndarray) -> np.ndarray:
+    """Evaluate a declarative condition on a column of values at once.
+
+    Args:
+        condition (Tuple): declarative condition, e.g. (">", 0.1) or ("between", 0.2, 0.8)
+            (both bounds included)
+        values (np.ndarray): values to evaluate the condition on, compared in double
+            precision
+
+    Raises:
+        ValueError: if the condition is not valid
+
+    Returns:
+        np.ndarray: boolean mask of the values meeting the condition
+    """
+    _check_condition(condition)
+    # Compare in double precision, like the conditions evaluated on single values
+    values = np.asarray(values, dtype=np.float64)
+    operator_name, *arguments = condition
+    if operator_name == "between":
+        low, high = arguments
+        return (values >= low) & (values <= high)
+    return _comparison_operators[operator_name](values, arguments[0])
+
+
+def as_condition_function(condition: Condition) -> Callable[[float], bool]:
+    """Get a function evaluating a condition on a single value.
+
+    Args:
+        condition (Condition): declarative condition, or function
+
+    Raises:
+        ValueError: if the condition is declarative and not valid
+
+    Returns:
+        Callable[[float], bool]: the function itself, or a function evaluating the
+        declarative condition
+    """
+    if not is_declarative_condition(condition):
+        return condition
+
+    _check_condition(condition)
+    operator_name, *arguments = condition
+    if operator_name == "between":
+        low, high = arguments
+        return lambda value: low <= value <= high
+    compare = _comparison_operators[operator_name]
+    return lambda value: compare(value, arguments[0])
@@ -0,0 +1,256 @@
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+
+
+class Post:
+    """A single reddit post.
+
+    Also supports dict-style access (``post["title"]``) so that it can be used
+    wherever a post dict was expected.
+    """
+
+    __slots__ = ("id", "title", "content", "matches", "polarity", "subjectivity")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        content: str,
+        matches: List[str],
+        polarity: float,
+        subjectivity: float,
+    ):
+        self.id = id
+        self.title = title
+        self.content = content
+        self.matches = matches
+        self.polarity = polarity
+        self.subjectivity = subjectivity
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self) -> str:
+        return f"Post(id={self.id!r}, title={self.title!r})"
+
+
+class _Column(Sequence):
+    """Sequence computing its values on access, e.g. decoding them from a snapshot."""
+
+    def __init__(self, get: Callable[[int], object], length: int):
+        self._get = get
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, row: int):
+        return self._get(row)
+
+
+class PostTable:
+    """Struct-of-arrays representation of the reddit posts.
+
+    Each property of the posts is one column with one value per row: numpy arrays
+    for the numerical ones (lengths, polarity, subjectivity), and a CSR pair of
+    arrays (matches_indptr, matches_indices into vocabulary) for the matches.
+    Posts are looked up by id through an id -> row index.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        titles: Sequence[str],
+        contents: Sequence[str],
+        title_lengths: np.ndarray,
+        content_lengths: np.ndarray,
+        polarity: np.ndarray,
+        subjectivity: np.ndarray,
+        matches_indptr: np.ndarray,
+        matches_indices: np.ndarray,
+        vocabulary: List[str],
+        row_of: Callable[[str], int] = None,
+    ):
+        self.ids = ids
+        self.titles = titles
+        self.contents = contents
+        self.title_lengths = title_lengths
+        self.content_lengths = content_lengths
+        self.polarity = polarity
+        self.subjectivity = subjectivity
+        self.matches_indptr = matches_indptr
+        self.matches_indices = matches_indices
+        self.vocabulary = vocabulary
+        if row_of is None:
+            index = {post_id: row for row, post_id in enumerate(ids)}
+            row_of = index.__getitem__
+        self.row_of = row_of
+
+    @classmethod
+    def from_snapshot(cls, snapshot: "lf.RedditSnapshot") -> "PostTable":
+        """Get a table sharing the memory-mapped columns of a snapshot (no copy).
+
+        Args:
+            snapshot (lf.RedditSnapshot): opened reddit snapshot
+
+        Returns:
+            PostTable: table over the snapshot's posts
+        """
+        return cls(
+            ids=_Column(snapshot.post_id, len(snapshot)),
+            titles=_Column(snapshot.title, len(snapshot)),
+            contents=_Column(snapshot.content, len(snapshot)),
+            title_lengths=snapshot.title_lengths,
+            content_lengths=snapshot.content_lengths,
+            polarity=snapshot.polarity,
+            subjectivity=snapshot.subjectivity,
+            matches_indptr=snapshot.matches_indptr,
+            matches_indices=snapshot.matches_indices,
+            vocabulary=snapshot.vocabulary,
+            row_of=snapshot.row_of,
+        )
+
+    @classmethod
+    def from_posts(
+        cls, posts: Union[Mapping, Iterable[Tuple[str, Dict]]]
+    ) -> "PostTable":
+        """Build a table from reddit posts, in a single pass.
+
+        Args:
+            posts (Union[Mapping, Iterable[Tuple[str, Dict]]]): mapping from post ids to
+                posts, or iterator of (post_id, post) tuples
+
+        Returns:
+            PostTable: table holding the posts
+        """
+        if isinstance(posts, Mapping):
+            posts = posts.items()
+
+        ids, titles, contents, polarity, subjectivity = [], [], [], [], []
+        vocabulary = {}
+        indptr = [0]
+        indices = []
+        for post_id, post in posts:
+            ids.append(post_id)
+            titles.append(post["title"])
+            contents.append(post["content"])
+            polarity.append(post.get("polarity", np.nan))
+            subjectivity.append(post.get("subjectivity", np.nan))
+            for match in post["matches"]:
+                indices.append(vocabulary.setdefault(match, len(vocabulary)))
+            indptr.append(len(indices))
+
+        return cls(
+            ids=ids,
+            titles=titles,
+            contents=contents,
+            title_lengths=np.array([len(t) for t in titles], dtype=np.int32),
+            content_lengths=np.array([len(c) for c in contents], dtype=np.int32),
+            # Kept in double precision, like in the snapshot
+            polarity=np.array(polarity, dtype=np.float64),
+            subjectivity=np.array(subjectivity, dtype=np.float64),
+            matches_indptr=np.array(indptr, dtype=np.int64),
+            matches_indices=np.array(indices, dtype=np.int32),
+            vocabulary=list(vocabulary.keys()),
+        )
+
+    def __len__(self) -> int:
+        return len(self.polarity)
+
+    def __getitem__(self, post_id: str) -> Post:
+        return self.post(self.row_of(post_id))
+
+    def __contains__(self, post_id) -> bool:
+        try:
+            self.row_of(post_id)
+        except KeyError:
+            return False
+        return True
+
+    @property
+    def n_matches(self) -> np.ndarray:
+        """Number of matched substances in each post (including repeated matches)."""
+        return np.diff(self.matches_indptr)
+
+    @property
+    def text_lengths(self) -> np.ndarray:
+        """Length in characters of the text of each post, as returned by text."""
+        return self.title_lengths.astype(np.int64) + 1 + self.content_lengths
+
+    @property
+    def post_lengths(self) -> np.ndarray:
+        """Length in characters of the title plus the content of each post."""
+        return self.title_lengths.astype(np.int64) + self.content_lengths
+
+    def matches(self, row: int) -> List[str]:
+        start, end = self.matches_indptr[row], self.matches_indptr[row + 1]
+        return [self.vocabulary[i] for i in self.matches_indices[start:end]]
+
+    def text(self, row: int) -> str:
+        """Title and content of a post, as stored in the node and link contents of the graphs."""
+        return self.titles[row] + " " + self.contents[row]
+
+    def post(self, row: int) -> Post:
+        return Post(
+            id=self.ids[row],
+            title=self.titles[row],
+            content=self.contents[row],
+            matches=self.matches(row),
+            polarity=float(self.polarity[row]),
+            subjectivity=float(self.subjectivity[row]),
+        )
+
+
+class PostContents(Sequence):
+    """Texts of some posts (title and content, as returned by PostTable.text), referenced
+    by their rows in a post table and only decoded when accessed.
+
+    Used instead of lists of strings for the contents of the nodes and edges of the
+    reddit graph, so that the text of a post is stored once in the corpus instead of
+    once per node and edge mentioning it. When pickled, only the rows are kept:
+    unpickled contents read the posts from the post table of the data store.
+    """
+
+    __slots__ = ("rows", "_post_table")
+
+    def __init__(self, rows: np.ndarray, post_table: PostTable = None):
+        self.rows = np.asarray(rows, dtype=np.int32)
+        self._post_table = post_table
+
+    @property
+    def post_table(self) -> PostTable:
+        if self._post_table is None:
+            self._post_table = lf.data_store.post_table
+        return self._post_table
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PostContents(self.rows[index], self._post_table)
+        return self.post_table.text(self.rows[index])
+
+    def __iter__(self):
+        post_table = self.post_table
+        for row in self.rows:
+            yield post_table.text(row)
+
+    def lengths(self) -> np.ndarray:
+        """Length in characters of each of the texts, without decoding them."""
+        return self.post_table.text_lengths[self.rows]
+
+    def __reduce__(self):
+        return (PostContents, (self.rows,))
+
+    def __repr__(self) -> str:
+        return f"PostContents({len(self)} posts)"
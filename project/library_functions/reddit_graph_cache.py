@@ -0,0 +1,444 @@
+import hashlib
+import json
+import numbers
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, List, Literal, Optional, Tuple, Union
+
+import networkx as nx
+import numpy as np
+
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+try:
+    from library_functions.config import Config
+except ModuleNotFoundError:
+    from project.library_functions.config import Config
+
+# Bump whenever the graphs built by create_graph_reddit or the npz format change, so
+# that old entries are ignored
+GRAPH_CACHE_VERSION = 4
+
+
+def get_reddit_graph_source_hash(alternative_path: Union[str, Path] = None) -> str:
+    """Get the hash of the data a reddit graph is built from: the reddit posts and the
+    wikipedia data (which gives the nodes and their categories).
+
+    Args:
+        alternative_path (Union[str, Path], optional): file the posts are read from (or
+            its json-lines version, see get_reddit_posts_file). Defaults to
+            Config.Path.reddit_data_with_NER_and_sentiment, or to the manifest of the
+            reddit snapshot on deployments that only ship the snapshot.
+
+    Returns:
+        str: hex digest
+    """
+    if alternative_path:
+        # The file the posts are actually streamed from, which may be the json-lines
+        # version of alternative_path
+        reddit_source = lf.get_reddit_posts_file(alternative_path)
+    else:
+        reddit_source = Config.Path.reddit_data_with_NER_and_sentiment
+        if not reddit_source.exists():
+            reddit_source = Config.Path.reddit_snapshot / "manifest.json"
+    sha = hashlib.sha256()
+    sha.update(lf.get_file_hash(reddit_source).encode())
+    sha.update(lf.get_wiki_source_hash().encode())
+    return sha.hexdigest()
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Can't use {value!r} as a key of the reddit graph cache")
+
+
+def _arguments_hash(arguments: Dict) -> str:
+    conditions = arguments.get("conditional_functions_dict") or {}
+    functions = sorted(
+        attribute
+        for attribute, condition in conditions.items()
+        if not lf.is_declarative_condition(condition)
+    )
+    if functions:
+        raise ValueError(
+            f"Conditional functions (on {functions}) can't be used as a cache key: "
+            "use declarative conditions, e.g. {'polarity': ('>', 0.1)}"
+        )
+    # Floats such as np.inf are written as Infinity, so every value has a key
+    serialized = json.dumps(
+        {"version": GRAPH_CACHE_VERSION, "arguments": arguments},
+        sort_keys=True,
+        default=_to_json,
+    )
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def get_reddit_graph_cache_path(
+    arguments: Dict,
+    source_hash: str,
+    cache_format: Literal["npz", "pickle"] = "npz",
+) -> Path:
+    """Get the file a reddit graph is cached in.
+
+    Args:
+        arguments (Dict): arguments of create_graph_reddit that the graph depends on
+        source_hash (str): hash of the data the graph is built from, as returned by
+            get_reddit_graph_source_hash
+        cache_format (str, optional): "npz" or "pickle". Defaults to "npz".
+
+    Raises:
+        ValueError: if the arguments contain conditional functions, which can't be hashed
+
+    Returns:
+        Path: file in Config.Path.reddit_graph_cache_folder
+    """
+    name = f"{_arguments_hash(arguments)[:32]}_{source_hash[:32]}"
+    return Config.Path.reddit_graph_cache_folder / f"{name}.{cache_format}"
+
+
+def load_cached_reddit_graph(
+    arguments: Dict,
+    source_hash: str,
+    cache_format: Literal["npz", "pickle"] = "npz",
+) -> Optional[nx.Graph]:
+    """Load a reddit graph built with the same arguments from the same data.
+
+    Args:
+        arguments (Dict): see get_reddit_graph_cache_path
+        source_hash (str): see get_reddit_graph_cache_path
+        cache_format (str, optional): see get_reddit_graph_cache_path. Defaults to "npz".
+
+    Returns:
+        Optional[nx.Graph]: the cached graph, or None if there is none. Unreadable
+        entries (e.g. truncated files) are deleted, and None is returned.
+    """
+    path = get_reddit_graph_cache_path(arguments, source_hash, cache_format)
+    try:
+        if cache_format == "npz":
+            return load_graph_npz(path)
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except lf.CACHE_READ_ERRORS:
+        lf.discard_cache_entry(path)
+        return None
+
+
+def save_cached_reddit_graph(
+    graph: nx.Graph,
+    arguments: Dict,
+    source_hash: str,
+    cache_format: Literal["npz", "pickle"] = "npz",
+):
+    """Cache a reddit graph, replacing the ones built with the same arguments from older
+    versions of the data.
+
+    Args:
+        graph (nx.Graph): graph built by create_graph_reddit
+        arguments (Dict): see get_reddit_graph_cache_path
+        source_hash (str): see get_reddit_graph_cache_path
+        cache_format (str, optional): see get_reddit_graph_cache_path. Defaults to "npz".
+    """
+    path = get_reddit_graph_cache_path(arguments, source_hash, cache_format)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temporary file first so that concurrent readers never see a
+    # half-written graph
+    temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    if cache_format == "npz":
+        save_graph_npz(graph, temp_path)
+    else:
+        with open(temp_path, "wb") as f:
+            pickle.dump(graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+    arguments_prefix = path.name.split("_")[0]
+    for old_path in path.parent.glob(f"{arguments_prefix}_*.{path.suffix[1:]}"):
+        if old_path != path:
+            old_path.unlink()
+
+
+def _encode_strings(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [string.encode("utf-8", errors="surrogatepass") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e) for e in encoded], dtype=np.int64)
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_strings(arena: np.ndarray, offsets: np.ndarray) -> List[str]:
+    data = arena.tobytes()
+    offsets = offsets.tolist()
+    return [
+        data[start:end].decode("utf-8", errors="surrogatepass")
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]
+
+
+def _segment_offsets(lengths: List[int]) -> np.ndarray:
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(lengths, dtype=np.int64)
+    return offsets
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def _encode_column(name: str, values: List) -> Tuple[str, Dict[str, np.ndarray]]:
+    """Encode the values of an attribute as flat arrays.
+
+    Returns:
+        Tuple[str, Dict[str, np.ndarray]]: kind of the values, and arrays to save
+    """
+    if all(value is None for value in values):
+        return "none", {}
+    if all(_is_number(value) for value in values):
+        return "number", {"values": np.asarray(values)}
+    if all(isinstance(value, str) for value in values):
+        arena, offsets = _encode_strings(values)
+        return "string", {"arena": arena, "offsets": offsets}
+    if all(isinstance(value, lf.PostContents) for value in values):
+        rows = np.concatenate([value.rows for value in values] + [np.zeros(0, np.int32)])
+        offsets = _segment_offsets([len(value) for value in values])
+        return "post_contents", {"rows": rows, "offsets": offsets}
+    if all(isinstance(value, np.ndarray) and value.ndim == 1 for value in values):
+        flat = np.concatenate(values) if values else np.zeros(0)
+        offsets = _segment_offsets([len(value) for value in values])
+        return "array", {"values": flat, "offsets": offsets}
+    if all(isinstance(value, list) for value in values):
+        items = [item for value in values for item in value]
+        offsets = _segment_offsets([len(value) for value in values])
+        if all(_is_number(item) for item in items):
+            return "number_list", {"values": np.asarray(items), "offsets": offsets}
+        if all(isinstance(item, str) for item in items):
+            arena, string_offsets = _encode_strings(items)
+            return "string_list", {
+                "arena": arena,
+                "string_offsets": string_offsets,
+                "offsets": offsets,
+            }
+    raise TypeError(
+        f"Can't save the values of attribute '{name}' in the npz format: "
+        "use the pickle format instead"
+    )
+
+
+def _decode_column(kind: str, arrays: Dict[str, np.ndarray], n_values: int) -> List:
+    if kind == "none":
+        return [None] * n_values
+    if kind == "number":
+        return arrays["values"].tolist()
+    if kind == "string":
+        return _decode_strings(arrays["arena"], arrays["offsets"])
+
+    offsets = arrays["offsets"].tolist()
+    segments = list(zip(offsets[:-1], offsets[1:]))
+    if kind == "post_contents":
+        rows = arrays["rows"]
+        # Contents read the posts from the post table of the data store when accessed
+        return [lf.PostContents(rows[start:end]) for start, end in segments]
+    if kind == "array":
+        values = arrays["values"]
+        values.flags.writeable = False
+        return [values[start:end] for start, end in segments]
+    if kind == "number_list":
+        items = arrays["values"].tolist()
+    else:
+        items = _decode_strings(arrays["arena"], arrays["string_offsets"])
+    return [items[start:end] for start, end in segments]
+
+
+def _encode_attributes(
+    prefix: str,
+    attributes: List[Dict],
+    arrays: Dict[str, np.ndarray],
+    store_columns: List[str] = (),
+) -> Dict[str, str]:
+    # Attributes are saved in the order in which they were first assigned
+    names = list(dict.fromkeys(name for data in attributes for name in data))
+    kinds = {}
+    for index, name in enumerate(names):
+        if name in store_columns:
+            # Read from the saved EdgeAttributeStore
+            kinds[name] = "store"
+            continue
+        present = np.array([name in data for data in attributes], dtype=bool)
+        values = [data[name] for data in attributes if name in data]
+        kinds[name], column_arrays = _encode_column(name, values)
+        key = f"{prefix}{index}"
+        if not present.all():
+            arrays[f"{key}_present"] = present
+        for array_name, array in column_arrays.items():
+            arrays[f"{key}_{array_name}"] = array
+    return kinds
+
+
+def _decode_attributes(
+    prefix: str,
+    kinds: Dict[str, str],
+    arrays,
+    n_items: int,
+    store_views: List[Dict[str, np.ndarray]] = None,
+) -> List[Dict]:
+    columns = {}
+    for index, (name, kind) in enumerate(kinds.items()):
+        if kind == "store":
+            columns[name] = (None, [views[name] for views in store_views])
+            continue
+        key = f"{prefix}{index}"
+        column_arrays = {
+            array_name[len(key) + 1 :]: arrays[array_name]
+            for array_name in arrays.files
+            if array_name.startswith(f"{key}_")
+        }
+        present = column_arrays.pop("present", None)
+        n_values = n_items if present is None else int(present.sum())
+        columns[name] = (present, _decode_column(kind, column_arrays, n_values))
+
+    attributes = [{} for _ in range(n_items)]
+    for name, (present, values) in columns.items():
+        items = range(n_items) if present is None else np.flatnonzero(present).tolist()
+        for item, value in zip(items, values):
+            attributes[item][name] = value
+    return attributes
+
+
+def _is_store_view(value, column: np.ndarray, start: int, end: int) -> bool:
+    # Views share the base of the array they were sliced from
+    base = column if column.base is None else column.base
+    return (
+        isinstance(value, np.ndarray)
+        and value.base is base
+        and len(value) == end - start
+    )
+
+
+def save_graph_npz(graph: nx.Graph, path: Union[str, Path]):
+    """Save a reddit graph as compressed numpy arrays.
+
+    Each node and edge attribute is saved as flat arrays (values, plus offsets for
+    lists). Edge attributes that are views on the EdgeAttributeStore of the graph
+    are not saved twice: they are views on the saved store again once loaded.
+
+    Args:
+        graph (nx.Graph): graph whose attribute values are numbers, strings, lists of
+            numbers or strings, numpy arrays, PostContents or None
+        path (Union[str, Path]): file to write to
+
+    Raises:
+        TypeError: if the graph has attributes of other types
+    """
+    nodes = list(graph.nodes)
+    node_index = {node: index for index, node in enumerate(nodes)}
+    edges = list(graph.edges)
+
+    arrays = {}
+    arrays["nodes_arena"], arrays["nodes_offsets"] = _encode_strings(nodes)
+    arrays["edges"] = np.array(
+        [(node_index[u], node_index[v]) for u, v in edges], dtype=np.int32
+    ).reshape(-1, 2)
+
+    graph_attributes = dict(graph.graph)
+    store = graph_attributes.pop("edge_attribute_store", None)
+    if graph_attributes:
+        raise TypeError(
+            f"Can't save the graph attributes {sorted(graph_attributes)} in the npz format"
+        )
+
+    edge_attributes = [dict(graph.edges[edge]) for edge in edges]
+    store_columns = []
+    if store is not None:
+        store_index = {edge: index for index, edge in enumerate(store.edges)}
+        arrays["store_edges"] = np.array(
+            [(node_index[u], node_index[v]) for u, v in store.edges], dtype=np.int32
+        ).reshape(-1, 2)
+        arrays["store_offsets"] = store.offsets
+        for name in store.columns:
+            arrays[f"store_{name}"] = getattr(store, name)
+        arrays["edge_store_index"] = np.array(
+            [store_index.get(edge, store_index.get(edge[::-1], -1)) for edge in edges],
+            dtype=np.int64,
+        )
+        # Per-occurrence attributes that are views on the store
+        edge_store_index = arrays["edge_store_index"].tolist()
+        for name in ["number_of_drugs_in_post", "polarity", "subjectivity"]:
+            column = getattr(store, name)
+            if all(
+                index >= 0
+                and _is_store_view(
+                    data.get(name),
+                    column,
+                    store.offsets[index],
+                    store.offsets[index + 1],
+                )
+                for data, index in zip(edge_attributes, edge_store_index)
+            ):
+                store_columns.append(name)
+
+    schema = {
+        "version": GRAPH_CACHE_VERSION,
+        "directed": graph.is_directed(),
+        "node_attributes": _encode_attributes(
+            "node", [graph.nodes[node] for node in nodes], arrays
+        ),
+        "edge_attributes": _encode_attributes(
+            "edge", edge_attributes, arrays, store_columns=store_columns
+        ),
+    }
+    arrays["schema"] = np.frombuffer(json.dumps(schema).encode(), dtype=np.uint8)
+
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+
+
+def load_graph_npz(path: Union[str, Path]) -> nx.Graph:
+    """Load a graph saved by save_graph_npz.
+
+    Args:
+        path (Union[str, Path]): file to load
+
+    Returns:
+        nx.Graph: the graph, with the same nodes, edges and attributes
+    """
+    with np.load(path, allow_pickle=False) as arrays:
+        schema = json.loads(arrays["schema"].tobytes())
+        nodes = _decode_strings(arrays["nodes_arena"], arrays["nodes_offsets"])
+        edges = arrays["edges"].tolist()
+
+        graph = nx.DiGraph() if schema["directed"] else nx.Graph()
+        graph.add_nodes_from(
+            zip(
+                nodes,
+                _decode_attributes(
+                    "node", schema["node_attributes"], arrays, len(nodes)
+                ),
+            )
+        )
+        store_views = None
+        if "store_offsets" in arrays.files:
+            store = lf.EdgeAttributeStore(
+                edges=[(nodes[u], nodes[v]) for u, v in arrays["store_edges"].tolist()],
+                offsets=arrays["store_offsets"],
+                **{
+                    name: arrays[f"store_{name}"]
+                    for name in lf.EdgeAttributeStore.columns
+                },
+            )
+            graph.graph["edge_attribute_store"] = store
+            store_views = [
+                store.edge_attributes(index)
+                for index in arrays["edge_store_index"].tolist()
+            ]
+        edge_attributes = _decode_attributes(
+            "edge", schema["edge_attributes"], arrays, len(edges), store_views
+        )
+
+    graph.add_edges_from(
+        (nodes[u], nodes[v], data) for (u, v), data in zip(edges, edge_attributes)
+    )
+    return graph
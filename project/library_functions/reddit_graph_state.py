@@ -0,0 +1,283 @@
+import os
+import pickle
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+import networkx as nx
+import numpy as np
+
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+try:
+    from library_functions.config import Config
+except ModuleNotFoundError:
+    from project.library_functions.config import Config
+
+
+class _TrackedEdges(dict):
+    """All the edges seen so far, linked or not, remembering which ones were modified
+    (and their count before that) since the last call to clear_touched."""
+
+    def __init__(self):
+        super().__init__()
+        self.touched: Dict[Tuple[str, str], int] = {}
+
+    def key(self, edge: Tuple[str, str]) -> Tuple[str, str]:
+        return edge if dict.__contains__(self, edge) else edge[::-1]
+
+    def __contains__(self, edge) -> bool:
+        return dict.__contains__(self, edge) or dict.__contains__(self, edge[::-1])
+
+    def __getitem__(self, edge: Tuple[str, str]) -> Dict:
+        edge = self.key(edge)
+        data = dict.__getitem__(self, edge)
+        self.touched.setdefault(edge, data["count"])
+        return data
+
+    def add(self, edge: Tuple[str, str], data: Dict):
+        dict.__setitem__(self, edge, data)
+        self.touched[edge] = 0
+
+    def clear_touched(self):
+        self.touched = {}
+
+
+class _IngestTarget:
+    """Graph-like object passed to link_drugs: nodes are the ones of the graph, and edges
+    are recorded in the tracked edges (whether they are linked in the graph or not)."""
+
+    def __init__(self, graph: nx.Graph, edges: _TrackedEdges):
+        self.nodes = graph.nodes
+        self.edges = edges
+
+    def has_edge(self, u: str, v: str) -> bool:
+        return (u, v) in self.edges
+
+    def add_edge(self, u: str, v: str, **attributes):
+        self.edges.add((u, v), attributes)
+
+
+class RedditGraphState:
+    """Reddit graph that new posts can be added to, without rebuilding it from scratch.
+
+    Keeps the attributes of every pair of drugs that was seen, including the ones that
+    don't occur often enough to be linked yet, so that they can be linked as soon as they
+    reach min_edge_occurrences_to_link. The cost of adding posts is proportional to the
+    number of new posts, not to the size of the corpus.
+
+    Examples:
+        >>> state = RedditGraphState(max_drugs_in_post=8, min_edge_occurrences_to_link=2)
+        >>> state.ingest(lf.data_store.post_table)
+        >>> state.save()
+        >>> # later, with new posts
+        >>> state = RedditGraphState.load()
+        >>> state.ingest(new_posts)
+        >>> g_reddit = state.graph
+    """
+
+    def __init__(
+        self,
+        max_drugs_in_post: Union[int, float] = np.inf,
+        min_edge_occurrences_to_link: int = 1,
+        min_content_length_in_characters: int = 0,
+        conditional_functions_dict: dict = None,
+        include_node_contents: bool = False,
+        include_link_contents: bool = False,
+    ):
+        """
+        Args:
+            See create_graph_reddit.
+        """
+        self.max_drugs_in_post = max_drugs_in_post
+        self.min_edge_occurrences_to_link = min_edge_occurrences_to_link
+        self.min_content_length_in_characters = min_content_length_in_characters
+        self.conditional_functions_dict = conditional_functions_dict or {}
+        self.include_node_contents = include_node_contents
+        self.include_link_contents = include_link_contents
+
+        self.graph = lf.empty_graph_reddit()
+        if include_node_contents:
+            for node in self.graph.nodes:
+                self.graph.nodes[node]["contents_total_length"] = 0
+                self.graph.nodes[node]["contents_mean_length"] = 0.0
+        self.post_ids: Set[str] = set()
+        self._edges = _TrackedEdges()
+        # Sums over the occurrences of each edge of the weights used by weigh_attributes,
+        # and of the weighted polarity and subjectivity
+        self._weight_sums: Dict[Tuple[str, str], List[float]] = {}
+
+    def ingest(
+        self, posts: Union["lf.PostTable", Mapping, Iterable[Tuple[str, Dict]]]
+    ) -> int:
+        """Add posts to the graph.
+
+        Node and edge attributes are updated in place, and edges reaching
+        min_edge_occurrences_to_link are added to the graph. Posts that were already
+        ingested are skipped.
+
+        Args:
+            posts (Union[lf.PostTable, Mapping, Iterable[Tuple[str, Dict]]]): new posts, as a
+                PostTable, a mapping from post ids to posts or (post_id, post) tuples
+
+        Returns:
+            int: number of new posts that passed the filters and were linked
+        """
+        if isinstance(posts, lf.PostTable):
+            table = posts
+            posts = ((table.ids[row], table.post(row)) for row in range(len(table)))
+        elif isinstance(posts, Mapping):
+            posts = posts.items()
+
+        target = _IngestTarget(self.graph, self._edges)
+        if self.include_node_contents:
+            previous_n_contents = {
+                node: len(contents)
+                for node, contents in self.graph.nodes(data="contents")
+            }
+        n_ingested = 0
+        for post_id, matches, polarity, subjectivity, text in lf.iter_posts_to_link(
+            posts,
+            min_content_length_in_characters=self.min_content_length_in_characters,
+            conditional_functions_dict=self.conditional_functions_dict,
+            include_text=self.include_node_contents or self.include_link_contents,
+        ):
+            if post_id in self.post_ids:
+                continue
+            self.post_ids.add(post_id)
+            lf.link_drugs(
+                G=target,
+                list_of_drugs=matches,
+                polarity=polarity,
+                subjectivity=subjectivity,
+                post_id=post_id,
+                text=text,
+                max_drugs_in_post=self.max_drugs_in_post,
+                conditional_functions_dict={},
+                include_node_contents=self.include_node_contents,
+                include_link_contents=self.include_link_contents,
+            )
+            n_ingested += 1
+
+        self._update_touched_edges()
+        if self.include_node_contents:
+            self._update_contents_lengths(previous_n_contents)
+        return n_ingested
+
+    def _update_contents_lengths(self, previous_n_contents: Dict[str, int]):
+        for node, n_contents in previous_n_contents.items():
+            data = self.graph.nodes[node]
+            if len(data["contents"]) == n_contents:
+                continue
+            data["contents_total_length"] += sum(
+                len(text) for text in data["contents"][n_contents:]
+            )
+            data["contents_mean_length"] = data["contents_total_length"] / len(
+                data["contents"]
+            )
+
+    def _update_touched_edges(self):
+        for edge, previous_count in self._edges.touched.items():
+            data = dict.__getitem__(self._edges, edge)
+
+            # Only the new occurrences are added to the sums
+            sums = self._weight_sums.setdefault(edge, [0.0, 0.0, 0.0])
+            for number_of_drugs, polarity, subjectivity in zip(
+                data["number_of_drugs_in_post"][previous_count:],
+                data["polarity"][previous_count:],
+                data["subjectivity"][previous_count:],
+            ):
+                weight = 1 / (number_of_drugs - 1)
+                sums[0] += weight
+                sums[1] += weight * polarity
+                sums[2] += weight * subjectivity
+            data["polarity_weighted"] = sums[1] / sums[0]
+            data["subjectivity_weighted"] = sums[2] / sums[0]
+
+            # Link the edges that now occur often enough
+            if data["count"] >= self.min_edge_occurrences_to_link and not (
+                self.graph.has_edge(*edge)
+            ):
+                self.graph.add_edge(*edge)
+                linked_data = self.graph.edges[edge]
+                linked_data.update(data)
+                # Further updates go directly to the attributes of the graph
+                dict.__setitem__(self._edges, edge, linked_data)
+
+        self._edges.clear_touched()
+
+    def __getstate__(self) -> Dict:
+        # Conditional functions are usually lambdas, which can't be pickled: only
+        # remember which attributes they were on. Declarative conditions are kept.
+        state = self.__dict__.copy()
+        state["conditional_functions_dict"] = {
+            attribute: condition
+            for attribute, condition in self.conditional_functions_dict.items()
+            if lf.is_declarative_condition(condition)
+        }
+        state["condition_attributes"] = sorted(
+            attribute
+            for attribute, condition in self.conditional_functions_dict.items()
+            if not lf.is_declarative_condition(condition)
+        )
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+
+    def save(self, path: Union[str, Path] = None):
+        """Save the state, e.g. to add posts to it later.
+
+        Args:
+            path (Union[str, Path], optional): file to save to. Defaults to Config.Path.reddit_graph_state.
+        """
+        path = Path(path) if path else Config.Path.reddit_graph_state
+        # Write to a temporary file first so that an interrupted save doesn't
+        # corrupt the previous state
+        temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+        with open(temp_path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path] = None, conditional_functions_dict: dict = None
+    ) -> "RedditGraphState":
+        """Load a state written by save.
+
+        Args:
+            path (Union[str, Path], optional): file to load. Defaults to Config.Path.reddit_graph_state.
+            conditional_functions_dict (dict, optional): the conditional functions that the
+                state was created with, which aren't saved (declarative conditions are
+                saved and don't need to be passed again). Defaults to None.
+
+        Raises:
+            ValueError: if the conditional functions aren't on the same attributes as the
+                ones that the state was created with
+
+        Returns:
+            RedditGraphState: the loaded state
+        """
+        path = Path(path) if path else Config.Path.reddit_graph_state
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+
+        conditional_functions_dict = conditional_functions_dict or {}
+        condition_attributes = state.__dict__.pop("condition_attributes")
+        function_attributes = sorted(
+            attribute
+            for attribute, condition in conditional_functions_dict.items()
+            if not lf.is_declarative_condition(condition)
+        )
+        if function_attributes != condition_attributes:
+            raise ValueError(
+                f"The graph state was built with conditional functions on "
+                f"{condition_attributes}: pass the same functions to load it"
+            )
+        state.conditional_functions_dict = {
+            **(state.conditional_functions_dict or {}),
+            **conditional_functions_dict,
+        }
+        return state
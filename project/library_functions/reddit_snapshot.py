@@ -0,0 +1,340 @@
+import json
+import os
+import shutil
+from collections.abc import ItemsView, Mapping, ValuesView
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Union
+
+import numpy as np
+
+try:
+    from library_functions.config import Config
+except ModuleNotFoundError:
+    from project.library_functions.config import Config
+
+SNAPSHOT_VERSION = 3
+
+# Columns stored as one .npy file each, all opened with mmap_mode="r"
+_ARRAY_NAMES = [
+    "ids",
+    "sorted_ids",
+    "sorted_rows",
+    "title_arena",
+    "title_offsets",
+    "title_lengths",
+    "content_arena",
+    "content_offsets",
+    "content_lengths",
+    "polarity",
+    "subjectivity",
+    "matches_indptr",
+    "matches_indices",
+    "extras_arena",
+    "extras_offsets",
+]
+
+# Fields of the posts stored in columns. The other fields of each post are stored
+# together as json, so that posts are read back with all the fields of the source
+_COLUMN_FIELDS = ("title", "content", "matches", "polarity", "subjectivity")
+
+
+def _build_arena(texts: List[str]):
+    """Concatenate utf-8 encoded strings into a single byte arena.
+
+    Args:
+        texts (List[str]): strings to store
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: the arena (uint8), the byte offsets
+        of each string (int64, one more than the number of strings) and the length in
+        characters of each string (int32)
+    """
+    encoded = [text.encode("utf-8", errors="surrogatepass") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e) for e in encoded], dtype=np.int64)
+    arena = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    lengths = np.array([len(text) for text in texts], dtype=np.int32)
+    return arena, offsets, lengths
+
+
+def save_reddit_snapshot(
+    reddit_data: Dict[str, Dict],
+    path: Union[str, Path] = None,
+    source: Union[str, Path] = None,
+):
+    """Write the reddit posts to a columnar snapshot that can be opened with mmap.
+
+    The snapshot is a folder of .npy files: string arenas plus offsets for titles and
+    contents, float64 arrays for polarity and subjectivity and a CSR array (indptr +
+    indices into a vocabulary) for the matched substances. Any other field of the posts
+    is kept in a json arena, with one (possibly empty) json object per post.
+
+    Args:
+        reddit_data (Dict[str, Dict]): reddit posts as returned by json.load on the raw data
+        path (Union[str, Path], optional): folder to write to. Defaults to Config.Path.reddit_snapshot.
+        source (Union[str, Path], optional): json file the data was read from. Its size and
+            modification time are recorded to detect stale snapshots. Defaults to None.
+    """
+    path = Path(path) if path else Config.Path.reddit_snapshot
+
+    post_ids = list(reddit_data.keys())
+    posts = list(reddit_data.values())
+
+    arrays = {}
+    arrays["ids"] = np.array([i.encode("utf-8") for i in post_ids], dtype=bytes)
+    arrays["sorted_rows"] = np.argsort(arrays["ids"], kind="stable")
+    arrays["sorted_ids"] = arrays["ids"][arrays["sorted_rows"]]
+
+    (
+        arrays["title_arena"],
+        arrays["title_offsets"],
+        arrays["title_lengths"],
+    ) = _build_arena([post["title"] for post in posts])
+    (
+        arrays["content_arena"],
+        arrays["content_offsets"],
+        arrays["content_lengths"],
+    ) = _build_arena([post["content"] for post in posts])
+
+    # Kept in double precision, like the values parsed from the json: the filters of
+    # create_graph_reddit then select the same posts whichever data they read
+    arrays["polarity"] = np.array(
+        [post.get("polarity", np.nan) for post in posts], dtype=np.float64
+    )
+    arrays["subjectivity"] = np.array(
+        [post.get("subjectivity", np.nan) for post in posts], dtype=np.float64
+    )
+
+    extras = [
+        {key: value for key, value in post.items() if key not in _COLUMN_FIELDS}
+        for post in posts
+    ]
+    arrays["extras_arena"], arrays["extras_offsets"], _ = _build_arena(
+        [json.dumps(extra) if extra else "" for extra in extras]
+    )
+
+    # Matches are stored in CSR form: the matches of post i are
+    # vocabulary[matches_indices[matches_indptr[i]:matches_indptr[i + 1]]]
+    vocabulary = {}
+    indices = []
+    indptr = np.zeros(len(posts) + 1, dtype=np.int64)
+    for row, post in enumerate(posts):
+        for match in post["matches"]:
+            indices.append(vocabulary.setdefault(match, len(vocabulary)))
+        indptr[row + 1] = len(indices)
+    arrays["matches_indptr"] = indptr
+    arrays["matches_indices"] = np.array(indices, dtype=np.int32)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "n_posts": len(posts),
+        "vocabulary": list(vocabulary.keys()),
+    }
+    if source:
+        stat = os.stat(source)
+        manifest["source_size"] = stat.st_size
+        manifest["source_mtime_ns"] = stat.st_mtime_ns
+
+    # Write to a temporary folder first so that concurrent readers never see a
+    # half-written snapshot
+    temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    if temp_path.exists():
+        shutil.rmtree(temp_path)
+    temp_path.mkdir(parents=True)
+    for name, array in arrays.items():
+        np.save(temp_path / f"{name}.npy", array)
+    with open(temp_path / "manifest.json", "w+") as f:
+        json.dump(manifest, f)
+
+    # Move the old snapshot aside and only delete it once the new one is in place, so
+    # that the folder is never missing for longer than a rename
+    old_path = path.with_name(f"{path.name}.old-{os.getpid()}")
+    if old_path.exists():
+        shutil.rmtree(old_path)
+    if path.exists():
+        os.replace(path, old_path)
+    os.replace(temp_path, path)
+    if old_path.exists():
+        shutil.rmtree(old_path)
+
+
+def is_reddit_snapshot_fresh(
+    path: Union[str, Path] = None, source: Union[str, Path] = None
+) -> bool:
+    """Check whether a snapshot exists and was written from the current version of the source file.
+
+    Args:
+        path (Union[str, Path], optional): snapshot folder. Defaults to Config.Path.reddit_snapshot.
+        source (Union[str, Path], optional): json file the snapshot should reflect.
+            Defaults to Config.Path.reddit_data_with_NER_and_sentiment.
+
+    Returns:
+        bool: True if the snapshot can be used. A snapshot without its source file
+        (e.g. on a deployment that only ships the snapshot) is considered fresh.
+    """
+    path = Path(path) if path else Config.Path.reddit_snapshot
+    source = Path(source) if source else Config.Path.reddit_data_with_NER_and_sentiment
+
+    try:
+        with open(path / "manifest.json", "r") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return False
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        return False
+    if not source.exists():
+        return True
+    stat = os.stat(source)
+    return (
+        manifest.get("source_size") == stat.st_size
+        and manifest.get("source_mtime_ns") == stat.st_mtime_ns
+    )
+
+
+class _SnapshotItemsView(ItemsView):
+    def __iter__(self):
+        snapshot = self._mapping
+        for row in range(len(snapshot)):
+            yield snapshot.post_id(row), snapshot.post(row)
+
+
+class _SnapshotValuesView(ValuesView):
+    def __iter__(self):
+        snapshot = self._mapping
+        for row in range(len(snapshot)):
+            yield snapshot.post(row)
+
+
+class RedditSnapshot(Mapping):
+    """Read-only mapping from post ids to posts, backed by a memory-mapped snapshot.
+
+    Behaves like the dict returned by json.load on the raw reddit data, so that
+    ``reddit_data[post_id]["title"]`` keeps working, but posts are only decoded
+    when they are accessed. Individual columns can be accessed through the
+    attributes of the same name (e.g. ``snapshot.polarity``).
+    """
+
+    def __init__(self, path: Union[str, Path] = None):
+        self.path = Path(path) if path else Config.Path.reddit_snapshot
+        with open(self.path / "manifest.json", "r") as f:
+            manifest = json.load(f)
+        if manifest["version"] != SNAPSHOT_VERSION:
+            raise RuntimeError(
+                f"Snapshot at {self.path} has version {manifest['version']}, expected {SNAPSHOT_VERSION}"
+            )
+        self.vocabulary = manifest["vocabulary"]
+        for name in _ARRAY_NAMES:
+            setattr(self, name, np.load(self.path / f"{name}.npy", mmap_mode="r"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(len(self)):
+            yield self.post_id(row)
+
+    def __getitem__(self, post_id: str) -> Mapping:
+        return self.post(self.row_of(post_id))
+
+    def __contains__(self, post_id) -> bool:
+        try:
+            self.row_of(post_id)
+        except KeyError:
+            return False
+        return True
+
+    def items(self) -> ItemsView:
+        return _SnapshotItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _SnapshotValuesView(self)
+
+    def row_of(self, post_id: str) -> int:
+        """Get the row at which a post is stored.
+
+        Args:
+            post_id (str): reddit id of the post
+
+        Raises:
+            KeyError: if the post is not part of the snapshot
+
+        Returns:
+            int: row of the post in the columns of the snapshot
+        """
+        if not isinstance(post_id, str):
+            raise KeyError(post_id)
+        key = post_id.encode("utf-8")
+        position = int(np.searchsorted(self.sorted_ids, key))
+        if position == len(self.sorted_ids) or self.sorted_ids[position] != key:
+            raise KeyError(post_id)
+        return int(self.sorted_rows[position])
+
+    def post_id(self, row: int) -> str:
+        return self.ids[row].decode("utf-8")
+
+    def title(self, row: int) -> str:
+        start, end = self.title_offsets[row], self.title_offsets[row + 1]
+        return self.title_arena[start:end].tobytes().decode("utf-8", "surrogatepass")
+
+    def content(self, row: int) -> str:
+        start, end = self.content_offsets[row], self.content_offsets[row + 1]
+        return self.content_arena[start:end].tobytes().decode("utf-8", "surrogatepass")
+
+    def matches(self, row: int) -> List[str]:
+        start, end = self.matches_indptr[row], self.matches_indptr[row + 1]
+        return [self.vocabulary[i] for i in self.matches_indices[start:end]]
+
+    def extras(self, row: int) -> Dict:
+        """Fields of a post other than title, content, matches, polarity and subjectivity."""
+        start, end = self.extras_offsets[row], self.extras_offsets[row + 1]
+        if start == end:
+            return {}
+        return json.loads(self.extras_arena[start:end].tobytes().decode("utf-8"))
+
+    def post(self, row: int) -> Mapping:
+        """Decode a single post.
+
+        Args:
+            row (int): row of the post in the snapshot
+
+        Returns:
+            Mapping: read-only dict with the same fields and values as the post in the
+            source data. Polarity and subjectivity are left out if the post has none.
+        """
+        post = {
+            "title": self.title(row),
+            "content": self.content(row),
+            "matches": self.matches(row),
+        }
+        for name in ["polarity", "subjectivity"]:
+            value = float(getattr(self, name)[row])
+            # Missing values are stored as nan
+            if value == value:
+                post[name] = value
+        post.update(self.extras(row))
+        return MappingProxyType(post)
+
+
+def open_reddit_snapshot(
+    path: Union[str, Path] = None, source: Union[str, Path] = None
+) -> RedditSnapshot:
+    """Open the reddit snapshot, (re)writing it from the json source first if it is missing or stale.
+
+    Args:
+        path (Union[str, Path], optional): snapshot folder. Defaults to Config.Path.reddit_snapshot.
+        source (Union[str, Path], optional): json file holding the reddit posts.
+            Defaults to Config.Path.reddit_data_with_NER_and_sentiment.
+
+    Returns:
+        RedditSnapshot: read-only mapping view on the snapshot
+    """
+    path = Path(path) if path else Config.Path.reddit_snapshot
+    source = Path(source) if source else Config.Path.reddit_data_with_NER_and_sentiment
+
+    if not is_reddit_snapshot_fresh(path=path, source=source):
+        with open(source) as file:
+            reddit_data = json.load(file)
+        save_reddit_snapshot(reddit_data, path=path, source=source)
+
+    return RedditSnapshot(path)
@@ -0,0 +1,24 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Tuple, Union
+
+try:
+    from library_functions.config import Config
+except ModuleNotFoundError:
+    from project.library_functions.config import Config
+
+
+def save_reddit_data_jsonl(
+    posts: Iterable[Tuple[str, Dict]], path: Union[str, Path] = None
+):
+    """Save reddit posts as json-lines, so that they can be streamed one at a time by load_data_reddit(stream=True).
+
+    Args:
+        posts (Iterable[Tuple[str, Dict]]): (post_id, post) tuples, e.g. load_data_reddit(stream=True)
+        path (Union[str, Path], optional): file to write to. Defaults to Config.Path.reddit_data_with_NER_and_sentiment_jsonl.
+    """
+    path = path if path else Config.Path.reddit_data_with_NER_and_sentiment_jsonl
+    with open(path, "w+") as f:
+        for post_id, post in posts:
+            f.write(json.dumps({"id": post_id, **post}))
+            f.write("\n")
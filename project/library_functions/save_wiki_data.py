@@ -1,6 +1,11 @@
 import json
 from typing import Dict
 
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+
 try:
     from library_functions.config import Config
 except ModuleNotFoundError:
@@ -69,3 +74,17 @@ def save_wiki_data_files(wiki_data: Dict):
     save_substance_names(wiki_data=wiki_data)
     save_contents(wiki_data=wiki_data)
     save_urls(wiki_data=wiki_data)
+
+
+def update_wiki_data_files(wiki_data: Dict, source_hash: str):
+    """Save the secondary wiki files, unless they were already written from the same version of the wikipedia data.
+
+    Args:
+        wiki_data (Dict): flat dict with all wikipedia data
+        source_hash (str): hash of the raw wikipedia data that wiki_data was built from
+    """
+    if lf.read_wiki_artifacts_hash() == source_hash:
+        return
+
+    save_wiki_data_files(wiki_data=wiki_data)
+    lf.write_wiki_artifacts_hash(source_hash)
@@ -0,0 +1,134 @@
+import itertools
+from typing import Dict, Sequence, Tuple
+
+from tqdm.auto import tqdm
+
+try:
+    import library_functions as lf
+except ModuleNotFoundError:
+    import project.library_functions as lf
+
+import networkx as nx
+import numpy as np
+
+# Parameters of create_graph_reddit that can be swept over
+sweep_parameters = [
+    "max_drugs_in_post",
+    "min_edge_occurrences_to_link",
+    "min_content_length_in_characters",
+    "conditional_functions_dict",
+]
+
+_default_parameters = {
+    "max_drugs_in_post": np.inf,
+    "min_edge_occurrences_to_link": 1,
+    "min_content_length_in_characters": 0,
+    "conditional_functions_dict": {},
+}
+
+
+def sweep_graphs_reddit(
+    parameter_grid: Dict[str, Sequence],
+    posts: "lf.PostTable" = None,
+    include_node_contents: bool = False,
+    show_progress_bars: bool = False,
+    contents_mode: str = "text",
+) -> Dict[Tuple, nx.Graph]:
+    """Build the reddit graph for every combination of parameters in a grid.
+
+    The substances matched in all posts are listed once, in an incidence matrix. Each
+    graph is then derived from the rows of the posts that pass its filters, without going
+    through the posts again. Graphs are the same as the ones built by create_graph_reddit
+    (with the sparse backend), including the per-occurrence edge attributes.
+
+    Args:
+        parameter_grid (Dict[str, Sequence]): values to try for each of the parameters of
+            create_graph_reddit in sweep_parameters. Values of "conditional_functions_dict"
+            must be given as a mapping from labels to dicts of conditions.
+            Parameters that are not in the grid keep their default value.
+        posts (lf.PostTable, optional): posts to build the graphs from. Defaults to the post
+            table of the data store.
+        include_node_contents (bool, optional): see create_graph_reddit. Defaults to False.
+        show_progress_bars (bool, optional): show a progress bar over the graphs. Defaults to False.
+        contents_mode (str, optional): see create_graph_reddit. Defaults to "text".
+
+    Raises:
+        ValueError: if the grid contains other parameters
+
+    Returns:
+        Dict[Tuple, nx.Graph]: graphs keyed by the tuple of their parameter values, in the
+        order of the keys of parameter_grid (the label for conditional functions)
+
+    Examples:
+        >>> graphs = sweep_graphs_reddit(
+        >>>     {
+        >>>         "min_edge_occurrences_to_link": [1, 2, 3],
+        >>>         "conditional_functions_dict": {
+        >>>             "all": {},
+        >>>             "happy": {"polarity": (">", 0.1)},
+        >>>         },
+        >>>     }
+        >>> )
+        >>> g_reddit_happy = graphs[(2, "happy")]
+    """
+    unknown_parameters = set(parameter_grid) - set(sweep_parameters)
+    if unknown_parameters:
+        raise ValueError(
+            f"Can only sweep over {sweep_parameters}, not {sorted(unknown_parameters)}"
+        )
+
+    if posts is None:
+        posts = lf.data_store.post_table
+
+    # One pass over all the posts: each graph uses the rows of its own posts
+    all_rows = np.arange(len(posts))
+    nodes = list(lf.empty_graph_reddit().nodes)
+    X = lf.incidence_matrix(posts, all_rows, nodes)
+
+    grid_values = [
+        list(values.keys()) if name == "conditional_functions_dict" else list(values)
+        for name, values in parameter_grid.items()
+    ]
+
+    graphs = {}
+    for key in tqdm(
+        list(itertools.product(*grid_values)), disable=not show_progress_bars
+    ):
+        parameters = dict(_default_parameters)
+        for name, value in zip(parameter_grid, key):
+            if name == "conditional_functions_dict":
+                value = parameter_grid[name][value]
+            parameters[name] = value
+
+        # Filters on the posts
+        rows = lf.select_posts(
+            posts,
+            max_drugs_in_post=parameters["max_drugs_in_post"],
+            min_content_length_in_characters=parameters[
+                "min_content_length_in_characters"
+            ],
+            conditional_functions_dict=parameters["conditional_functions_dict"],
+        )
+        graph = lf.empty_graph_reddit()
+        lf.assign_node_attributes_sparse(
+            graph,
+            post_table=posts,
+            rows=rows,
+            X=X[rows],
+            include_node_contents=include_node_contents,
+            contents_mode=contents_mode,
+        )
+
+        # Co-occurrences of the selected posts
+        store = lf.EdgeAttributeStore.from_cooccurrences(
+            posts,
+            rows=rows,
+            X=X[rows],
+            nodes=nodes,
+            min_edge_occurrences_to_link=parameters["min_edge_occurrences_to_link"],
+        )
+        lf.add_store_edges(graph, store, post_table=posts, contents_mode=contents_mode)
+
+        graphs[key] = graph
+
+    return graphs
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import pickle
+import re
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+try:
+    from library_functions.config import Config
+except ModuleNotFoundError:
+    from project.library_functions.config import Config
+
+# Hashing is only redone when the size or modification time of the file changes
+_hashes: Dict[Tuple[str, int, int], str] = {}
+
+# Errors raised when reading a truncated or corrupt cache entry (or one pickled by an
+# incompatible version of the code), which is then treated as missing
+CACHE_READ_ERRORS = (
+    OSError,
+    EOFError,
+    KeyError,
+    IndexError,
+    ValueError,
+    AttributeError,
+    ImportError,
+    zipfile.BadZipFile,
+    zlib.error,
+    pickle.UnpicklingError,
+)
+
+
+def discard_cache_entry(path: Union[str, Path]):
+    """Delete an unreadable cache entry, so that it is rebuilt.
+
+    Args:
+        path (Union[str, Path]): file of the entry
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        # Already replaced or deleted by another process
+        pass
+
+
+def get_file_hash(path: Union[str, Path]) -> str:
+    """Compute the sha256 hash of a file's contents.
+
+    Args:
+        path (Union[str, Path]): file to hash
+
+    Returns:
+        str: hex digest of the file's contents
+    """
+    stat = os.stat(path)
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _hashes:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        _hashes[key] = sha.hexdigest()
+    return _hashes[key]
+
+
+def get_wiki_source_hash() -> str:
+    """Get the hash of the raw wikipedia data, used to key all artifacts derived from it.
+
+    Returns:
+        str: hex digest of full_wiki_data.json
+    """
+    return get_file_hash(Config.Path.full_wiki_data)
+
+
+def load_cached_wiki_artifact(name: str, source_hash: str) -> Optional[object]:
+    """Load an artifact derived from the wikipedia data from the cache.
+
+    Args:
+        name (str): name of the artifact
+        source_hash (str): hash of the wikipedia data the artifact must be derived from
+
+    Returns:
+        Optional[object]: the cached artifact, or None if there is none for this hash (or
+        if it is unreadable, in which case it is deleted)
+    """
+    path = Config.Path.wiki_cache_folder / f"{name}_{source_hash}.pickle"
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except CACHE_READ_ERRORS:
+        discard_cache_entry(path)
+        return None
+
+
+def save_cached_wiki_artifact(name: str, source_hash: str, artifact: object):
+    """Save an artifact derived from the wikipedia data to the cache, replacing the ones derived from older versions of the data.
+
+    Args:
+        name (str): name of the artifact
+        source_hash (str): hash of the wikipedia data the artifact was derived from
+        artifact (object): picklable artifact
+    """
+    folder = Config.Path.wiki_cache_folder
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"{name}_{source_hash}.pickle"
+
+    # Write to a temporary file first so that concurrent readers never see a
+    # half-written artifact
+    temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(temp_path, "wb") as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+    # Only the versions of this artifact, not the ones whose name starts with its name
+    old_name = re.compile(rf"{re.escape(name)}_[0-9a-f]{{64}}\.pickle")
+    for old_path in folder.glob(f"{name}_*.pickle"):
+        if old_path != path and old_name.fullmatch(old_path.name):
+            old_path.unlink()
+
+
+def read_wiki_artifacts_hash() -> Optional[str]:
+    """Get the hash of the wikipedia data from which the files in shared_data were last written.
+
+    Returns:
+        Optional[str]: hex digest, or None if the files were never written through the cache
+    """
+    try:
+        with open(Config.Path.wiki_artifacts_hash, "r") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def write_wiki_artifacts_hash(source_hash: str):
+    Config.Path.wiki_cache_folder.mkdir(parents=True, exist_ok=True)
+    with open(Config.Path.wiki_artifacts_hash, "w+") as f:
+        f.write(source_hash)
@@ -0,0 +1,99 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Iterator, Tuple
+
+
+class WikiCorpus(Mapping):
+    """Read-only wikipedia data, indexed by page name.
+
+    Behaves like the dict of parallel lists returned by load_data_wiki, so that
+    ``corpus["name"][row]`` keeps working, but each property is stored once as a
+    tuple that is shared (not copied) by everyone reading it. Pages can also be
+    looked up by name in constant time through the name -> row index.
+    """
+
+    def __init__(self, wiki_data: Mapping):
+        """
+        Args:
+            wiki_data (Mapping): dict mapping each property (name, categories, content,
+                links, synonyms, url) to a list with one value per page, as returned
+                by load_data_wiki
+        """
+        self._columns: Dict[str, Tuple] = {
+            prop: tuple(values) for prop, values in wiki_data.items()
+        }
+        self.index: Mapping = MappingProxyType(
+            {name: row for row, name in enumerate(self._columns["name"])}
+        )
+        self._by_name: Dict[str, Mapping] = {}
+
+    def __getitem__(self, prop: str) -> Tuple:
+        return self._columns[prop]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    @property
+    def names(self) -> Tuple[str]:
+        return self._columns["name"]
+
+    @property
+    def n_pages(self) -> int:
+        return len(self.names)
+
+    def column(self, prop: str) -> Tuple:
+        """Get the values of a property for all pages, in page order."""
+        return self._columns[prop]
+
+    def has_page(self, name: str) -> bool:
+        return name in self.index
+
+    def row_of(self, name: str) -> int:
+        """Get the row of a page.
+
+        Args:
+            name (str): name of the page (not a synonym)
+
+        Raises:
+            KeyError: if there is no page with this name
+
+        Returns:
+            int: row of the page in the columns
+        """
+        return self.index[name]
+
+    def value(self, name: str, prop: str):
+        """Get the value of a property for the page with the given name."""
+        return self._columns[prop][self.index[name]]
+
+    def page(self, name: str) -> Mapping:
+        """Get all the properties of the page with the given name.
+
+        Args:
+            name (str): name of the page (not a synonym)
+
+        Returns:
+            Mapping: read-only dict mapping each property to its value for that page
+        """
+        row = self.index[name]
+        return MappingProxyType(
+            {prop: values[row] for prop, values in self._columns.items()}
+        )
+
+    def by_name(self, prop: str) -> Mapping:
+        """Get a mapping from page names to the value of a property, built once per property.
+
+        Args:
+            prop (str): property, e.g. "categories"
+
+        Returns:
+            Mapping: read-only dict mapping each page name to its value
+        """
+        if prop not in self._by_name:
+            self._by_name[prop] = MappingProxyType(
+                dict(zip(self._columns["name"], self._columns[prop]))
+            )
+        return self._by_name[prop]
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+import project.library_functions as lf
+
+substances = [f"substance-{i:02}" for i in range(30)]
+
+# Sentiment values at, and right next to, the threshold of the "happy" network
+_polarities = [0.1, 0.1000000001, 0.0999999999, 0.2, 0.05, 0.0, -0.3]
+
+
+def make_posts(n_posts: int = 400, seed: int = 0) -> dict:
+    """Reddit posts in the format of the raw json data, with random matches."""
+    rng = random.Random(seed)
+    posts = {}
+    for i in range(n_posts):
+        n_matches = rng.choice([0, 1, 2, 2, 3, 3, 4, 6])
+        posts[f"post{i:04}"] = {
+            "title": f"title {i}",
+            "content": "x" * rng.randint(0, 60),
+            # Substances can be matched several times in a post
+            "matches": [rng.choice(substances) for _ in range(n_matches)],
+            "polarity": rng.choice(_polarities + [rng.uniform(-1, 1)]),
+            "subjectivity": rng.uniform(0, 1),
+        }
+    return posts
+
+
+@pytest.fixture
+def reddit_posts() -> dict:
+    return make_posts()
+
+
+@pytest.fixture
+def toy_data_store(monkeypatch):
+    """Data store holding a small wikipedia corpus with the substances as pages."""
+    monkeypatch.setattr(lf.data_store, "_datasets", {})
+    lf.data_store._datasets["wiki_data"] = lf.WikiCorpus(
+        {
+            "name": substances,
+            "categories": [[f"category-{i % 3}"] for i in range(len(substances))],
+        }
+    )
+    lf.data_store._datasets["substance_names"] = tuple(substances)
+    return lf.data_store
+
+
+def _plain(value):
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, lf.PostContents):
+        return list(value)
+    return value
+
+
+def assert_same_graph(graph, expected):
+    """Check that two graphs have the same nodes (in the same order) and edges, with the
+    same attributes (up to rounding for floats, and to the type of per-occurrence lists).
+    """
+    assert list(graph.nodes) == list(expected.nodes)
+    assert {frozenset(edge) for edge in graph.edges} == {
+        frozenset(edge) for edge in expected.edges
+    }
+    items = list(zip(graph.nodes.values(), expected.nodes.values()))
+    items += [(graph.edges[edge], expected.edges[edge]) for edge in expected.edges]
+    for data, expected_data in items:
+        assert sorted(data) == sorted(expected_data)
+        for name, value in expected_data.items():
+            assert _plain(data[name]) == pytest.approx(_plain(value), rel=1e-12)
@@ -0,0 +1,34 @@
+import pytest
+
+from utils import bundle
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    path = tmp_path / "layout.json"
+    path.write_text("{}")
+    monkeypatch.setattr(bundle, "_bundle_sources", [path])
+    return path
+
+
+def test_bundle_gives_the_saved_objects(tmp_path, source):
+    bundle.save_bundle({"a": [1, 2], "b": "b"}, path=tmp_path / "bundle")
+    loaded = bundle.load_bundle(tmp_path / "bundle")
+    assert dict(loaded) == {"a": [1, 2], "b": "b"}
+
+
+def test_bundle_is_outdated_when_a_source_changes(tmp_path, source):
+    bundle.save_bundle({"a": 1}, path=tmp_path / "bundle")
+    source.write_text('{"node": [0, 0]}')
+    assert bundle.load_bundle(tmp_path / "bundle") is None
+
+
+def test_replaced_bundle_is_not_read(tmp_path, source):
+    bundle.save_bundle({"a": "old", "b": "old"}, path=tmp_path / "bundle")
+    loaded = bundle.load_bundle(tmp_path / "bundle")
+    assert loaded["a"] == "old"
+
+    bundle.save_bundle({"a": "new", "b": "new"}, path=tmp_path / "bundle")
+    with pytest.raises(bundle.StaleBundleError):
+        loaded["b"]
+    assert dict(bundle.load_bundle(tmp_path / "bundle")) == {"a": "new", "b": "new"}
@@ -0,0 +1,117 @@
+from collections import Counter
+
+import community
+import networkx as nx
+import pytest
+
+import project.library_functions as lf
+
+
+def make_graphs():
+    reddit_graph = nx.relabel_nodes(
+        nx.watts_strogatz_graph(200, 4, 0.05, seed=0), lambda node: f"n{node}"
+    )
+    for i, (u, v) in enumerate(reddit_graph.edges):
+        reddit_graph.edges[u, v]["count"] = i % 4 + 1
+    # A small component, whose community is smaller than others_threshold
+    reddit_graph.add_edge("pair-0", "pair-1", count=1)
+    # Only some of the nodes are in both graphs
+    wiki_graph = nx.relabel_nodes(
+        nx.barabasi_albert_graph(200, 2, seed=0), lambda node: f"n{node + 100}"
+    )
+    wiki_graph.add_edge("n250", "single")
+    return reddit_graph, wiki_graph
+
+
+def _set_levels(graph, node, dendrogram, attribute_prefix, others_threshold):
+    # Same loop as assign_louvain_communities before the levels were computed once
+    for level in range(len(dendrogram) - 1):
+        actual_level = len(dendrogram) - 2 - level
+        partition = community.partition_at_level(dendrogram, level)
+        try:
+            node_community = partition[node]
+            counts = Counter(partition.values())
+            if counts[node_community] < others_threshold:
+                node_community = -1
+            graph.nodes[node][
+                f"{attribute_prefix}_L{actual_level}"
+            ] = f"L{actual_level}-{node_community:03}"
+        except KeyError:
+            graph.nodes[node][f"{attribute_prefix}_L{level}"] = f"L{level}-NONE"
+
+
+def baseline_assign_louvain_communities(
+    reddit_graph, wiki_graph, reddit_dendrogram, wiki_dendrogram, others_threshold, res
+):
+    reddit_prefix = f"louvain_community_reddit_R{res:.2f}"
+    for node in reddit_graph:
+        _set_levels(
+            reddit_graph, node, reddit_dendrogram, reddit_prefix, others_threshold
+        )
+        if wiki_graph:
+            _set_levels(
+                reddit_graph,
+                node,
+                wiki_dendrogram,
+                "louvain_community_wiki",
+                others_threshold,
+            )
+    if wiki_graph:
+        for node in wiki_graph:
+            _set_levels(
+                wiki_graph,
+                node,
+                wiki_dendrogram,
+                "louvain_community_wiki",
+                others_threshold,
+            )
+            _set_levels(
+                wiki_graph, node, reddit_dendrogram, reddit_prefix, others_threshold
+            )
+
+
+def assert_same_attributes(graph, expected):
+    # Attributes are also set in the same order
+    assert [list(data.items()) for data in graph.nodes.values()] == [
+        list(data.items()) for data in expected.nodes.values()
+    ]
+
+
+@pytest.mark.parametrize("with_wiki", [False, True])
+@pytest.mark.parametrize("others_threshold", [1, 3])
+def test_assign_louvain_communities_gives_the_baseline_attributes(
+    with_wiki, others_threshold
+):
+    reddit_graph, wiki_graph = make_graphs()
+    reddit_dendrogram = community.generate_dendrogram(
+        reddit_graph, weight="count", resolution=1.0, random_state=0
+    )
+    wiki_dendrogram = community.generate_dendrogram(wiki_graph, random_state=0)
+    assert len(reddit_dendrogram) > 2 and len(wiki_dendrogram) > 2
+    if not with_wiki:
+        wiki_graph = wiki_dendrogram = None
+
+    expected_reddit, expected_wiki = (
+        reddit_graph.copy(),
+        wiki_graph and wiki_graph.copy(),
+    )
+    baseline_assign_louvain_communities(
+        expected_reddit,
+        expected_wiki,
+        reddit_dendrogram,
+        wiki_dendrogram,
+        others_threshold,
+        1.0,
+    )
+    lf.assign_louvain_communities(
+        reddit_graph,
+        wiki_graph,
+        others_threshold=others_threshold,
+        louvain_resolution_reddit=1.0,
+        reddit_dendrogram=reddit_dendrogram,
+        wiki_dendrogram=wiki_dendrogram,
+    )
+
+    assert_same_attributes(reddit_graph, expected_reddit)
+    if with_wiki:
+        assert_same_attributes(wiki_graph, expected_wiki)
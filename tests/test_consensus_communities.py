@@ -0,0 +1,42 @@
+import networkx as nx
+
+import project.library_functions as lf
+
+
+def make_graph():
+    """Two cliques joined by a single edge, and a node on its own."""
+    graph = nx.Graph()
+    cliques = [[f"a{i}" for i in range(5)], [f"b{i}" for i in range(5)]]
+    for clique in cliques:
+        graph.add_edges_from(nx.complete_graph(clique).edges, weight=3)
+    graph.add_edge("a0", "b0", weight=1)
+    graph.add_node("alone")
+    return graph, cliques
+
+
+def test_consensus_communities_are_the_cliques():
+    graph, (clique_a, clique_b) = make_graph()
+    partition = lf.assign_consensus_communities(graph, n_runs=20, n_workers=1)
+
+    assert list(partition) == list(graph.nodes)
+    assert {partition[node] for node in clique_a} == {0}
+    assert {partition[node] for node in clique_b} == {1}
+    # Communities smaller than others_threshold
+    assert partition["alone"] == -1
+    assert graph.nodes["a3"]["louvain_consensus_community_R1.00"] == "C-000"
+    assert graph.nodes["b3"]["louvain_consensus_community_R1.00"] == "C-001"
+    assert graph.nodes["alone"]["louvain_consensus_community_R1.00"] == "C--01"
+
+
+def test_co_association_does_not_depend_on_the_workers():
+    graph, (clique_a, _) = make_graph()
+    co_association = lf.louvain_co_association(graph, n_runs=20, n_workers=1)
+    assert (co_association != co_association.T).nnz == 0
+    # Only linked nodes have a co-association
+    assert co_association.nnz == 2 * graph.number_of_edges()
+    index = {node: i for i, node in enumerate(graph.nodes)}
+    assert co_association[index["a1"], index["a2"]] == 1
+    assert co_association[index["a0"], index["b0"]] == 0
+
+    parallel = lf.louvain_co_association(graph, n_runs=20, n_workers=2, runs_per_task=3)
+    assert (parallel != co_association).nnz == 0
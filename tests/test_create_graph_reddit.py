@@ -0,0 +1,113 @@
+import numpy as np
+
+import project.library_functions as lf
+from project.library_functions.create_graph_reddit import link_drugs_parallel
+from tests.conftest import assert_same_graph
+
+happy_conditions = [
+    {},
+    {"polarity": lambda x: x > 0.1},
+    {"polarity": (">", 0.1)},
+    {"polarity": ("between", 0.1, 0.2), "subjectivity": ("<", 0.5)},
+]
+
+
+def test_snapshot_table_gives_the_graphs_of_the_posts(
+    toy_data_store, reddit_posts, tmp_path
+):
+    lf.save_reddit_snapshot(reddit_posts, path=tmp_path / "snapshot")
+    snapshot = lf.RedditSnapshot(tmp_path / "snapshot")
+    post_table = lf.PostTable.from_snapshot(snapshot)
+
+    for conditions in happy_conditions:
+        expected = lf.create_graph_reddit(
+            posts=reddit_posts,
+            conditional_functions_dict=conditions,
+            include_node_contents=True,
+            backend="python",
+        )
+        for backend in ["python", "sparse"]:
+            graph = lf.create_graph_reddit(
+                posts=post_table,
+                conditional_functions_dict=conditions,
+                include_node_contents=True,
+                backend=backend,
+            )
+            assert_same_graph(graph, expected)
+
+
+def test_sparse_backend_gives_the_graphs_of_the_python_backend(
+    toy_data_store, reddit_posts
+):
+    post_table = lf.PostTable.from_posts(reddit_posts)
+    for arguments in [
+        {},
+        {"max_drugs_in_post": 3, "min_edge_occurrences_to_link": 2},
+        {"min_content_length_in_characters": 30, "include_link_contents": True},
+        {
+            "conditional_functions_dict": {"polarity": lambda x: x > 0.1},
+            "include_node_contents": True,
+            "include_link_contents": True,
+        },
+    ]:
+        expected = lf.create_graph_reddit(
+            posts=reddit_posts, backend="python", **arguments
+        )
+        for contents_mode in ["text", "rows"]:
+            graph = lf.create_graph_reddit(
+                posts=post_table,
+                backend="sparse",
+                contents_mode=contents_mode,
+                **arguments,
+            )
+            assert_same_graph(graph, expected)
+
+
+def test_sharded_build_gives_the_graph_of_a_single_process(
+    toy_data_store, reddit_posts
+):
+    arguments = dict(
+        posts=reddit_posts,
+        backend="python",
+        max_drugs_in_post=4,
+        min_edge_occurrences_to_link=2,
+        include_node_contents=True,
+        include_link_contents=True,
+    )
+    expected = lf.create_graph_reddit(n_workers=1, **arguments)
+    graph = lf.create_graph_reddit(n_workers=3, **arguments)
+    assert_same_graph(graph, expected)
+    # Shards are merged in the order of the posts
+    assert list(graph.edges) == list(expected.edges)
+
+
+def test_shards_are_merged_in_the_order_of_the_posts(toy_data_store, reddit_posts):
+    def posts_to_link():
+        return lf.iter_posts_to_link(reddit_posts.items(), include_text=True)
+
+    expected = lf.empty_graph_reddit()
+    for post_id, matches, polarity, subjectivity, text in posts_to_link():
+        lf.link_drugs(
+            G=expected,
+            list_of_drugs=matches,
+            polarity=polarity,
+            subjectivity=subjectivity,
+            post_id=post_id,
+            text=text,
+            max_drugs_in_post=np.inf,
+            conditional_functions_dict={},
+            include_node_contents=True,
+            include_link_contents=True,
+        )
+
+    graph = lf.empty_graph_reddit()
+    link_drugs_parallel(
+        G=graph,
+        posts_to_link=posts_to_link(),
+        n_workers=3,
+        include_node_contents=True,
+        include_link_contents=True,
+        shard_size=37,
+    )
+    assert_same_graph(graph, expected)
+    assert list(graph.edges) == list(expected.edges)
@@ -0,0 +1,83 @@
+import networkx as nx
+import pytest
+
+import project.library_functions as lf
+
+
+def make_graph(directed: bool) -> nx.Graph:
+    graph = nx.gnp_random_graph(25, 0.2, seed=1, directed=directed)
+    graph = nx.relabel_nodes(graph, {node: f"n{node}" for node in graph})
+    graph.add_node("isolated", count=0)
+    for i, node in enumerate(graph):
+        if i % 4:
+            graph.nodes[node]["count"] = i
+        graph.nodes[node]["name"] = node.upper()
+    for i, (u, v) in enumerate(graph.edges):
+        graph.edges[u, v]["count"] = i % 5 + 1
+        if i % 3 == 0:
+            graph.edges[u, v]["polarity"] = [i / 10, -i / 10]
+    graph.graph["name"] = "test"
+    return graph
+
+
+def assert_same_views(frozen, graph):
+    assert list(frozen) == list(graph)
+    assert list(frozen.nodes) == list(graph.nodes)
+    assert [(node, dict(data)) for node, data in frozen.nodes(data=True)] == list(
+        graph.nodes(data=True)
+    )
+    assert list(frozen.nodes(data="count", default=-1)) == list(
+        graph.nodes(data="count", default=-1)
+    )
+    assert list(frozen.edges) == list(graph.edges)
+    assert [(u, v, dict(data)) for u, v, data in frozen.edges(data=True)] == list(
+        graph.edges(data=True)
+    )
+    assert list(frozen.edges(data="count")) == list(graph.edges(data="count"))
+    assert list(frozen.edges(["n1", "n2"], data="polarity")) == list(
+        graph.edges(["n1", "n2"], data="polarity")
+    )
+    assert list(frozen.degree) == list(graph.degree)
+    assert list(frozen.degree(weight="count")) == list(graph.degree(weight="count"))
+    assert frozen.degree("n2") == graph.degree("n2")
+    assert frozen.number_of_nodes() == graph.number_of_nodes()
+    assert frozen.number_of_edges() == graph.number_of_edges()
+    assert frozen.size(weight="count") == graph.size(weight="count")
+    for node in graph:
+        assert list(frozen.neighbors(node)) == list(graph.neighbors(node))
+        assert dict(frozen.degree([node])) == dict(graph.degree([node]))
+    for u, v in graph.edges:
+        assert frozen.has_edge(u, v)
+        assert dict(frozen.edges[u, v]) == graph.edges[u, v]
+        assert dict(frozen[u][v]) == graph[u][v]
+    assert frozen.graph == graph.graph
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_frozen_graph_reads_like_networkx(directed):
+    graph = make_graph(directed)
+    frozen = lf.FrozenGraph.from_networkx(graph)
+    assert frozen.is_directed() == graph.is_directed()
+    assert_same_views(frozen, graph)
+    if directed:
+        assert list(frozen.in_degree) == list(graph.in_degree)
+        assert list(frozen.out_degree) == list(graph.out_degree)
+        for node in graph:
+            assert list(frozen.predecessors(node)) == list(graph.predecessors(node))
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_subgraph_reads_like_networkx(directed):
+    graph = make_graph(directed)
+    nodes = [f"n{i}" for i in range(0, 25, 2)] + ["isolated"]
+    frozen = lf.FrozenGraph.from_networkx(graph).subgraph(nodes)
+    # networkx subgraphs keep the order of the nodes of the graph
+    assert_same_views(frozen, graph.subgraph(nodes).copy())
+
+
+def test_to_networkx_gives_back_the_graph():
+    graph = make_graph(False)
+    copy = lf.FrozenGraph.from_networkx(graph).to_networkx()
+    assert list(copy.nodes(data=True)) == list(graph.nodes(data=True))
+    assert list(copy.edges(data=True)) == list(graph.edges(data=True))
+    assert copy.graph == graph.graph
@@ -0,0 +1,79 @@
+import networkx as nx
+import pytest
+
+import project.library_functions as lf
+from project.library_functions import infomap_communities
+from project.library_functions.config import Config
+
+
+@pytest.fixture
+def cache_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config.Path, "infomap_cache_folder", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def infomap_runs(monkeypatch):
+    """Number of times infomap is run."""
+    runs = []
+    run_infomap = infomap_communities._run_infomap
+
+    def counted_run_infomap(*args):
+        runs.append(args[1:])
+        return run_infomap(*args)
+
+    monkeypatch.setattr(infomap_communities, "_run_infomap", counted_run_infomap)
+    return runs
+
+
+def make_graph():
+    graph = nx.relabel_nodes(nx.karate_club_graph(), lambda node: f"n{node}")
+    for i, (u, v) in enumerate(graph.edges):
+        graph.edges[u, v]["count"] = i % 4 + 1
+    return graph
+
+
+def test_modules_are_computed_once(cache_folder, infomap_runs):
+    graph = make_graph()
+    module_paths = lf.run_infomap(graph, weight="count", trials=2)
+    assert list(module_paths) == list(graph.nodes)
+    assert len(list(cache_folder.glob("*.pickle"))) == 1
+
+    assert lf.run_infomap(graph, weight="count", trials=2) == module_paths
+    assert infomap_runs == [("count", 2)]
+
+    lf.run_infomap(graph, weight="count", trials=3)
+    lf.run_infomap(graph, trials=2)
+    graph.edges["n0", "n1"]["count"] += 1
+    lf.run_infomap(graph, weight="count", trials=2)
+    assert len(infomap_runs) == 4
+    assert len(list(cache_folder.glob("*.pickle"))) == 4
+
+
+def test_modules_are_not_cached_without_use_cache(cache_folder, infomap_runs):
+    graph = make_graph()
+    lf.run_infomap(graph, trials=2, use_cache=False)
+    lf.run_infomap(graph, trials=2, use_cache=False)
+    assert len(infomap_runs) == 2
+    assert list(cache_folder.glob("*.pickle")) == []
+
+
+def test_corrupt_entry_is_computed_again(cache_folder, infomap_runs):
+    graph = make_graph()
+    module_paths = lf.run_infomap(graph, trials=2)
+    (path,) = cache_folder.glob("*.pickle")
+    path.write_bytes(b"not modules")
+
+    assert lf.run_infomap(graph, trials=2) == module_paths
+    assert lf.run_infomap(graph, trials=2) == module_paths
+    assert len(infomap_runs) == 2
+
+
+def test_modules_are_assigned_to_the_nodes(cache_folder):
+    graph = make_graph()
+    module_paths = lf.assign_infomap_communities(graph, weight="count", trials=2)
+    for node, module_path in module_paths.items():
+        for level, module in enumerate(module_path):
+            assert graph.nodes[node][f"infomap_community_L{level}"] == (
+                f"L{level}-{module:03}"
+            )
@@ -0,0 +1,123 @@
+import networkx as nx
+import pytest
+
+import project.library_functions as lf
+from project.library_functions import louvain_dendrograms
+from project.library_functions.config import Config
+
+
+@pytest.fixture
+def cache_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config.Path, "louvain_dendrogram_cache_folder", tmp_path)
+    monkeypatch.setattr(Config.Path, "shared_data_folder", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def louvain_runs(monkeypatch):
+    """(resolution, seed) of every louvain run computed."""
+    runs = []
+    generate_dendrogram = louvain_dendrograms.community.generate_dendrogram
+
+    def counted_generate_dendrogram(graph, resolution, random_state, **kwargs):
+        runs.append((resolution, random_state))
+        return generate_dendrogram(
+            graph, resolution=resolution, random_state=random_state, **kwargs
+        )
+
+    monkeypatch.setattr(
+        louvain_dendrograms.community,
+        "generate_dendrogram",
+        counted_generate_dendrogram,
+    )
+    return runs
+
+
+def make_graph():
+    graph = nx.relabel_nodes(nx.karate_club_graph(), lambda node: f"n{node}")
+    for i, (u, v) in enumerate(graph.edges):
+        graph.edges[u, v]["count"] = i % 4 + 1
+    return graph
+
+
+def run(graph, seeds=(0, 1)):
+    return lf.run_louvain_dendrograms(
+        graph, resolutions=[0.5, 1.0], seeds=seeds, weight="count", n_workers=1
+    )
+
+
+def test_seeded_runs_are_computed_once(cache_folder, louvain_runs):
+    graph = make_graph()
+    dendrograms = run(graph)
+    assert sorted(louvain_runs) == [(0.5, 0), (0.5, 1), (1.0, 0), (1.0, 1)]
+    assert len(list(cache_folder.glob("*.pickle"))) == 4
+
+    louvain_runs.clear()
+    assert run(graph) == dendrograms
+    assert louvain_runs == []
+
+
+def test_changed_graph_is_computed_again(cache_folder, louvain_runs):
+    graph = make_graph()
+    run(graph)
+    louvain_runs.clear()
+
+    graph.edges["n0", "n1"]["count"] += 1
+    run(graph)
+    assert len(louvain_runs) == 4
+    # Weights that aren't used don't change the graph
+    louvain_runs.clear()
+    nx.set_edge_attributes(graph, 1, "weight")
+    run(graph)
+    assert louvain_runs == []
+
+    graph.add_edge("n0", "n33", count=1)
+    run(graph)
+    assert len(louvain_runs) == 4
+
+
+def test_unseeded_runs_are_not_cached(cache_folder, louvain_runs):
+    graph = make_graph()
+    run(graph, seeds=[None])
+    run(graph, seeds=[None])
+    assert louvain_runs == [(0.5, None), (1.0, None)] * 2
+    assert list(cache_folder.glob("*.pickle")) == []
+
+
+def test_corrupt_entry_is_computed_again(cache_folder, louvain_runs):
+    graph = make_graph()
+    dendrograms = run(graph, seeds=[0])
+    path = lf.get_dendrogram_cache_path(
+        lf.get_graph_fingerprint(graph, "count"), "count", 0.5, 0
+    )
+    path.write_bytes(b"not a dendrogram")
+    louvain_runs.clear()
+
+    assert run(graph, seeds=[0]) == dendrograms
+    assert louvain_runs == [(0.5, 0)]
+    assert run(graph, seeds=[0]) == dendrograms
+    assert louvain_runs == [(0.5, 0)]
+
+
+def test_saved_dendrograms_are_loaded_for_the_same_graph(cache_folder, louvain_runs):
+    graph = make_graph()
+    dendrograms = lf.get_louvain_dendrograms(
+        graph, [0.5, 1.0], seed=0, weight="count", saved="louvain.json"
+    )
+    assert (cache_folder / "louvain.json").exists()
+    # The saved dendrograms are used even without the dendrogram cache
+    for path in cache_folder.glob("*.pickle"):
+        path.unlink()
+    louvain_runs.clear()
+
+    loaded = lf.get_louvain_dendrograms(
+        graph, [1.0, 0.5], seed=0, weight="count", saved="louvain.json"
+    )
+    assert louvain_runs == []
+    assert loaded == {1.0: dendrograms[1.0], 0.5: dendrograms[0.5]}
+
+    graph.edges["n0", "n1"]["count"] += 1
+    lf.get_louvain_dendrograms(
+        graph, [0.5, 1.0], seed=0, weight="count", saved="louvain.json"
+    )
+    assert len(louvain_runs) == 2
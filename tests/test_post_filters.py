@@ -0,0 +1,83 @@
+import pytest
+
+import project.library_functions as lf
+
+# Polarity exactly at the threshold of the "happy" network, right next to it and on
+# both sides of it
+posts = {
+    post_id: {
+        "title": post_id,
+        "content": "x",
+        "matches": ["caffeine"],
+        "polarity": polarity,
+        "subjectivity": 0.5,
+    }
+    for post_id, polarity in [
+        ("at", 0.1),
+        ("above", 0.2),
+        ("below", 0.05),
+        ("just_above", 0.1000000001),
+        ("just_below", 0.0999999999),
+    ]
+}
+
+
+@pytest.fixture(params=["posts", "snapshot"])
+def post_table(request, tmp_path, monkeypatch):
+    """Table built from the posts, or the post table of the data store, read from a
+    snapshot of the posts."""
+    if request.param == "posts":
+        return lf.PostTable.from_posts(posts)
+    lf.save_reddit_snapshot(posts, path=tmp_path / "snapshot")
+    monkeypatch.setattr(lf.data_store, "_datasets", {})
+    lf.data_store._datasets["reddit_data"] = lf.RedditSnapshot(tmp_path / "snapshot")
+    return lf.data_store.post_table
+
+
+def selected_ids(post_table, conditional_functions_dict):
+    rows = lf.select_posts(
+        post_table, conditional_functions_dict=conditional_functions_dict
+    )
+    return [post_table.ids[row] for row in rows]
+
+
+def test_function_condition_at_threshold(post_table):
+    assert selected_ids(post_table, {"polarity": lambda x: x > 0.1}) == [
+        "above",
+        "just_above",
+    ]
+    assert selected_ids(post_table, {"polarity": lambda x: x >= 0.1}) == [
+        "at",
+        "above",
+        "just_above",
+    ]
+
+
+def test_declarative_condition_at_threshold(post_table):
+    assert selected_ids(post_table, {"polarity": (">", 0.1)}) == [
+        "above",
+        "just_above",
+    ]
+    assert selected_ids(post_table, {"polarity": ("<=", 0.1)}) == [
+        "at",
+        "below",
+        "just_below",
+    ]
+    assert selected_ids(post_table, {"polarity": ("==", 0.1)}) == ["at"]
+    assert selected_ids(post_table, {"polarity": ("between", 0.1, 0.2)}) == [
+        "at",
+        "above",
+        "just_above",
+    ]
+
+
+def test_declarative_and_function_conditions_agree(post_table):
+    for operator_name, function in [
+        (">", lambda x: x > 0.1),
+        (">=", lambda x: x >= 0.1),
+        ("<", lambda x: x < 0.1),
+        ("!=", lambda x: x != 0.1),
+    ]:
+        assert selected_ids(post_table, {"polarity": (operator_name, 0.1)}) == (
+            selected_ids(post_table, {"polarity": function})
+        )
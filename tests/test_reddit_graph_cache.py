@@ -0,0 +1,41 @@
+import networkx as nx
+import pytest
+
+import project.library_functions as lf
+from project.library_functions.config import Config
+
+arguments = {"min_edge_occurrences_to_link": 1}
+source_hash = "0" * 64
+
+
+@pytest.fixture
+def cache_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config.Path, "reddit_graph_cache_folder", tmp_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize("cache_format", ["npz", "pickle"])
+def test_missing_entry(cache_folder, cache_format):
+    assert lf.load_cached_reddit_graph(arguments, source_hash, cache_format) is None
+
+
+@pytest.mark.parametrize("cache_format", ["npz", "pickle"])
+def test_truncated_entry_is_discarded(cache_folder, cache_format):
+    graph = nx.Graph()
+    graph.add_edge("caffeine", "l-theanine", count=3)
+    lf.save_cached_reddit_graph(graph, arguments, source_hash, cache_format)
+    path = lf.get_reddit_graph_cache_path(arguments, source_hash, cache_format)
+    loaded = lf.load_cached_reddit_graph(arguments, source_hash, cache_format)
+    assert list(loaded.edges(data=True)) == list(graph.edges(data=True))
+
+    path.write_bytes(path.read_bytes()[: path.stat().st_size // 2])
+    assert lf.load_cached_reddit_graph(arguments, source_hash, cache_format) is None
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("cache_format", ["npz", "pickle"])
+def test_corrupt_entry_is_discarded(cache_folder, cache_format):
+    path = lf.get_reddit_graph_cache_path(arguments, source_hash, cache_format)
+    path.write_bytes(b"not a graph")
+    assert lf.load_cached_reddit_graph(arguments, source_hash, cache_format) is None
+    assert not path.exists()
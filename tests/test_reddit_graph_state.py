@@ -0,0 +1,44 @@
+import itertools
+
+import project.library_functions as lf
+from tests.conftest import assert_same_graph
+
+arguments = dict(
+    max_drugs_in_post=4,
+    min_edge_occurrences_to_link=2,
+    min_content_length_in_characters=10,
+    conditional_functions_dict={"polarity": (">", 0.1)},
+    include_node_contents=True,
+    include_link_contents=True,
+)
+
+
+def chunk(posts, start, end):
+    return dict(itertools.islice(posts.items(), start, end))
+
+
+def test_ingested_chunks_give_the_rebuilt_graph(toy_data_store, reddit_posts):
+    expected = lf.create_graph_reddit(posts=reddit_posts, backend="python", **arguments)
+    assert expected.number_of_edges() > 0
+
+    state = lf.RedditGraphState(**arguments)
+    # Overlapping chunks: posts that were already ingested are skipped
+    assert state.ingest(chunk(reddit_posts, 0, 150)) > 0
+    state.ingest(lf.PostTable.from_posts(chunk(reddit_posts, 100, 300)))
+    state.ingest(chunk(reddit_posts, 250, 400).items())
+    assert state.ingest(chunk(reddit_posts, 0, 400)) == 0
+
+    assert_same_graph(state.graph, expected)
+
+
+def test_saved_state_can_be_loaded_and_extended(toy_data_store, reddit_posts, tmp_path):
+    expected = lf.create_graph_reddit(posts=reddit_posts, backend="python", **arguments)
+
+    state = lf.RedditGraphState(**arguments)
+    state.ingest(chunk(reddit_posts, 0, 200))
+    state.save(tmp_path / "state.pickle")
+
+    loaded = lf.RedditGraphState.load(tmp_path / "state.pickle")
+    assert_same_graph(loaded.graph, state.graph)
+    loaded.ingest(chunk(reddit_posts, 200, 400))
+    assert_same_graph(loaded.graph, expected)
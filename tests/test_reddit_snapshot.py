@@ -0,0 +1,40 @@
+import json
+
+import project.library_functions as lf
+from project.library_functions.config import Config
+
+
+def with_other_fields(posts):
+    posts = {post_id: dict(post) for post_id, post in posts.items()}
+    for i, post in enumerate(posts.values()):
+        if i % 3 == 0:
+            post["score"] = i
+        if i % 5 == 0:
+            post["author"] = {"name": f"user{i}", "karma": i / 7}
+    del next(iter(posts.values()))["subjectivity"]
+    return posts
+
+
+def test_snapshot_posts_are_the_source_posts(reddit_posts, tmp_path):
+    posts = with_other_fields(reddit_posts)
+    lf.save_reddit_snapshot(posts, path=tmp_path / "snapshot")
+    snapshot = lf.RedditSnapshot(tmp_path / "snapshot")
+
+    assert list(snapshot) == list(posts)
+    for post_id, post in posts.items():
+        assert dict(snapshot[post_id]) == post
+    assert [dict(post) for post in snapshot.values()] == list(posts.values())
+
+
+def test_load_data_reddit_reads_the_snapshot(reddit_posts, tmp_path, monkeypatch):
+    posts = with_other_fields(reddit_posts)
+    source = tmp_path / "reddit_data.json"
+    with open(source, "w") as f:
+        json.dump(posts, f)
+    monkeypatch.setattr(Config.Path, "reddit_data_with_NER_and_sentiment", source)
+    monkeypatch.setattr(Config.Path, "reddit_snapshot", tmp_path / "snapshot")
+
+    reddit_data = lf.load_data_reddit()
+    assert isinstance(reddit_data, lf.RedditSnapshot)
+    assert {post_id: dict(post) for post_id, post in reddit_data.items()} == posts
+    assert lf.load_data_reddit(use_snapshot=False) == posts
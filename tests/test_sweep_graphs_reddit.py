@@ -0,0 +1,30 @@
+import numpy as np
+
+import project.library_functions as lf
+from tests.conftest import assert_same_graph
+
+conditions = {
+    "all": {},
+    "happy": {"polarity": (">", 0.1)},
+    "happy_function": {"polarity": lambda x: x > 0.1},
+}
+
+
+def test_sweep_gives_the_graphs_of_create_graph_reddit(toy_data_store, reddit_posts):
+    post_table = lf.PostTable.from_posts(reddit_posts)
+    grid = {
+        "max_drugs_in_post": [np.inf, 3],
+        "min_edge_occurrences_to_link": [1, 3],
+        "min_content_length_in_characters": [0, 30],
+        "conditional_functions_dict": conditions,
+    }
+    graphs = lf.sweep_graphs_reddit(grid, posts=post_table, include_node_contents=True)
+
+    assert len(graphs) == 2 * 2 * 2 * 3
+    for key, graph in graphs.items():
+        arguments = dict(zip(grid, key))
+        arguments["conditional_functions_dict"] = conditions[key[-1]]
+        expected = lf.create_graph_reddit(
+            posts=post_table, backend="sparse", include_node_contents=True, **arguments
+        )
+        assert_same_graph(graph, expected)
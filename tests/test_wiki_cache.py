@@ -0,0 +1,23 @@
+import pytest
+
+import project.library_functions as lf
+from project.library_functions.config import Config
+
+old_hash, new_hash = "a" * 64, "b" * 64
+
+
+@pytest.fixture
+def cache_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config.Path, "wiki_cache_folder", tmp_path)
+    return tmp_path
+
+
+def test_saving_an_artifact_replaces_its_older_versions(cache_folder):
+    lf.save_cached_wiki_artifact("wiki", old_hash, "old wiki")
+    lf.save_cached_wiki_artifact("wiki_data", old_hash, "old wiki_data")
+    lf.save_cached_wiki_artifact("wiki", new_hash, "new wiki")
+
+    assert lf.load_cached_wiki_artifact("wiki", old_hash) is None
+    assert lf.load_cached_wiki_artifact("wiki", new_hash) == "new wiki"
+    # Artifacts whose name starts with the name of the saved one are kept
+    assert lf.load_cached_wiki_artifact("wiki_data", old_hash) == "old wiki_data"
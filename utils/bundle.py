@@ -0,0 +1,166 @@
+import json
+import os
+import pickle
+import shutil
+import time
+import uuid
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+from project.library_functions.config import Config
+from utils import pipeline
+
+# Bump whenever the content of the bundle changes, so that old bundles are ignored
+BUNDLE_VERSION = 10
+
+# Inputs of utils.pipeline.build_site_data: modifying any of them invalidates the bundle
+_bundle_sources = [
+    Config.Path.full_wiki_data,
+    Config.Path.reddit_data_with_NER_and_sentiment,
+    Config.Path.reddit_snapshot,
+    Config.Path.substance_names,
+    Config.Path.all_categories_to_names_mapping,
+    Config.Path.wiki_effect_categories,
+    Config.Path.wiki_mechanism_categories,
+    Config.Path.shared_data_folder / pipeline.saved_layout_reddit,
+    Config.Path.shared_data_folder / pipeline.saved_layout_wiki,
+    Config.Path.shared_data_folder / pipeline.saved_louvain_reddit,
+    Config.Path.shared_data_folder / pipeline.saved_louvain_wiki,
+]
+
+
+def _source_stats() -> Dict[str, Dict[str, int]]:
+    stats = {}
+    for source in _bundle_sources:
+        if source.exists():
+            stat = os.stat(source)
+            stats[source.name] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+    return stats
+
+
+def save_bundle(data: Dict[str, object], path: Union[str, Path] = None):
+    """Save the output of the data pipeline as a versioned bundle.
+
+    Args:
+        data (Dict[str, object]): objects to bundle, as returned by utils.pipeline.build_site_data
+        path (Union[str, Path], optional): folder to write the bundle to. Defaults to Config.Path.site_bundle.
+    """
+    path = Path(path) if path else Config.Path.site_bundle
+
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        # Tells the readers of the bundle that it was replaced
+        "build_id": uuid.uuid4().hex,
+        "contents": sorted(data.keys()),
+        "sources": _source_stats(),
+    }
+
+    # Write to a temporary folder first so that workers booting concurrently
+    # never see a half-written bundle
+    temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    if temp_path.exists():
+        shutil.rmtree(temp_path)
+    temp_path.mkdir(parents=True)
+    # One file per object, so that each can be loaded only when it is needed
+    for name, value in data.items():
+        with open(temp_path / f"{name}.pickle", "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(temp_path / "manifest.json", "w+") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Move the old bundle aside and only delete it once the new one is in place, so
+    # that the folder is never missing for longer than a rename
+    old_path = path.with_name(f"{path.name}.old-{os.getpid()}")
+    if old_path.exists():
+        shutil.rmtree(old_path)
+    if path.exists():
+        os.replace(path, old_path)
+    os.replace(temp_path, path)
+    if old_path.exists():
+        shutil.rmtree(old_path)
+
+
+class StaleBundleError(RuntimeError):
+    """Raised when reading an object of a bundle that was replaced since it was loaded."""
+
+
+def _read_manifest(path: Path) -> Optional[Dict]:
+    try:
+        with open(path / "manifest.json", "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class Bundle(Mapping):
+    """Read-only mapping over the objects of a bundle, each loaded from disk when accessed.
+
+    Objects are only returned if they belong to the build the bundle was loaded from: if
+    save_bundle replaced it in the meantime, reading raises StaleBundleError.
+    """
+
+    def __init__(self, path: Path, manifest: Dict):
+        self.path = path
+        self.contents = list(manifest["contents"])
+        self.build_id = manifest["build_id"]
+
+    def _check_build(self, name: str):
+        manifest = _read_manifest(self.path)
+        if manifest is None or manifest.get("build_id") != self.build_id:
+            raise StaleBundleError(f"Bundle replaced while reading {name}")
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.contents)
+
+    def __getitem__(self, name: str):
+        if name not in self.contents:
+            raise KeyError(name)
+        # The build is checked before and after reading, so that the object can't come
+        # from a bundle swapped in while it was opened
+        self._check_build(name)
+        try:
+            with open(self.path / f"{name}.pickle", "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            raise StaleBundleError(f"Bundle replaced while reading {name}")
+        self._check_build(name)
+        return value
+
+
+def load_bundle(path: Union[str, Path] = None) -> Optional[Bundle]:
+    """Load a bundle written by save_bundle.
+
+    Args:
+        path (Union[str, Path], optional): bundle folder. Defaults to Config.Path.site_bundle.
+
+    Returns:
+        Optional[Bundle]: mapping giving access to the bundled objects, or None if there is
+        no bundle, if it has another version or if the data it was built from changed since.
+    """
+    path = Path(path) if path else Config.Path.site_bundle
+
+    manifest = _read_manifest(path)
+    if manifest is None:
+        return None
+
+    if manifest["version"] != BUNDLE_VERSION:
+        print(
+            f"Ignoring bundle with version {manifest['version']} (expected {BUNDLE_VERSION})"
+        )
+        return None
+
+    # Sources that are not shipped with the deployment can't invalidate the bundle
+    for name, stat in _source_stats().items():
+        if manifest["sources"].get(name, stat) != stat:
+            print(f"Ignoring outdated bundle: {name} changed since it was built")
+            return None
+
+    return Bundle(path, manifest)
@@ -1,93 +1,120 @@
+# Data shared by the pages of the website.
+#
+# Everything is loaded lazily, on first access to the corresponding module
+# attribute (e.g. `utils.data.graph_reddit_gcc`), so that pages only pay for
+# the data they actually use. Import this module with `from utils import data`
+# and access the attributes where they are needed: `from utils.data import x`
+# would load x at import time.
+
+import threading
+from typing import Dict
+
 from project.library_functions import (
-    assign_root_categories,
-    create_graph_reddit,
-    create_graph_wiki,
-    get_fa2_layout,
-    get_root_category_mapping,
-    get_wiki_data,
-    assign_louvain_communities,
     get_wiki_page_names,
     get_wiki_synonyms_mapping,
-    load_data_reddit,
-    load_data_wiki,
+    data_store,
 )
-import wojciech as w
 
-print("Loading Reddit and wikipedia data...")
-reddit_data = load_data_reddit()
-wiki_data = load_data_wiki()
+from utils.bundle import StaleBundleError, load_bundle
+from utils.profiling import startup_phase
+from utils.pipeline import (
+    build_page_data,
+    build_site_data,
+    page_data_names,
+    site_data_names,
+)
 
+_lock = threading.RLock()
+_loaded: Dict[str, object] = {}
+_bundle = None
+_bundle_opened = False
+# Names of the objects that were read from _bundle
+_from_bundle = set()
 
-print("Loading graphs...")
 
-graph_reddit = create_graph_reddit(
-    max_drugs_in_post=8,
-    min_content_length_in_characters=30,
-    min_edge_occurrences_to_link=2,
-    include_node_contents=True,
-    show_progress_bars=True,
-)
+def _names_and_synonyms_in_reddit():
+    synonym_mapping = get("synonym_mapping")
+    graph_reddit_gcc = get("graph_reddit_gcc")
+    return {
+        i
+        for i in get("all_names_and_synonyms")
+        if synonym_mapping[i] in graph_reddit_gcc.nodes()
+    }
 
-graph_wiki_directed = create_graph_wiki()
-graph_wiki = w.graph.largest_connected_component(graph_wiki_directed.to_undirected())
-graph_reddit_gcc = w.graph.largest_connected_component(graph_reddit)
 
+_loaders = {
+    "reddit_data": lambda: data_store.reddit_data,
+    "wiki_data": lambda: data_store.wiki_data,
+    "all_names_and_synonyms": lambda: get_wiki_page_names(with_synonyms=True),
+    "synonym_mapping": get_wiki_synonyms_mapping,
+    "names_and_synonyms_in_reddit": _names_and_synonyms_in_reddit,
+}
 
-## layouts
-print("Loading/computing layouts...")
 
-layout_reddit = get_fa2_layout(
-    graph_reddit_gcc,
-    edge_weight_attribute="count",
-    saved="reddit_filtered_weighted_gcc.json",
-)
-layout_wiki = get_fa2_layout(graph_wiki, saved="wiki_simple_noargs_gcc.json")
+def _load_from_bundle_or_pipeline(name: str):
+    global _bundle, _bundle_opened
+    if not _bundle_opened:
+        # Fast path: the bundle written by `python build.py`
+        _bundle = load_bundle()
+        _bundle_opened = True
+        if _bundle is None:
+            print("No up-to-date bundle found: running the whole pipeline.")
+            print("Run `python build.py` once to make this faster.")
 
+    if _bundle is not None:
+        try:
+            value = _bundle[name]
+        except StaleBundleError:
+            # `python build.py` ran since the bundle was opened: forget what was read
+            # from the old bundle, so that everything comes from the new one
+            print("The bundle was rebuilt: reloading it.")
+            for loaded_name in _from_bundle:
+                _loaded.pop(loaded_name, None)
+            _from_bundle.clear()
+            _bundle_opened = False
+            return _load_from_bundle_or_pipeline(name)
+        _from_bundle.add(name)
+        return value
 
-## Assign "root categories" on wikipedia
-print("Assigning root categories...")
-assign_root_categories(
-    graph_wiki,
-    wiki_data=get_wiki_data(),
-    mapping=get_root_category_mapping(which="effects"),
-    name="effect_category",
-)
+    if name in page_data_names:
+        _loaded.update(
+            build_page_data({key: get(key) for key in site_data_names})
+        )
+    else:
+        _loaded.update(build_site_data(include_page_data=False))
+    return _loaded[name]
 
-assign_root_categories(
-    graph_wiki,
-    wiki_data=get_wiki_data(),
-    mapping=get_root_category_mapping(which="mechanisms"),
-    name="mechanism_category",
-)
-assign_root_categories(
-    graph_reddit_gcc,
-    wiki_data=get_wiki_data(),
-    mapping=get_root_category_mapping(which="effects"),
-    name="effect_category",
-)
-assign_root_categories(
-    graph_reddit_gcc,
-    wiki_data=get_wiki_data(),
-    mapping=get_root_category_mapping(which="mechanisms"),
-    name="mechanism_category",
-)
 
-## Assign louvain communities on both networks at default resolution
-print("Assigning Louvain categories")
-_, reddit_dendrogram, _, wiki_dendrogram = assign_louvain_communities(
-    graph_reddit_gcc, graph_wiki, reddit_edge_weight="count", others_threshold=8
-)
+def get(name: str):
+    """Get one of the objects exposed by this module, loading it if needed.
 
-_, reddit_dendrogram_finegrained = assign_louvain_communities(
-    graph_reddit_gcc,
-    reddit_edge_weight="count",
-    others_threshold=4,
-    louvain_resolution_reddit=0.6,
-)
+    Args:
+        name (str): name of the object, e.g. "graph_reddit_gcc"
 
-all_names_and_synonyms = get_wiki_page_names(with_synonyms=True)
-synonym_mapping = get_wiki_synonyms_mapping()
+    Returns:
+        the requested object
+    """
+    try:
+        return _loaded[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _loaded:
+            with startup_phase(f"Loading {name}"):
+                if name in _loaders:
+                    _loaded[name] = _loaders[name]()
+                else:
+                    _loaded[name] = _load_from_bundle_or_pipeline(name)
+        return _loaded[name]
 
-names_and_synonyms_in_reddit = {
-    i for i in all_names_and_synonyms if synonym_mapping[i] in graph_reddit_gcc.nodes()
-}
+
+def load_all():
+    """Load everything upfront, e.g. before forking server workers."""
+    for name in list(_loaders) + site_data_names + page_data_names:
+        get(name)
+
+
+def __getattr__(name: str):
+    if name in _loaders or name in site_data_names or name in page_data_names:
+        return get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
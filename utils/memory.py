@@ -0,0 +1,109 @@
+import os
+from pathlib import Path
+from typing import Dict, List
+
+# Fields of /proc/<pid>/smaps_rollup that we report, in kB
+_smaps_fields = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared_clean",
+    "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean",
+    "Private_Dirty": "private_dirty",
+}
+
+
+def process_memory(pid: int = None) -> Dict[str, int]:
+    """Get the memory usage of a process, split into what it shares with other processes and what is unique to it.
+
+    Only works on Linux, since it reads /proc/<pid>/smaps_rollup (or smaps on older kernels).
+
+    Args:
+        pid (int, optional): process id. Defaults to the current process.
+
+    Returns:
+        Dict[str, int]: memory in kB: rss, pss (rss with shared pages divided among the
+        processes sharing them), unique (private pages, i.e. what would be freed if the
+        process exited), shared, and the raw smaps fields.
+    """
+    pid = pid or os.getpid()
+    proc = Path("/proc") / str(pid)
+    smaps = proc / "smaps_rollup"
+    if not smaps.exists():
+        smaps = proc / "smaps"
+
+    memory = {field: 0 for field in _smaps_fields.values()}
+    with open(smaps, "r") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in _smaps_fields:
+                # smaps has one entry per mapping, so sum them up
+                memory[_smaps_fields[key]] += int(value.split()[0])
+
+    memory["unique"] = memory["private_clean"] + memory["private_dirty"]
+    memory["shared"] = memory["shared_clean"] + memory["shared_dirty"]
+    return memory
+
+
+def current_rss() -> int:
+    """Get the resident set size of the current process, in kB.
+
+    Cheaper than process_memory, since it only reads /proc/self/statm.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        # Not on Linux: fall back to the peak RSS
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child_pids(pid: int) -> List[int]:
+    """Get the ids of the child processes of a process.
+
+    Args:
+        pid (int): id of the parent process
+
+    Returns:
+        List[int]: ids of its children
+    """
+    children = Path("/proc") / str(pid) / "task" / str(pid) / "children"
+    if children.exists():
+        return [int(child) for child in children.read_text().split()]
+
+    # Kernels without CONFIG_PROC_CHILDREN: look for processes whose parent is pid
+    pids = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            # The command name (2nd field) may contain spaces, so split after it
+            fields = stat.read_text().rpartition(")")[2].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            pids.append(int(stat.parent.name))
+    return pids
+
+
+def workers_memory_report() -> Dict[str, object]:
+    """Report the memory of the gunicorn master and all its workers, when called from a worker.
+
+    Returns:
+        Dict[str, object]: memory of the master and of each worker (see process_memory),
+        and the totals over all workers. With copy-on-write sharing, the total pss
+        is much smaller than the total rss.
+    """
+    master = os.getppid()
+    workers = {pid: process_memory(pid) for pid in child_pids(master)}
+    totals = {
+        key: sum(memory[key] for memory in workers.values())
+        for key in ["rss", "pss", "unique", "shared"]
+    }
+    return {
+        "unit": "kB",
+        "master": {"pid": master, **process_memory(master)},
+        "workers": [{"pid": pid, **memory} for pid, memory in workers.items()],
+        "workers_total": totals,
+    }
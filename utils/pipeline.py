@@ -0,0 +1,268 @@
+from typing import Dict
+
+from project.library_functions import (
+    FrozenGraph,
+    assign_root_categories,
+    create_graph_reddit,
+    load_graphs_wiki,
+    get_fa2_layout,
+    get_root_category_mapping,
+    get_wiki_data,
+    assign_louvain_communities,
+    get_louvain_dendrograms,
+)
+from project.library_functions.overlaps import overlap_matrix
+import wojciech as w
+
+from utils.community_graphs import build_cytoscape_elements
+from utils.profiling import startup_phase
+
+# Objects returned by build_site_data and build_page_data
+site_data_names = [
+    "graph_reddit",
+    "graph_wiki_directed",
+    "graph_wiki",
+    "graph_reddit_gcc",
+    "layout_reddit",
+    "layout_wiki",
+    "reddit_dendrogram",
+    "wiki_dendrogram",
+    "reddit_dendrogram_finegrained",
+]
+page_data_names = ["cytoscape_wiki", "cytoscape_reddit", "overlap_matrices"]
+
+# Random state of the louvain algorithm, so that every worker serves the same communities
+louvain_seed = 0
+
+# Files in Config.Path.shared_data_folder that the layouts are loaded from, and that the
+# Louvain communities are loaded from (or saved to, if they don't match the graphs)
+saved_layout_reddit = "reddit_filtered_weighted_gcc.json"
+saved_layout_wiki = "wiki_simple_noargs_gcc.json"
+saved_louvain_reddit = "reddit_filtered_weighted_gcc_louvain.json"
+saved_louvain_wiki = "wiki_simple_noargs_gcc_louvain.json"
+
+# Node attributes shown on the community page
+cytoscape_node_attributes_wiki = [
+    "mechanism_category",
+    "effect_category",
+    "louvain_community_wiki_L0",
+    "louvain_community_wiki_L1",
+]
+cytoscape_node_attributes_reddit = [
+    "mechanism_category",
+    "effect_category",
+    "louvain_community_reddit_R1.00_L0",
+    "louvain_community_reddit_R0.60_L0",
+    "louvain_community_wiki_L0",
+    "louvain_community_wiki_L1",
+]
+
+# 2D-heatmaps of category overlaps shown on the community page:
+# name -> (community attribute, category attribute, graph)
+overlap_heatmaps = {
+    "hist2d_louvain_1_vs_effects": (
+        "louvain_community_wiki_L0",
+        "effect_category",
+        "graph_wiki",
+    ),
+    "hist2d_louvain_1_vs_mechanisms": (
+        "louvain_community_wiki_L0",
+        "mechanism_category",
+        "graph_wiki",
+    ),
+    "hist2d_louvain_2_vs_effects": (
+        "louvain_community_wiki_L1",
+        "effect_category",
+        "graph_wiki",
+    ),
+    "hist2d_louvain_2_vs_mechanisms": (
+        "louvain_community_wiki_L1",
+        "mechanism_category",
+        "graph_wiki",
+    ),
+    "hist2d_louvain_reddit_vs_effects": (
+        "louvain_community_reddit_R1.00_L0",
+        "effect_category",
+        "graph_reddit_gcc",
+    ),
+    "hist2d_louvain_reddit_vs_mechanisms": (
+        "louvain_community_reddit_R1.00_L0",
+        "mechanism_category",
+        "graph_reddit_gcc",
+    ),
+    "hist2d_louvain_reddit_fine_vs_effects": (
+        "louvain_community_reddit_R0.60_L0",
+        "effect_category",
+        "graph_reddit_gcc",
+    ),
+    "hist2d_louvain_reddit_fine_vs_mechanisms": (
+        "louvain_community_reddit_R0.60_L0",
+        "mechanism_category",
+        "graph_reddit_gcc",
+    ),
+}
+
+
+def build_site_data(include_page_data: bool = True) -> Dict[str, object]:
+    """Run the whole data pipeline behind the website: build the graphs, take their GCCs,
+    load the layouts, assign root categories and Louvain communities.
+
+    Args:
+        include_page_data (bool, optional): also build the cytoscape elements and the
+            overlap matrices shown on the community page. Defaults to True.
+
+    Returns:
+        Dict[str, object]: dict containing all the objects exposed by utils.data
+    """
+    with startup_phase("Building Reddit graph"):
+        graph_reddit = create_graph_reddit(
+            max_drugs_in_post=8,
+            min_content_length_in_characters=30,
+            min_edge_occurrences_to_link=2,
+            include_node_contents=True,
+            show_progress_bars=True,
+            # Only keep references to the posts: texts are read from the corpus
+            contents_mode="rows",
+            # Reused until the data changes
+            cache=True,
+        )
+
+    with startup_phase("Loading/building wiki graph"):
+        # Saved along with its GCC, and rebuilt only when the wiki data changes
+        graph_wiki_directed, graph_wiki = load_graphs_wiki()
+
+    with startup_phase("Taking GCCs"):
+        graph_reddit_gcc = w.graph.largest_connected_component(graph_reddit)
+
+    ## layouts
+    with startup_phase("Loading/computing layouts"):
+        layout_reddit = get_fa2_layout(
+            graph_reddit_gcc,
+            edge_weight_attribute="count",
+            saved=saved_layout_reddit,
+        )
+        layout_wiki = get_fa2_layout(graph_wiki, saved=saved_layout_wiki)
+
+    ## Assign "root categories" on wikipedia
+    with startup_phase("Assigning root categories"):
+        assign_root_categories(
+            graph_wiki,
+            wiki_data=get_wiki_data(),
+            mapping=get_root_category_mapping(which="effects"),
+            name="effect_category",
+        )
+
+        assign_root_categories(
+            graph_wiki,
+            wiki_data=get_wiki_data(),
+            mapping=get_root_category_mapping(which="mechanisms"),
+            name="mechanism_category",
+        )
+        assign_root_categories(
+            graph_reddit_gcc,
+            wiki_data=get_wiki_data(),
+            mapping=get_root_category_mapping(which="effects"),
+            name="effect_category",
+        )
+        assign_root_categories(
+            graph_reddit_gcc,
+            wiki_data=get_wiki_data(),
+            mapping=get_root_category_mapping(which="mechanisms"),
+            name="mechanism_category",
+        )
+
+    ## Assign louvain communities on both networks at default resolution
+    with startup_phase("Loading/computing Louvain communities"):
+        # Seeded, and saved next to the layouts: computed only when the graphs change
+        reddit_dendrograms = get_louvain_dendrograms(
+            graph_reddit_gcc,
+            resolutions=[1, 0.6],
+            seed=louvain_seed,
+            weight="count",
+            saved=saved_louvain_reddit,
+        )
+        wiki_dendrograms = get_louvain_dendrograms(
+            graph_wiki,
+            resolutions=[1],
+            seed=louvain_seed,
+            saved=saved_louvain_wiki,
+        )
+
+    with startup_phase("Assigning Louvain communities"):
+        _, reddit_dendrogram, _, wiki_dendrogram = assign_louvain_communities(
+            graph_reddit_gcc,
+            graph_wiki,
+            reddit_edge_weight="count",
+            others_threshold=8,
+            reddit_dendrogram=reddit_dendrograms[1],
+            wiki_dendrogram=wiki_dendrograms[1],
+        )
+
+        _, reddit_dendrogram_finegrained = assign_louvain_communities(
+            graph_reddit_gcc,
+            reddit_edge_weight="count",
+            others_threshold=4,
+            louvain_resolution_reddit=0.6,
+            reddit_dendrogram=reddit_dendrograms[0.6],
+        )
+
+    # The site only reads the graphs from now on
+    with startup_phase("Freezing graphs"):
+        graph_reddit = FrozenGraph.from_networkx(graph_reddit)
+        graph_wiki_directed = FrozenGraph.from_networkx(graph_wiki_directed)
+        graph_wiki = FrozenGraph.from_networkx(graph_wiki)
+        graph_reddit_gcc = FrozenGraph.from_networkx(graph_reddit_gcc)
+
+    data = {
+        "graph_reddit": graph_reddit,
+        "graph_wiki_directed": graph_wiki_directed,
+        "graph_wiki": graph_wiki,
+        "graph_reddit_gcc": graph_reddit_gcc,
+        "layout_reddit": layout_reddit,
+        "layout_wiki": layout_wiki,
+        "reddit_dendrogram": reddit_dendrogram,
+        "wiki_dendrogram": wiki_dendrogram,
+        "reddit_dendrogram_finegrained": reddit_dendrogram_finegrained,
+    }
+
+    if include_page_data:
+        data.update(build_page_data(data))
+
+    return data
+
+
+def build_page_data(data: Dict[str, object]) -> Dict[str, object]:
+    """Build the cytoscape elements and the overlap matrices shown on the community page.
+
+    Args:
+        data (Dict[str, object]): graphs and layouts as returned by build_site_data
+
+    Returns:
+        Dict[str, object]: dict with the cytoscape elements and properties of both graphs
+        ("cytoscape_wiki", "cytoscape_reddit") and the overlap matrices ("overlap_matrices")
+    """
+    with startup_phase("Building cytoscape graphs"):
+        cytoscape_wiki = build_cytoscape_elements(
+            data["graph_wiki"],
+            positions=data["layout_wiki"],
+            node_attributes=cytoscape_node_attributes_wiki,
+        )
+        cytoscape_reddit = build_cytoscape_elements(
+            data["graph_reddit_gcc"],
+            positions=data["layout_reddit"],
+            node_attributes=cytoscape_node_attributes_reddit,
+        )
+
+    with startup_phase("Computing 2D-heatmaps of category overlaps"):
+        overlap_matrices = {
+            name: overlap_matrix(
+                attribute_A=attribute_A, attribute_B=attribute_B, graph=data[graph]
+            )
+            for name, (attribute_A, attribute_B, graph) in overlap_heatmaps.items()
+        }
+
+    return {
+        "cytoscape_wiki": cytoscape_wiki,
+        "cytoscape_reddit": cytoscape_reddit,
+        "overlap_matrices": overlap_matrices,
+    }
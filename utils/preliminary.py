@@ -1,16 +1,12 @@
-from utils.data import (
-    all_names_and_synonyms,
-    synonym_mapping,
-    graph_reddit_gcc,
-    graph_wiki_directed,
-    reddit_data,
-)
+from utils import data as site_data
 import dash_core_components as dcc
 import dash_html_components as html
 import dash_bootstrap_components as dbc
 
 
 def wiki_page(substance_name: str):
+    synonym_mapping = site_data.synonym_mapping
+    graph_wiki_directed = site_data.graph_wiki_directed
     name = synonym_mapping[substance_name]
     nodedata = graph_wiki_directed.nodes[name]
     incoming = graph_wiki_directed.in_degree[name]
@@ -123,6 +119,9 @@ def wiki_page(substance_name: str):
 
 
 def reddit_substance(substance_name):
+    synonym_mapping = site_data.synonym_mapping
+    graph_reddit_gcc = site_data.graph_reddit_gcc
+    reddit_data = site_data.reddit_data
     name = synonym_mapping[substance_name]
     nodedata = graph_reddit_gcc.nodes[name]
     titlechildren = []
@@ -137,7 +136,7 @@ def reddit_substance(substance_name):
         )
 
     n_links = graph_reddit_gcc.degree(name)
-    total_length = sum([len(i) for i in nodedata["contents"]])
+    total_length = nodedata["contents_total_length"]
     edge_counts = sorted(
         graph_reddit_gcc.edges(name, data="count"),
         key=lambda x: x[2],
@@ -0,0 +1,67 @@
+# Instrumentation of the startup phases (data loading, graph building, ...),
+# served as JSON at /debug/startup (see debug.py).
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+from utils.memory import current_rss
+
+_phases: List[Dict[str, object]] = []
+_depth = 0
+
+
+@contextmanager
+def startup_phase(name: str):
+    """Time a named startup phase and record its wall time, CPU time and RSS delta.
+
+    Phases can be nested: the report records the depth of each phase.
+
+    Args:
+        name (str): name of the phase, e.g. "Building Reddit graph"
+
+    Example:
+        >>> with startup_phase("Loading layouts"):
+        >>>     layout = get_fa2_layout(graph, saved="layout.json")
+    """
+    global _depth
+    print(f"{name}...")
+    # Recorded when it starts, so that the report lists phases in that order
+    phase = {"name": name, "depth": _depth, "pid": os.getpid()}
+    _phases.append(phase)
+    rss_before = current_rss()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    _depth += 1
+    try:
+        yield
+    finally:
+        _depth -= 1
+        phase["wall_time"] = time.perf_counter() - wall_start
+        phase["cpu_time"] = time.process_time() - cpu_start
+        phase["rss_before"] = rss_before
+        phase["rss_after"] = current_rss()
+        phase["rss_delta"] = phase["rss_after"] - rss_before
+
+
+def startup_report() -> Dict[str, object]:
+    """Get the timings of all the startup phases completed so far.
+
+    Returns:
+        Dict[str, object]: the phases in the order they started, with wall and CPU times in
+        seconds and RSS in kB, and the totals over the top-level phases
+    """
+    phases = [phase for phase in _phases if "wall_time" in phase]
+    top_level = [phase for phase in phases if phase["depth"] == 0]
+    return {
+        "pid": os.getpid(),
+        "units": {"time": "s", "memory": "kB"},
+        "phases": phases,
+        "total": {
+            "wall_time": sum(phase["wall_time"] for phase in top_level),
+            "cpu_time": sum(phase["cpu_time"] for phase in top_level),
+            "rss_delta": sum(phase["rss_delta"] for phase in top_level),
+        },
+        "rss": current_rss(),
+    }